@@ -0,0 +1,65 @@
+"""
+Cost of EncryptedCPFField: per-row writes against CPFField, and an
+equality lookup through the blind index against decrypting every row.
+
+    python benchmarks/blind_index.py [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    USE_I18N=False,
+    INSTALLED_APPS=['django_cpf_cnpj', 'tests'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+    CPF_CNPJ_ENCRYPTION_KEYS=['0xYNcOQf0RDrgRi4nSVjW_L5G1x3bqUBFrlS06W1QHo='],
+    CPF_CNPJ_BLIND_INDEX_KEYS=['blind-index-key'],
+)
+django.setup()
+
+from django.db import connection
+
+from django_cpf_cnpj.core import CPF
+from django_cpf_cnpj.seeding import iter_seed_documents
+
+from tests.models import DefaultCPF, EncryptedCPF
+
+
+def timed(name, function, rows=None):
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    if rows:
+        print('%-30s %.3f s (%.1f us/row)' % (name, elapsed, elapsed / rows * 1e6))
+    else:
+        print('%-30s %.3f ms' % (name, elapsed * 1000))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with connection.schema_editor() as editor:
+        editor.create_model(DefaultCPF)
+        editor.create_model(EncryptedCPF)
+
+    documents = list(iter_seed_documents(CPF, rows, seed=1))
+    target = documents[rows // 2]
+
+    timed('CPFField bulk_create', lambda: DefaultCPF.objects.bulk_create(
+        [DefaultCPF(cpf=document) for document in documents], batch_size=1000), rows)
+    timed('EncryptedCPFField bulk_create', lambda: EncryptedCPF.objects.bulk_create(
+        [EncryptedCPF(cpf=document) for document in documents], batch_size=1000), rows)
+
+    timed('CPFField lookup', lambda: DefaultCPF.objects.get(cpf=target))
+    timed('blind index lookup', lambda: EncryptedCPF.objects.get(cpf=target))
+    timed('decrypt-and-scan lookup', lambda: next(
+        pk for pk, value in EncryptedCPF.objects.values_list('pk', 'cpf') if value == target.number))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Run every CheckDigitSpec through the same measurements: check digits of an
+integer base, integer validation and string validation, next to a plain
+digit-by-digit loop computing the same digits.
+
+    python benchmarks/check_digits.py [count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.core import CPF_SPEC, CNPJ_SPEC
+from django_cpf_cnpj.documents import PIS_SPEC, TITULO_ELEITOR_SPEC, CNH_SPEC, RENAVAM_SPEC
+
+SPECS = (CPF_SPEC, CNPJ_SPEC, PIS_SPEC, TITULO_ELEITOR_SPEC, CNH_SPEC, RENAVAM_SPEC)
+
+
+def digit_loop(spec, base):
+    # What the engine replaces: one multiplication per digit and weight.
+    digits = list(map(int, '%0*d' % (spec.base_length, base)))
+    totals = ()
+    for weights in spec.weights:
+        total = sum(digit * weight for digit, weight in zip(digits, weights))
+        if spec.adjust is None:
+            digit = spec.rule(total % 11)
+        else:
+            totals += (total,)
+            digit = spec.adjust(base, totals, tuple(digits[spec.base_length:]))
+        digits.append(digit)
+    return tuple(digits[spec.base_length:])
+
+
+def timed(name, function, count):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    print('  %-22s %.3f s (%.0f/s)' % (name, elapsed, count / elapsed))
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(1)
+
+    for spec in SPECS:
+        print('%s (%d numbers)' % (spec.name, count))
+        bases = [rng.randrange(1, 10 ** spec.base_length) for _ in range(count)]
+        numbers = [int(spec.generate(base) or 0) for base in bases]
+        strings = ['%0*d' % (spec.length, number) for number in numbers]
+
+        engine = timed('check_digits', lambda: [spec.check_digits(base) for base in bases], count)
+        loop = timed('digit loop', lambda: [digit_loop(spec, base) for base in bases], count)
+        assert engine == loop
+
+        timed('is_valid_int', lambda: [spec.is_valid_int(number) for number in numbers], count)
+        timed('check (string)', lambda: [spec.check(string) for string in strings], count)
+
+
+if __name__ == '__main__':
+    main()
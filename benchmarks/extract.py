@@ -0,0 +1,69 @@
+"""
+Scan a generated text file for CPF/CNPJ numbers with a per-candidate
+regex-and-validate loop and with scan_file.
+
+    python benchmarks/extract.py [megabytes]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.core import CPF, cpf_random_generator, cnpj_random_generator, is_valid_cpf, is_valid_cnpj
+from django_cpf_cnpj.extract import scan_file
+
+NAIVE_CPF = re.compile(rb'\d{3}\.?\d{3}\.?\d{3}-?\d{2}')
+NAIVE_CNPJ = re.compile(rb'\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2}')
+
+
+def write_sample(path, megabytes):
+    rng = random.Random(1)
+    words = ['nota', 'fiscal', 'valor', 'R$', '1.234,56', 'pedido', '2024-01-31', 'cliente']
+    block = []
+    for _ in range(20000):
+        block.append(rng.choice(words))
+        if rng.random() < 0.05:
+            block.append(CPF(cpf_random_generator()).format())
+        if rng.random() < 0.05:
+            block.append(cnpj_random_generator())
+    block = (' '.join(block) + '\n').encode()
+
+    with open(path, 'wb') as sample:
+        for _ in range(megabytes * 1000000 // len(block) + 1):
+            sample.write(block)
+
+
+def naive(path):
+    with open(path, 'rb') as scanned_file:
+        data = scanned_file.read()
+    found = [m for m in NAIVE_CNPJ.findall(data) if is_valid_cnpj(m.decode())]
+    found += [m for m in NAIVE_CPF.findall(data) if is_valid_cpf(m.decode())]
+    return len(found)
+
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'sample.txt')
+        write_sample(path, megabytes)
+        size = os.path.getsize(path)
+
+        started = time.perf_counter()
+        count = naive(path)
+        elapsed = time.perf_counter() - started
+        print('%-22s %d documents: %.2f s (%.1f MB/s)' % ('regex + is_valid_*', count, elapsed, size / 1e6 / elapsed))
+
+        for use_mmap in (True, False):
+            scan = scan_file(path, use_mmap=use_mmap)
+            count = sum(1 for _ in scan)
+            print('%-22s %d documents: %.2f s (%.1f MB/s)' % (
+                'scan_file (%s)' % ('mmap' if use_mmap else 'read'), count, scan.elapsed, scan.megabytes_per_second,
+            ))
+
+
+if __name__ == '__main__':
+    main()
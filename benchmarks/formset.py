@@ -0,0 +1,59 @@
+"""
+Clean a 500-row formset of CPF/CNPJ forms with and without
+DocumentFormSetMixin.
+
+    python benchmarks/formset.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(USE_I18N=False)
+django.setup()
+
+from django import forms
+
+from django_cpf_cnpj.cpf import CPF
+from django_cpf_cnpj.cnpj import CNPJ
+from django_cpf_cnpj.forms import CPFForm, CNPJForm, DocumentFormSetMixin
+
+ROWS = 500
+
+
+class DocumentForm(forms.Form):
+    cpf = CPFForm()
+    cnpj = CNPJForm()
+
+
+class BatchFormSet(DocumentFormSetMixin, forms.BaseFormSet):
+    pass
+
+
+def formset_data():
+    data = {'form-TOTAL_FORMS': str(ROWS), 'form-INITIAL_FORMS': '0'}
+    # A few repeated documents, as in real bulk-entry screens.
+    cpfs = [CPF(CPF.random_generator()).format() for _ in range(ROWS // 5)]
+    cnpjs = [CNPJ.random_generator() for _ in range(ROWS // 5)]
+    for i in range(ROWS):
+        data['form-%d-cpf' % i] = cpfs[i % len(cpfs)]
+        data['form-%d-cnpj' % i] = cnpjs[i % len(cnpjs)]
+    return data
+
+
+def main():
+    data = formset_data()
+    for name, formset in (('BaseFormSet', forms.BaseFormSet), ('DocumentFormSetMixin', BatchFormSet)):
+        formset_class = forms.formset_factory(DocumentForm, formset=formset, max_num=ROWS)
+        assert formset_class(data).is_valid()
+
+        seconds = min(timeit.repeat(lambda: formset_class(data).is_valid(), number=5, repeat=3)) / 5
+        print('%-22s %d rows: %.2f ms' % (name, ROWS, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
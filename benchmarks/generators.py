@@ -0,0 +1,40 @@
+"""
+Generate consecutive valid CPFs with the previous regex-and-revalidate
+generator, the table-driven cpf_generator and the incremental iter_cpfs.
+
+    python benchmarks/generators.py [count]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.core import cpf_generator, iter_cpfs, is_valid_cpf, last_digits_cpf
+
+
+def legacy_cpf_generator(value):
+    value = re.sub(r'\D', '', str(value)).zfill(9)[:9]
+    v1, v2 = last_digits_cpf(value + 'xx')
+    new = value + str(v1) + str(v2)
+    if not is_valid_cpf(new):
+        new = None
+    return new
+
+
+def timed(name, generate, count):
+    started = time.perf_counter()
+    generated = sum(1 for number in generate() if number)
+    elapsed = time.perf_counter() - started
+    print('%-22s %8d documents %7.3f s %9.0f/s' % (name, generated, elapsed, generated / elapsed))
+
+
+def main(count):
+    timed('legacy cpf_generator', lambda: (legacy_cpf_generator(i) for i in range(1, count + 1)), count)
+    timed('cpf_generator', lambda: (cpf_generator(i) for i in range(1, count + 1)), count)
+    timed('iter_cpfs', lambda: iter_cpfs(1, count + 1), count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,72 @@
+"""
+Import rows into a model with a unique CPFField through a ModelForm per
+row (one validate_unique query each) and through DocumentImporter.
+
+    python benchmarks/importer.py [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    USE_I18N=False,
+    INSTALLED_APPS=['django_cpf_cnpj', 'tests'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+)
+django.setup()
+
+from django import forms
+from django.db import connection
+
+from django_cpf_cnpj.core import CPF
+from django_cpf_cnpj.importer import DocumentImporter
+from django_cpf_cnpj.seeding import iter_seed_documents
+
+from tests.models import ImportedCPF
+
+
+class ImportedCPFForm(forms.ModelForm):
+    class Meta:
+        model = ImportedCPF
+        fields = ['cpf', 'name']
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with connection.schema_editor() as editor:
+        editor.create_model(ImportedCPF)
+
+    rows = [{'cpf': str(document), 'name': 'row %d' % i}
+            for i, document in enumerate(iter_seed_documents(CPF, count, seed=1))]
+
+    def with_forms():
+        instances = []
+        for row in rows:
+            form = ImportedCPFForm(row)
+            if form.is_valid():
+                instances.append(form.save(commit=False))
+        ImportedCPF.objects.bulk_create(instances, batch_size=1000)
+
+    def with_importer():
+        DocumentImporter(ImportedCPF, 'cpf').run(rows)
+
+    for name, load in (('ModelForm per row', with_forms), ('DocumentImporter', with_importer)):
+        ImportedCPF.objects.all().delete()
+        # Half of the rows already exist.
+        DocumentImporter(ImportedCPF, 'cpf').run(rows[::2])
+
+        started = time.perf_counter()
+        load()
+        elapsed = time.perf_counter() - started
+        assert ImportedCPF.objects.count() == len({row['cpf'] for row in rows})
+        print('%-18s %d rows: %.2f s (%.0f rows/s)' % (name, count, elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Validate and convert integer CPFs through the string path (is_valid_cpf,
+CPF(int)) and the integer path (is_valid_cpf_int, cpf_from_int), and
+validate a NumPy array in one call.
+
+    python benchmarks/integers.py [count]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.core import CPF, cpf_from_int, is_valid_cpf, is_valid_cpf_int, iter_cpfs
+
+
+def timed(name, function, count):
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    print('%-26s %d numbers: %.3f s (%.0f/s)' % (name, count, elapsed, count / elapsed))
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    # Half valid, half with a wrong last digit.
+    numbers = [int(cpf) for cpf in iter_cpfs(10 ** 8, 10 ** 8 + count // 2)]
+    numbers += [number + 1 if number % 10 < 9 else number - 1 for number in numbers]
+    random.Random(1).shuffle(numbers)
+
+    by_string = timed('is_valid_cpf', lambda: [is_valid_cpf(number) for number in numbers], len(numbers))
+    by_int = timed('is_valid_cpf_int', lambda: is_valid_cpf_int(numbers), len(numbers))
+    assert by_string == by_int
+
+    timed('CPF(int).is_valid()', lambda: [CPF(number).is_valid() for number in numbers], len(numbers))
+    timed('cpf_from_int', lambda: cpf_from_int(numbers), len(numbers))
+
+    try:
+        import numpy
+    except ImportError:
+        return
+    array = numpy.array(numbers, dtype=numpy.int64)
+    by_array = timed('is_valid_cpf_int (numpy)', lambda: is_valid_cpf_int(array), len(numbers))
+    assert by_array.tolist() == by_int
+
+
+if __name__ == '__main__':
+    main()
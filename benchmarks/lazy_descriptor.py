@@ -0,0 +1,65 @@
+"""
+Iterate over a table reading only a non-document column, with the default
+descriptor and with ``lazy=True``.
+
+    python benchmarks/lazy_descriptor.py [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    USE_I18N=False,
+    INSTALLED_APPS=['django_cpf_cnpj'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+)
+django.setup()
+
+from django.db import connection, models
+
+from django_cpf_cnpj.core import CPF
+from django_cpf_cnpj.fields import CPFField
+from django_cpf_cnpj.seeding import iter_seed_documents
+
+
+class EagerPerson(models.Model):
+    cpf = CPFField()
+    age = models.IntegerField()
+
+    class Meta:
+        app_label = 'django_cpf_cnpj'
+
+
+class LazyPerson(models.Model):
+    cpf = CPFField(lazy=True)
+    age = models.IntegerField()
+
+    class Meta:
+        app_label = 'django_cpf_cnpj'
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    values = [(document.number, i % 90) for i, document in enumerate(iter_seed_documents(CPF, rows, seed=1))]
+
+    for model in (EagerPerson, LazyPerson):
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        with connection.cursor() as cursor:
+            cursor.executemany('INSERT INTO %s (cpf, age) VALUES (%%s, %%s)' % model._meta.db_table, values)
+
+        started = time.perf_counter()
+        total = sum(person.age for person in model.objects.all().iterator(chunk_size=10000))
+        elapsed = time.perf_counter() - started
+        assert total == sum(age for _, age in values)
+        print('%-12s %d rows: %.2f s (%.0f rows/s)' % (model.__name__, rows, elapsed, rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-record overhead of RedactDocumentsFilter against no filter and a plain
+regex filter, for messages without digits, with digits but no document,
+and with a CPF argument.
+
+    python benchmarks/log_redaction.py
+"""
+import io
+import logging
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.core import is_valid_cpf, is_valid_cnpj
+from django_cpf_cnpj.log import RedactDocumentsFilter
+
+RECORDS = 20000
+MESSAGES = (
+    ('no digits', 'User %s logged in from %s', ('alice', 'web')),
+    ('digits', 'Order %d shipped, total %s', (123456, '1.234,56')),
+    ('cpf', 'User %s updated cpf %s', ('alice', '290.611.930-01')),
+)
+
+
+class RegexFilter(logging.Filter):
+    pattern = re.compile(r'\d{2,3}\.?\d{3}\.?\d{3}/?\d{0,4}-?\d{2}')
+
+    def filter(self, record):
+        message = record.getMessage()
+
+        def replace(match):
+            digits = re.sub(r'\D', '', match.group())
+            if is_valid_cpf(digits) or is_valid_cnpj(digits):
+                return '*' * len(match.group())
+            return match.group()
+
+        record.msg, record.args = self.pattern.sub(replace, message), None
+        return True
+
+
+def main():
+    for name, log_filter in (('no filter', None), ('regex filter', RegexFilter()),
+                             ('RedactDocumentsFilter', RedactDocumentsFilter())):
+        logger = logging.getLogger('benchmark.%s' % name)
+        logger.propagate = False
+        handler = logging.StreamHandler(io.StringIO())
+        logger.addHandler(handler)
+        if log_filter is not None:
+            logger.addFilter(log_filter)
+
+        for label, message, args in MESSAGES:
+            seconds = min(timeit.repeat(lambda: logger.warning(message, *args), number=RECORDS, repeat=5))
+            print('%-22s %-10s %.2f us/record' % (name, label, seconds / RECORDS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
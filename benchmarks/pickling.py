@@ -0,0 +1,47 @@
+"""
+Pickled size and round-trip time of a list of CPF objects, using the
+default __dict__ pickling, the compact __reduce__ and the binary codec.
+
+    python benchmarks/pickling.py [count]
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django_cpf_cnpj.codec import encode_documents, decode_documents
+from django_cpf_cnpj.core import CPF, cpf_generator
+
+
+class PlainCPF(CPF):
+    __reduce__ = object.__reduce__
+
+
+def round_trip(name, dumps, loads, documents):
+    started = time.perf_counter()
+    data = dumps(documents)
+    loads(data)
+    elapsed = time.perf_counter() - started
+    print('%-10s %10d bytes (%5.1f per document) %8.3f s' % (
+        name, len(data), len(data) / len(documents), elapsed,
+    ))
+
+
+def main(count):
+    numbers = [cpf_generator(i) for i in range(1, count + 1)]
+    plain = [PlainCPF(number) for number in numbers]
+    compact = [CPF(number) for number in numbers]
+    # Documents are normally validated before being shipped; keep the
+    # one-off validation cost out of the timings.
+    for document in compact:
+        document.is_valid()
+
+    round_trip('__dict__', pickle.dumps, pickle.loads, plain)
+    round_trip('__reduce__', pickle.dumps, pickle.loads, compact)
+    round_trip('codec', encode_documents, decode_documents, compact)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
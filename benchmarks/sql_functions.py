@@ -0,0 +1,72 @@
+"""
+Normalize a SQLite table of unmasked CPFs to the masked form with
+DocumentNormalizer (Python loop) and with one UPDATE using NormalizeCPF,
+through the registered function and the pure-SQL fallback.
+
+    python benchmarks/sql_functions.py [rows]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+from django.conf import settings
+
+settings.configure(
+    USE_I18N=False,
+    INSTALLED_APPS=['django_cpf_cnpj', 'tests'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+)
+django.setup()
+
+from django.db import connection
+
+from django_cpf_cnpj.core import CPF
+from django_cpf_cnpj.functions import IsValidCPF, NormalizeCPF
+from django_cpf_cnpj.normalize import DocumentNormalizer
+from django_cpf_cnpj.seeding import iter_seed_documents
+
+from tests.models import DefaultCPF
+
+
+def fill(rows):
+    DefaultCPF.objects.all().delete()
+    values = [(str(document),) for document in iter_seed_documents(CPF, rows, invalid_fraction=0.05, seed=1)]
+    with connection.cursor() as cursor:
+        cursor.executemany('INSERT INTO tests_defaultcpf (cpf) VALUES (%s)', values)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with connection.schema_editor() as editor:
+        editor.create_model(DefaultCPF)
+
+    field = DefaultCPF._meta.get_field('cpf')
+    field._masked = True
+
+    def python_loop():
+        DocumentNormalizer(DefaultCPF, 'cpf', batch_size=5000).run()
+
+    def registered_function():
+        DefaultCPF.objects.update(cpf=NormalizeCPF('cpf', masked=True))
+
+    def sql_fallback():
+        DefaultCPF.objects.update(cpf=NormalizeCPF('cpf', masked=True).fallback())
+
+    for name, normalize in (('DocumentNormalizer', python_loop),
+                            ('UPDATE normalize_document', registered_function),
+                            ('UPDATE pure SQL', sql_fallback)):
+        fill(rows)
+        started = time.perf_counter()
+        normalize()
+        elapsed = time.perf_counter() - started
+        assert DefaultCPF.objects.filter(IsValidCPF('cpf'), cpf__contains='.').count() == \
+            DefaultCPF.objects.filter(IsValidCPF('cpf')).count()
+        print('%-26s %d rows: %.3f s (%.0f rows/s)' % (name, rows, elapsed, rows / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+import sys
+
+# Django < 3.2 doesn't find the AppConfig on its own. Django is always
+# imported by the time it loads the app, and core must not import it.
+_django = sys.modules.get('django')
+if _django is not None and _django.VERSION < (3, 2):
+    default_app_config = 'django_cpf_cnpj.apps.DjangoCpfCnpjConfig'
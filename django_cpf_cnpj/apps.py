@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class DjangoCpfCnpjConfig(AppConfig):
+    name = 'django_cpf_cnpj'
+    verbose_name = 'CPF/CNPJ'
+
+    def ready(self):
+        from django_cpf_cnpj.functions import register_on_connection_created
+
+        connection_created.connect(register_on_connection_created, dispatch_uid='django_cpf_cnpj.functions')
@@ -0,0 +1,107 @@
+from collections import Counter, namedtuple
+import csv
+
+from django.db.models import Count
+
+from django_cpf_cnpj.utils import iter_batches
+
+__all__ = ['DocumentAuditor', 'Finding', 'INVALID', 'NON_CANONICAL', 'DUPLICATE']
+
+INVALID = 'invalid'
+NON_CANONICAL = 'non_canonical'
+DUPLICATE = 'duplicate'
+
+# ``detail`` is the canonical form for non-canonical rows and the number of
+# rows sharing the value for duplicates.
+Finding = namedtuple('Finding', ['pk', 'value', 'problem', 'detail'])
+
+
+class DocumentAuditor:
+    """
+    Scan the stored values of a CPFField/CNPJField in primary key order and
+    report invalid, non-canonical and duplicated values.
+
+    Memory use is bounded by ``batch_size``; ``last_pk`` holds the resume
+    point after every batch.
+    """
+
+    def __init__(self, model, field_name, batch_size=1000, start_after=None):
+        self.model = model
+        self.field = model._meta.get_field(field_name)
+        self.batch_size = batch_size
+        self.last_pk = start_after
+        self.counts = Counter()
+        self.document_class = self.field.document_class
+
+    def check(self, pk, value):
+        if value in self.field.empty_values:
+            return None
+
+        document = self.document_class(value)
+        if not document.is_valid():
+            return Finding(pk, value, INVALID, '')
+
+        canonical = self.field.get_canonical_value(document)
+        if value != canonical:
+            return Finding(pk, value, NON_CANONICAL, canonical)
+
+        return None
+
+    def batches(self):
+        """
+        Yield a list of findings for each batch of rows scanned.
+        """
+        queryset = self.model._default_manager.all()
+
+        for batch in iter_batches(queryset, self.field.name, self.batch_size, self.last_pk):
+            findings = []
+            for pk, value in batch:
+                finding = self.check(pk, value)
+                if finding is not None:
+                    findings.append(finding)
+                    self.counts[finding.problem] += 1
+
+            self.counts['scanned'] += len(batch)
+            self.last_pk = batch[-1][0]
+            yield findings
+
+    def duplicates(self):
+        """
+        Yield one finding per stored value shared by more than one row.
+
+        Grouping happens in the database, so this streams regardless of the
+        table size. Differently formatted copies of the same document are
+        reported as non-canonical by the scan instead.
+        """
+        name = self.field.name
+        rows = (
+            self.model._default_manager
+            .filter(**{'%s__isnull' % name: False})
+            .exclude(**{name: ''})
+            .values_list(name)
+            .annotate(rows=Count('pk'))
+            .filter(rows__gt=1)
+            .order_by(name)
+        )
+
+        for value, rows in rows.iterator():
+            self.counts[DUPLICATE] += 1
+            yield Finding(None, value, DUPLICATE, rows)
+
+    def run(self, output=None, duplicates=True):
+        """
+        Audit the whole column, writing findings as CSV rows to ``output``.
+        Return the counters.
+        """
+        writer = csv.writer(output) if output is not None else None
+
+        for findings in self.batches():
+            if writer is not None:
+                writer.writerows(findings)
+
+        if duplicates:
+            for finding in self.duplicates():
+                if writer is not None:
+                    writer.writerow(finding)
+
+        return self.counts
@@ -0,0 +1,91 @@
+"""
+Compact binary encoding for lists of CPF/CNPJ objects.
+
+Layout (little-endian): a header, one uint64 per document (the number, or
+INVALID for invalid documents), then the raw input of every invalid
+document, as text, prefixed by its uint32 length.
+"""
+from array import array
+import struct
+import sys
+
+from django_cpf_cnpj.core import CPF, trusted_document
+from django_cpf_cnpj.sets import DOCUMENT_CLASSES
+
+__all__ = ['encode_documents', 'decode_documents']
+
+# magic, format version, document class name, number of entries.
+HEADER = struct.Struct('<6sH8sQ')
+LENGTH = struct.Struct('<I')
+MAGIC = b'DCPFCL'
+VERSION = 1
+INVALID = 2 ** 64 - 1
+
+
+def encode_documents(documents, document_class=CPF):
+    """
+    Encode an iterable of ``document_class`` objects to bytes.
+    """
+    numbers = array('Q')
+    invalid = []
+    for document in documents:
+        if not isinstance(document, document_class):
+            raise TypeError(
+                "Can't encode %s as %s." % (type(document).__name__, document_class.__name__)
+            )
+
+        if document.is_valid():
+            numbers.append(int(document.number))
+        else:
+            numbers.append(INVALID)
+            invalid.append(str(document.raw_input).encode())
+
+    if sys.byteorder != 'little':
+        numbers.byteswap()
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, document_class.__name__.encode(), len(numbers)),
+        numbers.tobytes(),
+    ]
+    for raw_input in invalid:
+        parts.append(LENGTH.pack(len(raw_input)))
+        parts.append(raw_input)
+
+    return b''.join(parts)
+
+
+def decode_documents(data):
+    """
+    Decode bytes produced by encode_documents back to a list of documents.
+    """
+    magic, version, name, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Not an encoded document list.')
+    if version != VERSION:
+        raise ValueError('Unsupported document list version: %d' % version)
+
+    name = name.rstrip(b'\x00').decode()
+    if name not in DOCUMENT_CLASSES:
+        raise ValueError('Unknown document type: %s' % name)
+    document_class = DOCUMENT_CLASSES[name]
+
+    offset = HEADER.size
+    numbers = array('Q')
+    numbers.frombytes(data[offset:offset + count * 8])
+    if sys.byteorder != 'little':
+        numbers.byteswap()
+    offset += count * 8
+
+    documents = []
+    for number in numbers:
+        if number == INVALID:
+            length, = LENGTH.unpack_from(data, offset)
+            offset += LENGTH.size
+            document = document_class(data[offset:offset + length].decode())
+            offset += length
+        else:
+            # Only valid numbers are encoded; skip revalidation.
+            document = trusted_document(document_class, number)
+        documents.append(document)
+
+    return documents
@@ -0,0 +1,730 @@
+"""
+Check-digit algorithms and CPF/CNPJ value objects.
+
+This module only uses the standard library so it can be imported by
+processes that never configure Django. The masked settings are read from
+Django only when it is already loaded.
+"""
+from contextlib import contextmanager
+import operator
+import os
+import re
+import sys
+import threading
+from types import MappingProxyType
+
+__all__ = [
+    'CPF', 'CNPJ', 'cpf_to_python', 'cnpj_to_python',
+    'check_cpf', 'check_cnpj', 'is_valid_cpf', 'is_valid_cnpj',
+    'cpf_generator', 'cnpj_generator', 'cpf_random_generator', 'cnpj_random_generator',
+    'cpf_check_digits', 'cnpj_check_digits', 'iter_cpfs', 'iter_cnpjs',
+    'ParseCache', 'parse_cache', 'CheckDigitSpec', 'CPF_SPEC', 'CNPJ_SPEC',
+    'is_valid_cpf_int', 'is_valid_cnpj_int', 'cpf_from_int', 'cnpj_from_int',
+]
+
+# Status codes returned by check_cpf/check_cnpj.
+VALID = 'valid'
+INVALID_TYPE = 'invalid_type'
+INVALID_LENGTH = 'invalid_length'
+REPEATED_DIGITS = 'repeated_digits'
+INVALID_CHECK_DIGITS = 'invalid_check_digits'
+
+# Same values as django.core.validators.EMPTY_VALUES.
+EMPTY_VALUES = (None, '', [], (), {})
+
+
+def masked_setting(name):
+    """
+    Return the ``name`` Django setting, or False when Django is not loaded
+    or not configured.
+    """
+    django_conf = sys.modules.get('django.conf')
+    if django_conf is None:
+        return False
+
+    settings = django_conf.settings
+    if not settings.configured and not os.environ.get(django_conf.ENVIRONMENT_VARIABLE):
+        return False
+    return getattr(settings, name, False)
+
+
+# Check-digit weights of each base digit, left to right. The CPF weights
+# match last_digits_cpf (v2 also adds 9 * v1); the CNPJ ones match
+# last_digits_cnpj (v2 also adds 2 * v1).
+CPF_WEIGHTS = ((1, 2, 3, 4, 5, 6, 7, 8, 9), (0, 1, 2, 3, 4, 5, 6, 7, 8))
+CNPJ_WEIGHTS = ((5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2), (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3))
+
+# Built on first use: for each block of three base digits, the weighted sum
+# of every value 000-999, so a check digit is a few table lookups.
+_partial_sums = {}
+
+
+def partial_sum_tables(weights):
+    tables = _partial_sums.get(weights)
+    if tables is None:
+        tables = tuple(
+            tuple(
+                tuple(
+                    w[k] * (c // 100) + w[k + 1] * (c // 10 % 10) + w[k + 2] * (c % 10)
+                    for c in range(1000)
+                )
+                for k in range(0, len(w), 3)
+            )
+            for w in weights
+        )
+        _partial_sums[weights] = tables
+    return tables
+
+
+# Every base is read as four blocks of three digits, the size of a CNPJ
+# base; shorter bases get leading zero weights.
+BASE_DIGITS = 12
+
+
+def mod11_mod10(remainder):
+    """
+    CPF rule: the remainder itself, with 10 read as 0.
+    """
+    return remainder % 10
+
+
+def mod11_complement(remainder):
+    """
+    CNPJ rule: 11 minus the remainder, or 0 for remainders 0 and 1.
+    """
+    return 0 if remainder < 2 else 11 - remainder
+
+
+class CheckDigitSpec:
+    """
+    Weighted modulus-11 check digits of a document type.
+
+    ``weights`` has a tuple per check digit: the weights of the
+    ``base_length`` base digits, left to right, followed by those of the
+    check digits before it. ``rule`` maps each sum modulo 11 to the digit,
+    through a table. Documents with exceptions pass
+    ``adjust(base, totals, digits)``, which returns the digit of the last
+    of ``totals`` given the ``digits`` already computed.
+    """
+
+    def __init__(self, name, base_length, weights, rule=mod11_mod10, adjust=None):
+        self.name = name
+        self.base_length = base_length
+        self.length = base_length + len(weights)
+        self.weights = tuple(tuple(w) for w in weights)
+        self.rule = rule
+        self.adjust = adjust
+        self.digit_table = tuple(rule(remainder) for remainder in range(11))
+        # Numbers made of one repeated digit are the multiples of this.
+        self.repdigit = (10 ** self.length - 1) // 9
+        self._stages = None
+
+    def __repr__(self):
+        return 'CheckDigitSpec(%r)' % self.name
+
+    def _build_stages(self):
+        padding = (0,) * (BASE_DIGITS - self.base_length)
+        tables = partial_sum_tables(tuple(padding + w[:self.base_length] for w in self.weights))
+        self._stages = tuple(zip(tables, (w[self.base_length:] for w in self.weights)))
+        return self._stages
+
+    def check_digits(self, base):
+        """
+        Return the tuple of check digits of the integer ``base``.
+        """
+        stages = self._stages or self._build_stages()
+        rest, low = divmod(base, 1000)
+        rest, third = divmod(rest, 1000)
+        high, second = divmod(rest, 1000)
+
+        digits = ()
+        totals = ()
+        for (a, b, c, d), carry in stages:
+            total = a[high] + b[second] + c[third] + d[low]
+            for weight, digit in zip(carry, digits):
+                total += weight * digit
+            if self.adjust is None:
+                digits += (self.digit_table[total % 11],)
+            else:
+                totals += (total,)
+                digits += (self.adjust(base, totals, digits),)
+        return digits
+
+    def is_valid_int(self, number):
+        """
+        Validate the integer ``number`` with arithmetic only.
+        """
+        if not 0 < number < 10 ** self.length or number % self.repdigit == 0:
+            return False
+        base, check = divmod(number, 10 ** len(self.weights))
+        expected = 0
+        for digit in self.check_digits(base):
+            expected = expected * 10 + digit
+        return expected == check
+
+    def check(self, value):
+        """
+        Return VALID or the code of the first rule ``value`` breaks, without
+        raising. Meant for bulk callers aggregating failures.
+        """
+        if not isinstance(value, str) and not isinstance(value, int):
+            return INVALID_TYPE
+
+        value = re.sub(r'\D', '', str(value)).zfill(self.length)
+        if len(value) != self.length:
+            return INVALID_LENGTH
+
+        if value.count(value[0]) == self.length:
+            return REPEATED_DIGITS
+
+        base = int(value[:self.base_length])
+        if self.check_digits(base) != tuple(map(int, value[self.base_length:])):
+            return INVALID_CHECK_DIGITS
+
+        return VALID
+
+    def generate(self, value):
+        """
+        Return the number made of the base ``value`` and its check digits,
+        or None when all its digits would be equal.
+        """
+        value = re.sub(r'\D', '', str(value)).zfill(self.base_length)[:self.base_length]
+        new = value + ''.join(map(str, self.check_digits(int(value))))
+
+        # The check digits are right by construction; only all-equal digits
+        # (e.g. 111.111.111-11) are rejected.
+        if new.count(new[0]) == len(new):
+            new = None
+
+        return new
+
+    def iter_numbers(self, start=0, stop=None):
+        """
+        Yield every valid number whose base is in ``range(start, stop)``, in
+        order.
+
+        The partial sums of the upper blocks are kept while the last three
+        digits run, so each check digit costs a table lookup. Specs with
+        ``adjust`` go through check_digits.
+        """
+        stages = self._stages or self._build_stages()
+        upper = 10 ** self.base_length
+        start, stop = max(start, 0), upper if stop is None else min(stop, upper)
+        number_format = '%%0%dd' % self.base_length + '%d' * len(self.weights)
+
+        while start < stop:
+            prefix, low = divmod(start, 1000)
+            rest, third = divmod(prefix, 1000)
+            high, second = divmod(rest, 1000)
+            end = min(stop - prefix * 1000, 1000)
+            bases = range(prefix * 1000 + low, prefix * 1000 + end)
+
+            if self.adjust is None:
+                # One column of check digits per stage, a list at a time.
+                columns = []
+                for (a, b, c, d), carry in stages:
+                    partial = a[high] + b[second] + c[third]
+                    totals = [partial + last for last in d[low:end]]
+                    for weight, column in zip(carry, columns):
+                        totals = [total + weight * digit for total, digit in zip(totals, column)]
+                    columns.append([self.digit_table[total % 11] for total in totals])
+                rows = zip(bases, *columns)
+            else:
+                rows = ((base,) + self.check_digits(base) for base in bases)
+
+            for row in rows:
+                number = number_format % row
+                if number.count(number[0]) != self.length:
+                    yield number
+
+            start = (prefix + 1) * 1000
+
+    def random(self):
+        import random
+
+        new = None
+        while not new:
+            new = self.generate(random.randrange(1, 10 ** self.base_length))
+        return new
+
+
+CPF_SPEC = CheckDigitSpec('cpf', 9, (CPF_WEIGHTS[0], CPF_WEIGHTS[1] + (9,)))
+CNPJ_SPEC = CheckDigitSpec('cnpj', 12, (CNPJ_WEIGHTS[0], CNPJ_WEIGHTS[1] + (2,)), mod11_complement)
+
+
+def last_digits_cpf(value):
+    return CPF_SPEC.check_digits(int(value[:-2]))
+
+
+def last_digits_cnpj(value):
+    return CNPJ_SPEC.check_digits(int(value[:12]))
+
+
+def check_cpf(value):
+    """
+    Return VALID or the code of the first rule ``value`` breaks, without
+    raising. Meant for bulk callers aggregating failures.
+    """
+    return CPF_SPEC.check(value)
+
+
+def check_cnpj(value):
+    """
+    Return VALID or the code of the first rule ``value`` breaks, without
+    raising.
+    """
+    return CNPJ_SPEC.check(value)
+
+
+def is_valid_cpf(value):
+    return check_cpf(value) == VALID
+
+
+def is_valid_cnpj(value):
+    return check_cnpj(value) == VALID
+
+
+def cpf_check_digits(base):
+    """
+    Return the check digits of the integer ``base`` (the first nine digits).
+    """
+    return CPF_SPEC.check_digits(base)
+
+
+def cnpj_check_digits(base):
+    """
+    Return the check digits of the integer ``base`` (the first twelve digits).
+    """
+    return CNPJ_SPEC.check_digits(base)
+
+
+def _map_ints(numbers, function, *args):
+    # A single integer or any iterable of integers.
+    try:
+        number = operator.index(numbers)
+    except TypeError:
+        return [function(operator.index(number), *args) for number in numbers]
+    return function(number, *args)
+
+
+_is_valid_cpf_int = CPF_SPEC.is_valid_int
+_is_valid_cnpj_int = CNPJ_SPEC.is_valid_int
+
+
+def is_valid_cpf_int(numbers):
+    """
+    Validate a CPF given as an integer with arithmetic only. Iterables
+    give a list of booleans and NumPy arrays a boolean array.
+    """
+    if getattr(numbers, 'ndim', 0):
+        from django_cpf_cnpj.vectorized import valid_numbers
+        return valid_numbers(numbers, CPF)
+    return _map_ints(numbers, _is_valid_cpf_int)
+
+
+def is_valid_cnpj_int(numbers):
+    """
+    Validate a CNPJ given as an integer with arithmetic only. Iterables
+    give a list of booleans and NumPy arrays a boolean array.
+    """
+    if getattr(numbers, 'ndim', 0):
+        from django_cpf_cnpj.vectorized import valid_numbers
+        return valid_numbers(numbers, CNPJ)
+    return _map_ints(numbers, _is_valid_cnpj_int)
+
+
+def cpf_generator(value):
+    return CPF_SPEC.generate(value)
+
+
+def cnpj_generator(value):
+    return CNPJ_SPEC.generate(value)
+
+
+def iter_cpfs(start=0, stop=10 ** 9):
+    """
+    Yield every valid CPF whose nine-digit base is in ``range(start, stop)``,
+    in order.
+    """
+    return CPF_SPEC.iter_numbers(start, stop)
+
+
+def iter_cnpjs(start=0, stop=10 ** 12):
+    """
+    Yield every valid CNPJ whose twelve-digit base is in
+    ``range(start, stop)``, in order.
+    """
+    return CNPJ_SPEC.iter_numbers(start, stop)
+
+
+def cpf_random_generator():
+    import random
+
+    candidate = str(random.randint(1, 999999998))
+    while not cpf_generator(candidate):
+        candidate = str(random.randint(1, 999999998))
+
+    return cpf_generator(candidate)
+
+
+def cnpj_random_generator():
+    import random
+
+    candidate = str(random.randint(1, 999999999998))
+    while not cnpj_generator(candidate):
+        candidate = str(random.randint(1, 999999999998))
+
+    return cnpj_generator(candidate)
+
+
+_fiscal_regions = {
+    '1': {
+        'name': '1.ª Região Fiscal',
+        'thirst': 'Brasília',
+        'shorted': 'RF1',
+        'jurisdiction': ('DF', 'GO', 'MT', 'MS',  'TO')
+    },
+    '2': {
+        'name': '2.ª Região Fiscal',
+        'thirst': 'Belém',
+        'shorted': 'RF2',
+        'jurisdiction': ('AC', 'AP', 'AM', 'PA', 'RO',  'RR')
+    },
+    '3': {
+        'name': '3.ª Região Fiscal',
+        'thirst': 'Fortaleza',
+        'shorted': 'RF3',
+        'jurisdiction': ('CE', 'MA',  'PI')
+    },
+    '4': {
+        'name': '4.ª Região Fiscal',
+        'thirst': 'Recife',
+        'shorted': 'RF4',
+        'jurisdiction': ('AL', 'PB', 'PE', 'RN')
+    },
+    '5': {
+        'name': '5.ª Região Fiscal',
+        'thirst': 'Salvador',
+        'shorted': 'RF5',
+        'jurisdiction': ('BA', 'SE')
+    },
+    '6': {
+        'name': '6.ª Região Fiscal',
+        'thirst': 'Belo Horizonte',
+        'shorted': 'RF6',
+        'jurisdiction': ('MG',)
+    },
+    '7': {
+        'name': '7.ª Região Fiscal',
+        'thirst': 'Rio de Janeiro',
+        'shorted': 'RF7',
+        'jurisdiction': ('ES', 'RJ')
+    },
+    '8': {
+        'name': '8.ª Região Fiscal',
+        'thirst': 'São Paulo',
+        'shorted': 'RF8',
+        'jurisdiction': ('SP',)
+    },
+    '9': {
+        'name': '9.ª Região Fiscal',
+        'thirst': 'Curitiba',
+        'shorted': 'RF9',
+        'jurisdiction': ('PR', 'SC')
+    },
+    '0': {
+        'name': '10.ª Região Fiscal',
+        'thirst': 'Porto Alegre',
+        'shorted': 'RF10',
+        'jurisdiction': ('RS',)
+    },
+}
+
+FISCAL_REGIONS = MappingProxyType({
+    digit: MappingProxyType(region) for digit, region in _fiscal_regions.items()
+})
+
+
+class ParseCache:
+    """
+    Memo of parsed documents, keyed by document class and raw string.
+    ``hits`` counts the parses it saved.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.documents = {}
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, document_class, value):
+        key = (document_class, value)
+        document = self.documents.get(key)
+        if document is not None:
+            self.hits += 1
+            return document
+
+        self.misses += 1
+        document = document_class.from_string(value)
+        if len(self.documents) < self.max_size:
+            self.documents[key] = document
+        return document
+
+
+class _LocalVar(threading.local):
+    """
+    Per-thread stand-in for ContextVar on Python 3.6.
+    """
+    value = None
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        token, self.value = self.value, value
+        return token
+
+    def reset(self, token):
+        self.value = token
+
+
+if sys.version_info >= (3, 7):
+    from contextvars import ContextVar
+    _parse_cache = ContextVar('django_cpf_cnpj_parse_cache', default=None)
+else:
+    _parse_cache = _LocalVar()
+
+
+@contextmanager
+def parse_cache(max_size=10000):
+    """
+    Memoize cpf_to_python/cnpj_to_python string parsing within the block.
+
+    The cache lives in a context variable, so concurrent threads and asyncio
+    tasks each see their own (on Python 3.6, only threads).
+    """
+    cache = ParseCache(max_size)
+    token = _parse_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _parse_cache.reset(token)
+
+
+def parse_document(document_class, value):
+    cache = _parse_cache.get()
+    if cache is None:
+        return document_class.from_string(value)
+    return cache.parse(document_class, value)
+
+
+def trusted_document(document_class, number):
+    """
+    Build a document from the integer of a number known to be valid,
+    skipping parsing and validation.
+    """
+    document = document_class.__new__(document_class)
+    document.raw_input = document.number = str(number).zfill(document_class.digits)
+    document._valid = True
+    return document
+
+
+def unpickle_document(document_class, number, raw_input=None):
+    if number is None:
+        return document_class(raw_input)
+    return trusted_document(document_class, number)
+
+
+class Document(object):
+    """
+    Value object of a number checked by ``spec``. Subclasses set ``spec``,
+    ``digits``, ``masked_setting_name`` and ``format()``.
+    """
+    spec = None
+    digits = None
+    masked_setting_name = None
+
+    def __init__(self, raw_input):
+        self.raw_input = raw_input
+        if type(raw_input) is int and raw_input >= 0:
+            self.number = '%0*d' % (self.digits, raw_input)
+        else:
+            self.number = re.sub(r'\D', '', str(raw_input)).zfill(self.digits)
+        self._valid = None
+
+    def __str__(self):
+        if self.is_valid():
+            format_string = masked_setting(self.masked_setting_name)
+            return self.format() if format_string else self.number
+        else:
+            return self.raw_input
+
+    def __len__(self):
+        return len(str(self))
+
+    def __repr__(self):
+        if not self.is_valid():
+            return str(
+                'Invalid{}(raw_input={})'.format(type(self).__name__, self.raw_input)
+            )
+        else:
+            return str(
+                '{}(raw_input={})'.format(type(self).__name__, self.raw_input)
+            )
+
+    def __eq__(self, other):
+        if other in EMPTY_VALUES:
+            return False
+        elif isinstance(other, str):
+            other = document_to_python(type(self), other)
+        elif isinstance(other, type(self)):
+            pass
+        else:
+            return False
+
+        self_str = self.number if self.is_valid() else self.raw_input
+        other_str = other.number if other.is_valid() else other.raw_input
+
+        return self_str == other_str
+
+    def __lt__(self, other):
+        if not isinstance(other, type(self)):
+            raise TypeError(
+                "'<' not supported between instances of "
+                "'%s' and '%s'" % (type(self).__name__, type(other).__name__)
+            )
+
+        invalid = None
+        if not self.is_valid():
+            invalid = self
+        elif not other.is_valid():
+            invalid = other
+
+        if invalid is not None:
+            raise ValueError('Invalid %s: %r' % (self.spec.name, invalid))
+
+        return self.number < other.number
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __reduce__(self):
+        # Valid documents pickle as their integer; only invalid ones need
+        # the raw input.
+        if self.is_valid():
+            return unpickle_document, (type(self), int(self.number))
+        return unpickle_document, (type(self), None, self.raw_input)
+
+    def __int__(self):
+        return self.to_int()
+
+    def to_int(self):
+        if not self.is_valid():
+            raise ValueError('Invalid %s: %r' % (self.spec.name, self))
+        return int(self.number)
+
+    @classmethod
+    def from_string(cls, number):
+        return cls(number)
+
+    def format(self):
+        return self.number
+
+    def is_valid(self):
+        if self._valid is None:
+            self._valid = self.spec.check(self.number) == VALID
+        return self._valid
+
+    @classmethod
+    def random_generator(cls):
+        return cls.spec.random()
+
+
+class CPF(Document):
+    spec = CPF_SPEC
+    digits = 11
+    masked_setting_name = 'CPF_MASKED'
+    # Layout of format(), one '#' per digit.
+    mask = '###.###.###-##'
+
+    # Keyed by the ninth digit of the number. Read-only, shared by every CPF.
+    fiscal_region_map = FISCAL_REGIONS
+
+    def format(self):
+        var = self.number
+        return var[:3] + '.' + var[3:6] + '.' + var[6:9] + '-' + var[-2:]
+
+    def get_fiscal_region(self):
+        if self.is_valid():
+            return self.fiscal_region_map[self.number[8]]
+        else:
+            return None
+
+
+def document_to_python(document_class, value):
+    if value in [None, '']:
+        document = value
+    elif isinstance(value, str):
+        document = parse_document(document_class, value)
+    elif isinstance(value, document_class):
+        document = value
+    else:
+        raise TypeError("Can't convert %s to %s." % (type(value).__name__, document_class.__name__))
+
+    return document
+
+
+def cpf_to_python(value):
+    return document_to_python(CPF, value)
+
+
+class CNPJ(Document):
+    spec = CNPJ_SPEC
+    digits = 14
+    masked_setting_name = 'CNPJ_MASKED'
+    mask = '##.###.###/####-##'
+
+    def format(self):
+        var = self.number
+        return var[:2] + '.' + var[2:5] + '.' + var[5:8] + '/' + var[8:12] + '-' + var[-2:]
+
+    def get_root(self):
+        # The first eight digits identify the company; branches share them.
+        return self.number[:8] if self.is_valid() else None
+
+    def get_branch(self):
+        return self.number[8:12] if self.is_valid() else None
+
+    def is_headquarters(self):
+        return self.get_branch() == '0001'
+
+
+def cnpj_to_python(value):
+    return document_to_python(CNPJ, value)
+
+
+def _from_int(number, document_class, is_valid):
+    if is_valid(number):
+        return trusted_document(document_class, number)
+    # Invalid documents render their raw input, which must be a string.
+    return document_class(str(number))
+
+
+def cpf_from_int(numbers):
+    """
+    Return the CPF of an integer, validated arithmetically. Iterables and
+    NumPy arrays give a list of CPFs.
+    """
+    if getattr(numbers, 'ndim', 0):
+        numbers = numbers.tolist()
+    return _map_ints(numbers, _from_int, CPF, _is_valid_cpf_int)
+
+
+def cnpj_from_int(numbers):
+    """
+    Return the CNPJ of an integer, validated arithmetically. Iterables and
+    NumPy arrays give a list of CNPJs.
+    """
+    if getattr(numbers, 'ndim', 0):
+        numbers = numbers.tolist()
+    return _map_ints(numbers, _from_int, CNPJ, _is_valid_cnpj_int)
@@ -0,0 +1,164 @@
+"""
+PIS/PASEP/NIS, Título de Eleitor, CNH and RENAVAM value objects.
+
+Each document is a ``CheckDigitSpec`` of the engine in core, so they share
+the CPF/CNPJ table lookups. Like core, this module only uses the standard
+library.
+"""
+
+from django_cpf_cnpj.core import VALID, CheckDigitSpec, Document, document_to_python, mod11_mod10, mod11_complement
+
+__all__ = [
+    'PIS', 'TituloEleitor', 'CNH', 'RENAVAM',
+    'pis_to_python', 'titulo_eleitor_to_python', 'cnh_to_python', 'renavam_to_python',
+    'check_pis', 'check_titulo_eleitor', 'check_cnh', 'check_renavam',
+    'is_valid_pis', 'is_valid_titulo_eleitor', 'is_valid_cnh', 'is_valid_renavam',
+    'PIS_SPEC', 'TITULO_ELEITOR_SPEC', 'CNH_SPEC', 'RENAVAM_SPEC', 'ELECTORAL_STATES',
+]
+
+
+def _titulo_eleitor_digit(base, totals, digits):
+    remainder = totals[-1] % 11
+    # São Paulo (01) and Minas Gerais (02) use 1 where the others use 0.
+    if remainder == 0 and base % 100 in (1, 2):
+        return 1
+    return remainder % 10
+
+
+def _cnh_digit(base, totals, digits):
+    # A first remainder of 10 takes 2 off the second sum.
+    if len(totals) == 2 and totals[0] % 11 == 10:
+        return (totals[1] - 2) % 11 % 10
+    return totals[-1] % 11 % 10
+
+
+# PIS/PASEP/NIS and RENAVAM share the weights and the CNPJ rule; RENAVAM's
+# usual (10 * sum) % 11 is the same digit.
+PIS_SPEC = CheckDigitSpec('pis', 10, ((3, 2, 9, 8, 7, 6, 5, 4, 3, 2),), mod11_complement)
+RENAVAM_SPEC = CheckDigitSpec('renavam', 10, ((3, 2, 9, 8, 7, 6, 5, 4, 3, 2),), mod11_complement)
+# Eight sequence digits and the two of the state; the second check digit
+# only weighs the state and the first check digit.
+TITULO_ELEITOR_SPEC = CheckDigitSpec(
+    'título de eleitor', 10,
+    ((2, 3, 4, 5, 6, 7, 8, 9, 0, 0), (0, 0, 0, 0, 0, 0, 0, 0, 7, 8, 9)),
+    mod11_mod10, _titulo_eleitor_digit,
+)
+CNH_SPEC = CheckDigitSpec(
+    'cnh', 9, ((9, 8, 7, 6, 5, 4, 3, 2, 1), (1, 2, 3, 4, 5, 6, 7, 8, 9)), mod11_mod10, _cnh_digit,
+)
+
+# Keyed by digits 9 and 10 of the Título de Eleitor.
+ELECTORAL_STATES = {
+    '01': 'SP', '02': 'MG', '03': 'RJ', '04': 'RS', '05': 'BA', '06': 'PR', '07': 'CE',
+    '08': 'PE', '09': 'SC', '10': 'GO', '11': 'MA', '12': 'PB', '13': 'PA', '14': 'ES',
+    '15': 'PI', '16': 'RN', '17': 'AL', '18': 'MT', '19': 'MS', '20': 'DF', '21': 'SE',
+    '22': 'AM', '23': 'RO', '24': 'AC', '25': 'AP', '26': 'RR', '27': 'TO', '28': 'ZZ',
+}
+
+
+def check_pis(value):
+    return PIS_SPEC.check(value)
+
+
+def check_titulo_eleitor(value):
+    return TITULO_ELEITOR_SPEC.check(value)
+
+
+def check_cnh(value):
+    return CNH_SPEC.check(value)
+
+
+def check_renavam(value):
+    return RENAVAM_SPEC.check(value)
+
+
+def is_valid_pis(value):
+    return check_pis(value) == VALID
+
+
+def is_valid_titulo_eleitor(value):
+    return check_titulo_eleitor(value) == VALID
+
+
+def is_valid_cnh(value):
+    return check_cnh(value) == VALID
+
+
+def is_valid_renavam(value):
+    return check_renavam(value) == VALID
+
+
+class PIS(Document):
+    """
+    PIS/PASEP/NIS number, formatted as 123.45678.90-1.
+    """
+    spec = PIS_SPEC
+    digits = 11
+    masked_setting_name = 'PIS_MASKED'
+
+    def format(self):
+        var = self.number
+        return var[:3] + '.' + var[3:8] + '.' + var[8:10] + '-' + var[-1:]
+
+
+class TituloEleitor(Document):
+    """
+    Título de Eleitor number, formatted as 1234 5678 0101.
+    """
+    spec = TITULO_ELEITOR_SPEC
+    digits = 12
+    masked_setting_name = 'TITULO_ELEITOR_MASKED'
+
+    def format(self):
+        var = self.number
+        return var[:4] + ' ' + var[4:8] + ' ' + var[8:]
+
+    def get_state(self):
+        if self.is_valid():
+            return ELECTORAL_STATES.get(self.number[8:10])
+        else:
+            return None
+
+    @classmethod
+    def random_generator(cls):
+        import random
+
+        new = None
+        while not new:
+            new = cls.spec.generate('%08d%02d' % (random.randint(1, 99999999), random.randint(1, 28)))
+        return new
+
+
+class CNH(Document):
+    """
+    CNH (driver's license) number. It has no mask.
+    """
+    spec = CNH_SPEC
+    digits = 11
+    masked_setting_name = 'CNH_MASKED'
+
+
+class RENAVAM(Document):
+    """
+    RENAVAM (vehicle registry) number; older nine-digit numbers are
+    zero-padded. It has no mask.
+    """
+    spec = RENAVAM_SPEC
+    digits = 11
+    masked_setting_name = 'RENAVAM_MASKED'
+
+
+def pis_to_python(value):
+    return document_to_python(PIS, value)
+
+
+def titulo_eleitor_to_python(value):
+    return document_to_python(TituloEleitor, value)
+
+
+def cnh_to_python(value):
+    return document_to_python(CNH, value)
+
+
+def renavam_to_python(value):
+    return document_to_python(RENAVAM, value)
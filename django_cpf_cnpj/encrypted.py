@@ -0,0 +1,220 @@
+"""
+Encrypted CPF/CNPJ fields searchable through an HMAC blind index.
+
+    class Person(models.Model):
+        cpf = EncryptedCPFField()
+        cpf_index = BlindIndexField('cpf')
+
+The document column holds a Fernet token and ``cpf_index`` the HMAC-SHA256
+of the canonical number, so ``filter(cpf=...)`` and ``filter(cpf__in=...)``
+are index lookups on ``cpf_index``. Keys are read from
+``CPF_CNPJ_ENCRYPTION_KEYS`` (Fernet keys) and ``CPF_CNPJ_BLIND_INDEX_KEYS``;
+the first of each is current and the others are still accepted until
+``rotate_keys`` has rewritten every row. Requires cryptography.
+
+The index is computed in ``save()``, so ``QuerySet.update()``,
+``bulk_update()`` and ``save(update_fields=...)`` raise ``ValueError`` when
+they write the document without its index field. Pass
+``cpf_index=blind_index(document)`` alongside the document to update both.
+"""
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models import Lookup
+from django.db.models.lookups import In
+from django.db.models.sql.subqueries import UpdateQuery
+from django.utils.translation import gettext_lazy as _
+
+from django_cpf_cnpj.fields import CPFField, CNPJField
+from django_cpf_cnpj.utils import iter_batches
+
+__all__ = ['EncryptedCPFField', 'EncryptedCNPJField', 'BlindIndexField', 'blind_index', 'rotate_keys']
+
+
+def _keys(name):
+    keys = getattr(settings, name, None)
+    if not keys:
+        raise ImproperlyConfigured('%s must list at least one key.' % name)
+    return [key.encode() if isinstance(key, str) else key for key in keys]
+
+
+def get_fernet():
+    try:
+        from cryptography.fernet import Fernet, MultiFernet
+    except ImportError:
+        raise ImportError('django_cpf_cnpj.encrypted requires cryptography.')
+    return MultiFernet([Fernet(key) for key in _keys('CPF_CNPJ_ENCRYPTION_KEYS')])
+
+
+def plaintext(document):
+    """
+    Return the string that is encrypted and indexed for ``document``.
+    """
+    return document.number if document.is_valid() else document.raw_input
+
+
+def blind_index(document, key=None):
+    """
+    Return the hex HMAC-SHA256 of ``document`` under ``key``, by default
+    the current blind index key.
+    """
+    if key is None:
+        key = _keys('CPF_CNPJ_BLIND_INDEX_KEYS')[0]
+    return hmac.new(key, plaintext(document).encode(), hashlib.sha256).hexdigest()
+
+
+class BlindIndexExact(Lookup):
+    """
+    Compare the blind index column with the digests of the value under
+    every configured key, so rows not yet rotated still match.
+    """
+    lookup_name = 'exact'
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, 'resolve_expression'):
+            raise ValueError('%s lookups only accept values.' % type(self.lhs.output_field).__name__)
+        return self.rhs
+
+    def get_values(self):
+        return [self.rhs]
+
+    def as_sql(self, compiler, connection):
+        field = self.lhs.output_field
+        index_field = field.index_field
+        keys = _keys('CPF_CNPJ_BLIND_INDEX_KEYS')
+
+        digests = []
+        for value in self.get_values():
+            document = field.to_document(value)
+            digests.extend(blind_index(document, key) for key in keys)
+
+        return compiler.compile(In(index_field.get_col(self.lhs.alias), digests))
+
+
+class BlindIndexIn(BlindIndexExact):
+    lookup_name = 'in'
+
+    def get_values(self):
+        return self.rhs
+
+
+class EncryptedDocumentMixin:
+    """
+    Stores a Fernet token of the document. Lookups need a
+    ``BlindIndexField`` pointing at the field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', 255)
+        super().__init__(*args, **kwargs)
+
+    @property
+    def index_field(self):
+        for field in self.model._meta.concrete_fields:
+            if isinstance(field, BlindIndexField) and field.source == self.name:
+                return field
+        raise ImproperlyConfigured(
+            '%s.%s needs a BlindIndexField(%r).' % (self.model.__name__, self.name, self.name)
+        )
+
+    def get_placeholder(self, value, compiler, connection):
+        # Called for every value the compiler writes to this column; an
+        # UPDATE that leaves the index out would make lookups miss the row.
+        if isinstance(compiler.query, UpdateQuery):
+            index_field = self.index_field
+            if not any(field is index_field for field, model, val in compiler.query.values):
+                raise ValueError(
+                    'Updating %s.%s needs %s too, or its blind index goes stale.'
+                    % (self.model.__name__, self.name, index_field.name)
+                )
+        return '%s'
+
+    def get_prep_value(self, value):
+        if value in self.empty_values:
+            return value
+        document = value if isinstance(value, self.document_class) else self.to_document(value)
+        return get_fernet().encrypt(plaintext(document).encode()).decode()
+
+    def from_db_value(self, value, expression, connection):
+        if value in self.empty_values:
+            return value
+        return get_fernet().decrypt(value.encode()).decode()
+
+
+class EncryptedCPFField(EncryptedDocumentMixin, CPFField):
+    description = _('Encrypted CPF number')
+
+
+EncryptedCPFField.register_lookup(BlindIndexExact)
+EncryptedCPFField.register_lookup(BlindIndexIn)
+
+
+class EncryptedCNPJField(EncryptedDocumentMixin, CNPJField):
+    description = _('Encrypted CNPJ number')
+
+
+EncryptedCNPJField.register_lookup(BlindIndexExact)
+EncryptedCNPJField.register_lookup(BlindIndexIn)
+
+
+class BlindIndexField(models.CharField):
+    """
+    Indexed HMAC of the encrypted field ``source``, filled in on save.
+    """
+    description = _('Blind index')
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', 64)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        args = [self.source] + list(args)
+        if kwargs.get('max_length') == 64:
+            del kwargs['max_length']
+        if self.db_index:
+            del kwargs['db_index']
+        else:
+            kwargs['db_index'] = False
+        if not self.editable:
+            del kwargs['editable']
+        else:
+            kwargs['editable'] = True
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        document = getattr(model_instance, self.source)
+        value = document if document in (None, '') else blind_index(document)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def rotate_keys(model, field_name, batch_size=1000, start_after=None, using=None):
+    """
+    Re-encrypt ``field_name`` and recompute its blind index with the
+    current keys, one ``bulk_update`` per batch. Returns the number of rows
+    rewritten; old keys can be dropped afterwards.
+    """
+    field = model._meta.get_field(field_name)
+    index_field = field.index_field
+    manager = model._default_manager.db_manager(using)
+
+    rewritten = 0
+    for batch in iter_batches(manager.all(), field_name, batch_size, start_after):
+        rows = []
+        for pk, value in batch:
+            if value in field.empty_values:
+                continue
+            document = field.to_document(value)
+            rows.append(model(**{'pk': pk, field_name: document, index_field.attname: blind_index(document)}))
+
+        manager.bulk_update(rows, [field_name, index_field.name])
+        rewritten += len(rows)
+
+    return rewritten
@@ -0,0 +1,259 @@
+from collections import OrderedDict
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from django_cpf_cnpj.core import CPF
+
+__all__ = ['BaseRegistryBackend', 'StubRegistryBackend', 'DocumentEnricher', 'EnrichmentStats']
+
+MISSING = object()
+# Stored in the Django cache for unknown documents, since some backends
+# can't tell a cached None from a miss.
+NOT_FOUND = 'django_cpf_cnpj:not-found'
+
+
+class BaseRegistryBackend:
+    """
+    Upstream registry queried for documents missing from the caches.
+
+    ``fetch`` returns a dict of registry data (e.g. ``{'status': 'active'}``)
+    or None when the registry does not know the document. Errors should be
+    raised; they are never cached.
+    """
+
+    def fetch(self, document):
+        raise NotImplementedError('subclasses of BaseRegistryBackend must provide a fetch() method')
+
+
+class StubRegistryBackend(BaseRegistryBackend):
+    """
+    In-memory backend for tests and local development, keyed by number.
+    """
+
+    def __init__(self, records=None, delay=0):
+        self.records = dict(records or {})
+        self.delay = delay
+        self.calls = 0
+
+    def fetch(self, document):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.records.get(document.number)
+
+
+class EnrichmentStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.cache_hits = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.upstream_seconds = 0.0
+
+    def increment(self, name, value=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def lookups(self):
+        return self.local_hits + self.cache_hits + self.upstream_calls + self.coalesced
+
+    @property
+    def hit_rate(self):
+        lookups = self.lookups
+        return (self.local_hits + self.cache_hits) / lookups if lookups else 0.0
+
+    @property
+    def mean_upstream_latency(self):
+        return self.upstream_seconds / self.upstream_calls if self.upstream_calls else 0.0
+
+    def as_dict(self):
+        return {
+            'lookups': self.lookups,
+            'local_hits': self.local_hits,
+            'cache_hits': self.cache_hits,
+            'upstream_calls': self.upstream_calls,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'hit_rate': self.hit_rate,
+            'mean_upstream_latency': self.mean_upstream_latency,
+        }
+
+
+class LocalCache:
+    """
+    Thread-safe LRU with per-entry expiry.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, MISSING)
+            if entry is MISSING:
+                return MISSING
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        ttl = min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class DocumentEnricher:
+    """
+    Look up registry data for CPF/CNPJ numbers through an in-process LRU,
+    then the Django cache, then the upstream backend.
+
+    Unknown documents are cached for ``negative_ttl`` seconds. Concurrent
+    lookups of the same document wait for a single upstream call.
+    """
+
+    def __init__(self, backend=None, cache_alias=DEFAULT_CACHE_ALIAS, ttl=3600, negative_ttl=300,
+                 local_size=1024, local_ttl=60, key_prefix='django_cpf_cnpj'):
+        if backend is None:
+            path = getattr(settings, 'CPF_CNPJ_REGISTRY_BACKEND', None)
+            if not path:
+                raise ImproperlyConfigured(
+                    'Pass a backend to DocumentEnricher or set CPF_CNPJ_REGISTRY_BACKEND.'
+                )
+            backend = import_string(path)()
+        self.backend = backend
+        self.cache_alias = cache_alias
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.key_prefix = key_prefix
+        self.local = LocalCache(local_size, local_ttl)
+        self.stats = EnrichmentStats()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def make_key(self, document):
+        return '%s:%s:%s' % (self.key_prefix, type(document).__name__.lower(), document.number)
+
+    def lookup(self, value, document_class=CPF):
+        """
+        Return the registry data of ``value`` (a document object or a string
+        parsed as ``document_class``), or None if the registry does not
+        know it.
+        """
+        document = value if hasattr(value, 'is_valid') else document_class(value)
+        if not document.is_valid():
+            raise ValueError('Invalid %s: %r' % (type(document).__name__.lower(), document))
+
+        key = self.make_key(document)
+        found = self._cached(key)
+        if found is not MISSING:
+            return found
+        return self._fetch(key, document)
+
+    def _cached(self, key):
+        """
+        Return the data of ``key`` from the LRU or the Django cache, or
+        MISSING.
+        """
+        found = self.local.get(key)
+        if found is not MISSING:
+            self.stats.increment('local_hits')
+            return found
+
+        found = self.cache.get(key, MISSING)
+        if found is not MISSING:
+            self.stats.increment('cache_hits')
+            if found == NOT_FOUND:
+                found = None
+            self.local.set(key, found, self.ttl if found is not None else self.negative_ttl)
+        return found
+
+    def _fetch(self, key, document):
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self._in_flight[key] = InFlight()
+
+        if not leader:
+            self.stats.increment('coalesced')
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            # A leader that finished between our cache miss and taking the
+            # slot has already stored the value.
+            found = self._cached(key)
+            if found is MISSING:
+                found = self._fetch_upstream(key, document)
+        except Exception as e:
+            in_flight.error = e
+            raise
+        else:
+            in_flight.value = found
+            return found
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.event.set()
+
+    def _fetch_upstream(self, key, document):
+        started = time.monotonic()
+        try:
+            found = self.backend.fetch(document)
+        except Exception:
+            self.stats.increment('errors')
+            raise
+        finally:
+            self.stats.increment('upstream_calls')
+            self.stats.increment('upstream_seconds', time.monotonic() - started)
+
+        ttl = self.ttl if found is not None else self.negative_ttl
+        self.cache.set(key, NOT_FOUND if found is None else found, ttl)
+        self.local.set(key, found, ttl)
+        return found
+
+    def invalidate(self, value, document_class=CPF):
+        document = value if hasattr(value, 'is_valid') else document_class(value)
+        key = self.make_key(document)
+        self.cache.delete(key)
+        self.local.delete(key)
@@ -0,0 +1,176 @@
+"""
+Find valid CPF and CNPJ numbers in free text and large files.
+
+One precompiled pattern matches the masked and unmasked forms of both
+documents; candidates are checked with the integer check-digit path before
+any object is built. Only numbers not touching other digits match, so a
+CPF is never found inside a longer number.
+"""
+from collections import namedtuple
+import mmap
+import os
+import re
+import sys
+import time
+
+from django_cpf_cnpj.core import CPF, CNPJ, cpf_check_digits, cnpj_check_digits, trusted_document
+
+__all__ = ['DocumentMatch', 'FileScan', 'find_documents', 'scan_file']
+
+# Starts with a plain digit class so the regex engine can skip ahead to
+# digits; the lookbehind then rejects digits preceded by another digit.
+PATTERN = (
+    r'[0-9](?<![0-9]{2})(?:'
+    r'(?P<cnpj>[0-9]\.[0-9]{3}\.[0-9]{3}/[0-9]{4}-[0-9]{2}|[0-9]{13})'
+    r'|(?P<cpf>[0-9]{2}\.[0-9]{3}\.[0-9]{3}-[0-9]{2}|[0-9]{10})'
+    r')(?![0-9])'
+)
+TEXT_PATTERN = re.compile(PATTERN)
+BYTES_PATTERN = re.compile(PATTERN.encode())
+
+# Longest match (a masked CNPJ) plus the character the lookahead reads.
+OVERLAP = 32
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Numbers made of one repeated digit are the multiples of these.
+CPF_REPDIGIT = (10 ** 11 - 1) // 9
+CNPJ_REPDIGIT = (10 ** 14 - 1) // 9
+
+DocumentMatch = namedtuple('DocumentMatch', ['document', 'start', 'end'])
+
+
+def _documents(pattern, data, pos, endpos, limit, offset, document_classes, strip):
+    """
+    Yield the valid documents of ``data[pos:endpos]`` starting before
+    ``limit``, with positions shifted by ``offset``.
+    """
+    want_cpf = CPF in document_classes
+    want_cnpj = CNPJ in document_classes
+
+    for match in pattern.finditer(data, pos, endpos):
+        start = match.start()
+        if start >= limit:
+            return
+        # The pattern fixes the length, so only repeated digits and the
+        # check digits are left to test.
+        number = int(strip(match.group()))
+        base, check = divmod(number, 100)
+        if match.lastgroup == 'cpf':
+            if not want_cpf or number % CPF_REPDIGIT == 0 or cpf_check_digits(base) != divmod(check, 10):
+                continue
+            document = trusted_document(CPF, number)
+        else:
+            if not want_cnpj or number % CNPJ_REPDIGIT == 0 or cnpj_check_digits(base) != divmod(check, 10):
+                continue
+            document = trusted_document(CNPJ, number)
+        yield DocumentMatch(document, offset + start, offset + match.end())
+
+
+def _strip_text(token):
+    return token.replace('.', '').replace('-', '').replace('/', '')
+
+
+def _strip_bytes(token):
+    return token.translate(None, b'.-/')
+
+
+def find_documents(text, document_classes=(CPF, CNPJ)):
+    """
+    Yield a ``DocumentMatch`` (document, start, end) for every valid CPF or
+    CNPJ of ``text``, a str or bytes.
+    """
+    if isinstance(text, str):
+        pattern, strip = TEXT_PATTERN, _strip_text
+    else:
+        pattern, strip = BYTES_PATTERN, _strip_bytes
+    return _documents(pattern, text, 0, len(text), len(text), 0, document_classes, strip)
+
+
+class FileScan:
+    """
+    Iterable of the ``DocumentMatch`` of a file, with byte offsets. The file
+    is memory-mapped, or read in chunks with ``use_mmap=False`` (e.g. for
+    pipes); either way it is searched ``chunk_size`` bytes at a time and
+    matches crossing a chunk boundary are found once.
+    """
+
+    def __init__(self, path, document_classes=(CPF, CNPJ), chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=True):
+        self.path = path
+        self.document_classes = document_classes
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.bytes_scanned = 0
+        self.matches = 0
+        self.elapsed = 0.0
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes_scanned / 1e6 / self.elapsed if self.elapsed else 0.0
+
+    def __iter__(self):
+        started = time.monotonic()
+        try:
+            with open(self.path, 'rb') as scanned_file:
+                if self.use_mmap and os.fstat(scanned_file.fileno()).st_size:
+                    chunks = self._mapped(scanned_file)
+                else:
+                    chunks = self._streamed(scanned_file)
+                for match in chunks:
+                    self.matches += 1
+                    yield match
+        finally:
+            self.elapsed += time.monotonic() - started
+
+    def _mapped(self, scanned_file):
+        with mmap.mmap(scanned_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            resume = 0
+            for start in range(0, size, self.chunk_size):
+                limit = min(start + self.chunk_size, size)
+                for match in _documents(BYTES_PATTERN, data, resume, min(limit + OVERLAP, size), limit, 0,
+                                        self.document_classes, _strip_bytes):
+                    resume = match.end
+                    yield match
+                resume = max(resume, limit)
+                self.bytes_scanned = limit
+
+    def _streamed(self, scanned_file):
+        # ``data`` is the unscanned tail of the previous chunk, plus the
+        # character before it for the lookbehind, followed by the new chunk.
+        data = b''
+        base = 0
+        pos = 0
+        while True:
+            chunk = scanned_file.read(self.chunk_size)
+            data += chunk
+            limit = len(data) if not chunk else len(data) - OVERLAP
+            resume = pos
+            if limit > pos:
+                for match in _documents(BYTES_PATTERN, data, pos, len(data), limit, base,
+                                        self.document_classes, _strip_bytes):
+                    resume = match.end - base
+                    yield match
+                resume = max(resume, limit)
+                self.bytes_scanned = base + limit
+            if not chunk:
+                return
+
+            keep = max(resume - 1, 0)
+            data = data[keep:]
+            base += keep
+            pos = resume - keep
+
+
+def scan_file(path, document_classes=(CPF, CNPJ), chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=True):
+    """
+    Return a ``FileScan`` of ``path``; iterate over it for the matches,
+    then read ``megabytes_per_second``.
+    """
+    return FileScan(path, document_classes, chunk_size, use_mmap)
+
+
+if __name__ == '__main__':
+    scan = scan_file(sys.argv[1])
+    for document, start, end in scan:
+        print('%d\t%s\t%s' % (start, type(document).__name__, document.format()))
+    sys.stderr.write('%d documents, %.1f MB/s\n' % (scan.matches, scan.megabytes_per_second))
@@ -2,14 +2,24 @@ from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from django_cpf_cnpj.validators import validate_cpf, validate_cnpj
-from django_cpf_cnpj.cpf import cpf_to_python, CPF
-from django_cpf_cnpj.cnpj import cnpj_to_python, CNPJ
+from django_cpf_cnpj.validators import (
+    validate_cpf, validate_cnpj, validate_pis, validate_titulo_eleitor, validate_cnh, validate_renavam,
+)
+from django_cpf_cnpj.cpf import CPF
+from django_cpf_cnpj.cnpj import CNPJ
+from django_cpf_cnpj.documents import PIS, TituloEleitor, CNH, RENAVAM, document_to_python
+from django_cpf_cnpj.lookups import DocumentExact, DocumentIn
 
-__all__ = ['CPFField', 'CNPJField']
+__all__ = ['CPFField', 'CNPJField', 'PISField', 'TituloEleitorField', 'CNHField', 'RENAVAMField']
 
 
-class CPFDescriptor:
+class DocumentDescriptor:
+    """
+    Holds objects of the field's ``document_class``. With ``lazy=True`` on
+    the field, strings are kept as assigned and parsed on first access, so
+    rows whose document is never read skip the parsing.
+    """
+
     def __init__(self, field):
         self.field = field
 
@@ -19,105 +29,130 @@ class CPFDescriptor:
 
         if self.field.name in instance.__dict__:
             value = instance.__dict__[self.field.name]
+            if isinstance(value, str):
+                value = instance.__dict__[self.field.name] = self.field.to_document(value)
         else:
             instance.refresh_from_db(fields=[self.field.name])
             value = getattr(instance, self.field.name)
         return value
 
     def __set__(self, instance, value):
-        instance.__dict__[self.field.name] = cpf_to_python(value)
+        if self.field.lazy and isinstance(value, str):
+            instance.__dict__[self.field.name] = value
+        else:
+            instance.__dict__[self.field.name] = self.field.to_document(value)
 
 
-class CPFField(models.CharField):
-    default_validators = [validate_cpf]
-    description = _('CPF number')
-    descriptor_class = CPFDescriptor
+class DocumentField(models.CharField):
+    """
+    Base of the document fields. Subclasses set ``document_class`` and
+    ``default_max_length``, the length of the masked number.
+    """
+    descriptor_class = DocumentDescriptor
+    document_class = None
+    default_max_length = None
 
-    def __init__(self, masked=False, *args, **kwargs):
-        kwargs.setdefault('max_length', 14)
+    def __init__(self, masked=False, *args, lazy=False, **kwargs):
+        kwargs.setdefault('max_length', self.default_max_length)
         super().__init__(*args, **kwargs)
-        self._masked = getattr(settings, 'CPF_MASKED', None) or masked
+        self.lazy = lazy
+        self._masked_argument = masked
+        self._masked = getattr(settings, self.document_class.masked_setting_name, None) or masked
         self.empty_values = [None, '']
 
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self._masked_argument:
+            kwargs['masked'] = True
+        if self.lazy:
+            kwargs['lazy'] = True
+        return name, path, args, kwargs
+
     @property
     def is_masked(self):
-        return self._masked or getattr(settings, 'CPF_MASKED', False)
+        return self._masked or getattr(settings, self.document_class.masked_setting_name, False)
 
-    def get_prep_value(self, value):
+    def to_document(self, value):
+        return document_to_python(self.document_class, value)
+
+    def get_canonical_value(self, value):
         """
-        Perform preliminary non-db specific value checks and conversions.
+        Return the string this field stores for ``value``.
         """
-        if not value:
-            return super().get_prep_value(value)
-
-        if isinstance(value, CPF):
-            parsed_value = value
-        else:
-            # Convert the string to a CPF object.
-            parsed_value = cpf_to_python(value)
+        parsed_value = value if isinstance(value, self.document_class) else self.to_document(value)
 
         if parsed_value.is_valid():
-            # A valid cpf. Normalize it for storage.
-            value = parsed_value.__str__()
+            # A valid document. Normalize it for storage.
+            return parsed_value.format() if self.is_masked else parsed_value.number
         else:
-            # Not a valid cpf. Store the raw string.
-            value = parsed_value.raw_input
+            # Not a valid document. Store the raw string.
+            return parsed_value.raw_input
 
-        return super().get_prep_value(value)
+    def get_canonical_values(self, values):
+        """
+        Return the distinct stored forms of ``values``, parsing each
+        distinct input only once.
+        """
+        canonical = {}
+        for value in values:
+            if value is None or value == '':
+                canonical[value] = value
+            elif value not in canonical:
+                canonical[value] = self.get_canonical_value(value)
 
+        return list(dict.fromkeys(canonical.values()))
 
-class CNPJDescriptor:
-    def __init__(self, field):
-        self.field = field
+    def get_prep_value(self, value):
+        """
+        Perform preliminary non-db specific value checks and conversions.
+        """
+        if not value:
+            return super().get_prep_value(value)
 
-    def __get__(self, instance, owner):
-        if instance is None:
-            return self
+        return super().get_prep_value(self.get_canonical_value(value))
 
-        if self.field.name in instance.__dict__:
-            value = instance.__dict__[self.field.name]
-        else:
-            instance.refresh_from_db(fields=[self.field.name])
-            value = getattr(instance, self.field.name)
-        return value
 
-    def __set__(self, instance, value):
-        instance.__dict__[self.field.name] = cnpj_to_python(value)
+class CPFField(DocumentField):
+    default_validators = [validate_cpf]
+    description = _('CPF number')
+    document_class = CPF
+    default_max_length = 14
 
 
-class CNPJField(models.CharField):
+class CNPJField(DocumentField):
     default_validators = [validate_cnpj]
     description = _('CNPJ number')
-    descriptor_class = CNPJDescriptor
+    document_class = CNPJ
+    default_max_length = 18
 
-    def __init__(self, masked=False, *args, **kwargs):
-        kwargs.setdefault('max_length', 18)
-        super().__init__(*args, **kwargs)
-        self._masked = getattr(settings, 'CNPJ_MASKED', None) or masked
-        self.empty_values = [None, '']
 
-    @property
-    def is_masked(self):
-        return self._masked or getattr(settings, 'CNPJ_MASKED', False)
+class PISField(DocumentField):
+    default_validators = [validate_pis]
+    description = _('PIS/PASEP/NIS number')
+    document_class = PIS
+    default_max_length = 14
 
-    def get_prep_value(self, value):
-        """
-        Perform preliminary non-db specific value checks and conversions.
-        """
-        if not value:
-            return super().get_prep_value(value)
 
-        if isinstance(value, CNPJ):
-            parsed_value = value
-        else:
-            # Convert the string to a CPF object.
-            parsed_value = cnpj_to_python(value)
+class TituloEleitorField(DocumentField):
+    default_validators = [validate_titulo_eleitor]
+    description = _('Título de Eleitor number')
+    document_class = TituloEleitor
+    default_max_length = 14
+
+
+class CNHField(DocumentField):
+    default_validators = [validate_cnh]
+    description = _('CNH number')
+    document_class = CNH
+    default_max_length = 11
+
+
+class RENAVAMField(DocumentField):
+    default_validators = [validate_renavam]
+    description = _('RENAVAM number')
+    document_class = RENAVAM
+    default_max_length = 11
 
-        if parsed_value.is_valid():
-            # A valid cpf. Normalize it for storage.
-            value = parsed_value.__str__()
-        else:
-            # Not a valid cpf. Store the raw string.
-            value = parsed_value.raw_input
 
-        return super().get_prep_value(value)
+DocumentField.register_lookup(DocumentExact)
+DocumentField.register_lookup(DocumentIn)
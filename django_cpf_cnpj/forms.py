@@ -1,3 +1,5 @@
+from functools import partial
+
 from django.forms.fields import CharField
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -5,76 +7,151 @@ from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from django.core import validators
 
-from django_cpf_cnpj.validators import validate_cpf, validate_cnpj
-from django_cpf_cnpj.widgets import CPFWidget, CNPJWidget
-from django_cpf_cnpj.cpf import cpf_to_python
-from django_cpf_cnpj.cnpj import cnpj_to_python
-
-
-__all__ = ['CPFForm', 'CNPJForm']
-
-
-class CPFForm(CharField):
-    default_validators = [validate_cpf]
+from django_cpf_cnpj.validators import (
+    validate_cpf, validate_cnpj, validate_pis, validate_titulo_eleitor, validate_cnh, validate_renavam,
+)
+from django_cpf_cnpj.widgets import (
+    CPFWidget, CNPJWidget, PISWidget, TituloEleitorWidget, CNHWidget, RENAVAMWidget,
+)
+from django_cpf_cnpj.cpf import CPF
+from django_cpf_cnpj.cnpj import CNPJ
+from django_cpf_cnpj.documents import PIS, TituloEleitor, CNH, RENAVAM, document_to_python
+
+
+__all__ = [
+    'CPFForm', 'CNPJForm', 'PISForm', 'TituloEleitorForm', 'CNHForm', 'RENAVAMForm',
+    'DocumentFormSetMixin', 'parse_documents',
+]
+
+
+class DocumentForm(CharField):
+    """
+    Base of the document form fields. Subclasses set ``document_class``,
+    ``widget_class`` and ``example_number``.
+    """
+    document_class = None
+    widget_class = None
+    example_number = None
+    invalid_message = _('Enter a valid {name} number (e.g. {example_number}).')
+    masked_invalid_message = invalid_message
+    # Raw value -> parsed document, shared across a formset.
+    parsed_values = None
 
     def __init__(self, *args, masked=False, **kwargs):
         super().__init__(*args, **kwargs)
-        self.widget = CPFWidget()
-        self.masked = getattr(settings, 'CPF_MASKED', None) or masked
+        self.masked = getattr(settings, self.document_class.masked_setting_name, None) or masked
 
         if 'invalid' not in self.error_messages:
-            if masked:
-                example_number = '012.345.678-90'
-                error_message = _(f'Enter a valid cpf number (e.g. {example_number})')
-            else:
-                example_number = '01234567890'
-                error_message = _(f'Enter a valid cpf number (e.g. {example_number}).')
-
+            example = self.document_class(self.example_number)
             self.error_messages['invalid'] = format_lazy(
-                error_message, example_number=example_number
+                self.masked_invalid_message if masked else self.invalid_message,
+                name=self.document_class.spec.name,
+                example_number=example.format() if masked else example.number,
             )
 
+        self.widget = self.widget_class(
+            attrs={'data-invalid-message': self.error_messages['invalid']}, masked=self.masked,
+        )
+
     def to_python(self, value):
-        cpf = cpf_to_python(value)
+        if self.parsed_values is not None and value in self.parsed_values:
+            document = self.parsed_values[value]
+        else:
+            document = document_to_python(self.document_class, value)
 
-        if cpf in validators.EMPTY_VALUES:
+        if document in validators.EMPTY_VALUES:
             return self.empty_value
 
-        if cpf and not cpf.is_valid():
+        if document and not document.is_valid():
             raise ValidationError(self.error_messages['invalid'])
 
-        return cpf
-
-
-class CNPJForm(CharField):
-    default_validators = [validate_cnpj]
-
-    def __init__(self, *args, masked=False, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.widget = CNPJWidget()
-        self.masked = getattr(settings, 'CNPJ_MASKED', None) or masked
-
-        if 'invalid' not in self.error_messages:
-            if masked:
-                example_number = '00.123.456/7890-01'
-                error_message = _(
-                    'Enter a valid cnpj number (e.g. {example_number})'
-                )
-            else:
-                example_number = '00123456789001'
-                error_message = _('Enter a valid cnpj number (e.g. {example_number}).')
-
-            self.error_messages['invalid'] = format_lazy(
-                error_message, example_number=example_number
-            )
+        return document
 
-    def to_python(self, value):
-        cnpj = cnpj_to_python(value)
 
-        if cnpj in validators.EMPTY_VALUES:
-            return self.empty_value
+class CPFForm(DocumentForm):
+    default_validators = [validate_cpf]
+    document_class = CPF
+    widget_class = CPFWidget
+    example_number = '01234567890'
+    masked_invalid_message = _('Enter a valid {name} number (e.g. {example_number})')
 
-        if cnpj and not cnpj.is_valid():
-            raise ValidationError(self.error_messages['invalid'])
 
-        return cnpj
+class CNPJForm(DocumentForm):
+    default_validators = [validate_cnpj]
+    document_class = CNPJ
+    widget_class = CNPJWidget
+    example_number = '00123456789001'
+    masked_invalid_message = _('Enter a valid {name} number (e.g. {example_number})')
+
+
+class PISForm(DocumentForm):
+    default_validators = [validate_pis]
+    document_class = PIS
+    widget_class = PISWidget
+    example_number = '12056412545'
+
+
+class TituloEleitorForm(DocumentForm):
+    default_validators = [validate_titulo_eleitor]
+    document_class = TituloEleitor
+    widget_class = TituloEleitorWidget
+    example_number = '123456780191'
+
+
+class CNHForm(DocumentForm):
+    default_validators = [validate_cnh]
+    document_class = CNH
+    widget_class = CNHWidget
+    example_number = '12345678900'
+
+
+class RENAVAMForm(DocumentForm):
+    default_validators = [validate_renavam]
+    document_class = RENAVAM
+    widget_class = RENAVAMWidget
+    example_number = '01234567897'
+
+
+def parse_documents(values, to_python):
+    """
+    Parse every distinct value of ``values`` once with ``to_python`` and
+    validate it, returning a dict mapping raw values to documents.
+    """
+    parsed = {}
+    for value in values:
+        if value in parsed or not isinstance(value, str):
+            continue
+
+        document = to_python(value)
+        if document not in validators.EMPTY_VALUES:
+            # Validity is cached on the object for the form field validators.
+            document.is_valid()
+        parsed[value] = document
+
+    return parsed
+
+
+class DocumentFormSetMixin:
+    """
+    Formset mixin parsing all document cells of the bound forms in one pass
+    before the forms are cleaned. Repeated values are parsed once and every
+    form field reuses the shared result.
+    """
+
+    def full_clean(self):
+        if self.is_bound:
+            self.parse_document_fields()
+        super().full_clean()
+
+    def parse_document_fields(self):
+        fields = {}
+        for form in self.forms:
+            for name, field in form.fields.items():
+                if isinstance(field, DocumentForm):
+                    fields.setdefault(field.document_class, []).append(form[name])
+
+        for document_class, bound_fields in fields.items():
+            to_python = partial(document_to_python, document_class)
+            parsed = parse_documents((bound.data for bound in bound_fields), to_python)
+            for bound in bound_fields:
+                bound.field.parsed_values = parsed
@@ -0,0 +1,271 @@
+"""
+Database functions validating and normalizing CPF/CNPJ columns in SQL.
+
+On SQLite the expressions call functions registered on every connection
+(see ``register_functions``), backed by the Python validators. Other
+backends get an equivalent expression built from standard SQL functions,
+with REGEXP_REPLACE on PostgreSQL, MySQL and Oracle to drop non-digits.
+"""
+from functools import partial, reduce
+import operator
+import re
+import sys
+
+from django.db.models import BooleanField, CharField, Func, IntegerField, Value
+from django.db.models.functions import Cast, Concat, Length, LPad, Mod, Replace, Substr
+
+from django_cpf_cnpj.core import CPF, CNPJ, check_cpf, check_cnpj, VALID
+
+__all__ = ['IsValidCPF', 'IsValidCNPJ', 'NormalizeCPF', 'NormalizeCNPJ', 'DigitsOnly', 'register_functions']
+
+# The Python validators ignore every non-digit character. Backends
+# without REGEXP_REPLACE only drop these; any other non-digit character
+# makes the value invalid there.
+MASK_CHARACTERS = ('.', '-', '/', ' ')
+
+
+def sqlite_is_valid_cpf(value):
+    if value is None:
+        return None
+    return check_cpf(value) == VALID
+
+
+def sqlite_is_valid_cnpj(value):
+    if value is None:
+        return None
+    return check_cnpj(value) == VALID
+
+
+def sqlite_digits_only(value):
+    if value is None:
+        return None
+    return re.sub(r'\D', '', str(value))
+
+
+def sqlite_normalize_document(value, digits, masked):
+    if value is None:
+        return None
+    document = (CPF if digits == CPF.digits else CNPJ)(value)
+    if not document.is_valid():
+        return value
+    return document.format() if masked else document.number
+
+
+def register_functions(connection):
+    """
+    Register is_valid_cpf, is_valid_cnpj, normalize_document and
+    digits_only on a SQLite connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    create_function = connection.connection.create_function
+    if sys.version_info >= (3, 8):
+        create_function = partial(create_function, deterministic=True)
+    create_function('is_valid_cpf', 1, sqlite_is_valid_cpf)
+    create_function('is_valid_cnpj', 1, sqlite_is_valid_cnpj)
+    create_function('normalize_document', 3, sqlite_normalize_document)
+    create_function('digits_only', 1, sqlite_digits_only)
+
+
+def register_on_connection_created(sender, connection, **kwargs):
+    register_functions(connection)
+
+
+def _check_digit(total, spec):
+    # The digit of each remainder is read from the spec's digit table.
+    digit_table = Value(''.join(map(str, spec.digit_table)))
+    return Cast(Substr(digit_table, Mod(total, Value(11)) + Value(1), 1), IntegerField())
+
+
+class DigitsOnly(Func):
+    """
+    The digits of ``expression``. Other characters are dropped where the
+    backend has REGEXP_REPLACE (and on SQLite through ``digits_only``);
+    elsewhere only MASK_CHARACTERS are.
+    """
+    arity = 1
+    output_field = CharField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        expression = self.source_expressions[0]
+        for character in MASK_CHARACTERS:
+            expression = Replace(expression, Value(character), Value(''))
+        return compiler.compile(expression.resolve_expression(compiler.query))
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='digits_only', **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="REGEXP_REPLACE(%(expressions)s, '[^0-9]', '', 'g')", **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="REGEXP_REPLACE(%(expressions)s, '[^0-9]', '')", **extra_context
+        )
+
+    as_oracle = as_mysql
+
+
+# Lookups only compile as expressions from Django 4.0 and When() takes
+# boolean expressions from 3.0, so the fallback builds its CASE from these.
+class _Condition(Func):
+    template = '(%(expressions)s)'
+    output_field = BooleanField()
+
+    def __init__(self, *expressions, operator):
+        super().__init__(*expressions, arg_joiner=' %s ' % operator)
+
+
+class _IsNull(Func):
+    template = '%(expressions)s IS NULL'
+    output_field = BooleanField()
+
+
+class _When(Func):
+    template = 'WHEN %(expressions)s'
+    arg_joiner = ' THEN '
+
+
+class _Else(Func):
+    template = 'ELSE %(expressions)s'
+
+
+class _Case(Func):
+    template = 'CASE %(expressions)s END'
+    arg_joiner = ' '
+
+
+def _case(whens, default, output_field):
+    whens = [_When(condition, then, output_field=output_field) for condition, then in whens]
+    return _Case(*whens, _Else(default, output_field=output_field), output_field=output_field)
+
+
+def _stripped(expression):
+    return DigitsOnly(expression)
+
+
+def _padded(expression, document_class):
+    return LPad(_stripped(expression), document_class.digits, Value('0'))
+
+
+def is_valid_expression(expression, document_class):
+    """
+    Return a standard SQL expression that is true when ``expression`` holds
+    a valid ``document_class`` number, false otherwise and NULL for NULL.
+    """
+    spec = document_class.spec
+    padded = _padded(expression, document_class)
+    length = document_class.digits
+
+    digits = [Cast(Substr(padded, i + 1, 1), IntegerField()) for i in range(length)]
+    # Each check digit weighs the stored check digits before it: if those
+    # are wrong the value is invalid anyway.
+    matches = [
+        _Condition(
+            digit, _check_digit(reduce(operator.add, (d * Value(w) for d, w in zip(digits, weights))), spec),
+            operator='=',
+        )
+        for digit, weights in zip(digits[spec.base_length:], spec.weights)
+    ]
+
+    non_digits = padded
+    for digit in '0123456789':
+        non_digits = Replace(non_digits, Value(digit), Value(''))
+    repdigits = Func(*(Value(str(digit) * length) for digit in range(10)), template='(%(expressions)s)')
+
+    # WHEN clauses are evaluated in order, so digits are only cast once the
+    # value is known to hold nothing else.
+    return _case(
+        [
+            (_IsNull(expression), Value(None)),
+            (_Condition(Length(_stripped(expression)), Value(length), operator='>'), Value(False)),
+            (_Condition(Length(non_digits), Value(0), operator='>'), Value(False)),
+            (_Condition(padded, repdigits, operator='IN'), Value(False)),
+            (_Condition(*matches, operator='AND'), Value(True)),
+        ],
+        Value(False),
+        BooleanField(),
+    )
+
+
+def normalize_expression(expression, document_class, masked=False):
+    """
+    Return a standard SQL expression giving the canonical form of valid
+    values of ``expression`` and the value unchanged otherwise.
+    """
+    padded = _padded(expression, document_class)
+    if not masked:
+        canonical = padded
+    else:
+        # Runs of '#' in the mask are the digits, the rest is copied.
+        parts = []
+        position = 1
+        for run in re.findall(r'#+|[^#]+', document_class.mask):
+            if run[0] == '#':
+                parts.append(Substr(padded, position, len(run)))
+                position += len(run)
+            else:
+                parts.append(Value(run))
+        canonical = Concat(*parts, output_field=CharField())
+
+    valid = _Condition(is_valid_expression(expression, document_class), Value(True), operator='=')
+    return _case([(valid, canonical)], expression, CharField())
+
+
+class DocumentFunc(Func):
+    """
+    Calls the registered function on SQLite and compiles ``fallback()``
+    everywhere else.
+    """
+    arity = 1
+    document_class = None
+
+    def fallback(self):
+        raise NotImplementedError('subclasses of DocumentFunc must provide a fallback() method')
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return compiler.compile(self.fallback().resolve_expression(compiler.query))
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class IsValidCPF(DocumentFunc):
+    function = 'is_valid_cpf'
+    output_field = BooleanField()
+    document_class = CPF
+
+    def fallback(self):
+        return is_valid_expression(self.source_expressions[0], self.document_class)
+
+
+class IsValidCNPJ(IsValidCPF):
+    function = 'is_valid_cnpj'
+    document_class = CNPJ
+
+
+class NormalizeCPF(DocumentFunc):
+    """
+    Canonical form of valid values, masked or not; other values are
+    returned unchanged. Pass the field's ``is_masked``.
+    """
+    function = 'normalize_document'
+    output_field = CharField()
+    document_class = CPF
+
+    def __init__(self, expression, masked=False, **extra):
+        self.masked = masked
+        super().__init__(expression, **extra)
+
+    def fallback(self):
+        return normalize_expression(self.source_expressions[0], self.document_class, self.masked)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return 'normalize_document(%s, %%s, %%s)' % sql, (*params, self.document_class.digits, self.masked)
+
+
+class NormalizeCNPJ(NormalizeCPF):
+    document_class = CNPJ
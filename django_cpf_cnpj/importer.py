@@ -0,0 +1,124 @@
+from collections import Counter, namedtuple
+
+from django.db import connections, NotSupportedError, DEFAULT_DB_ALIAS
+
+from django_cpf_cnpj.audit import INVALID, DUPLICATE
+
+__all__ = ['DocumentImporter', 'ImportIssue', 'INVALID', 'DUPLICATE', 'EXISTING']
+
+EXISTING = 'existing'
+
+# ``index`` is the position of the row in the input; ``detail`` is the
+# index of the first row with the same document for duplicates.
+ImportIssue = namedtuple('ImportIssue', ['index', 'value', 'problem', 'detail'])
+
+
+class DocumentImporter:
+    """
+    Bulk insert rows into a model with a unique CPFField/CNPJField.
+
+    Every document is normalized up front, repeated documents within the
+    input are reported as duplicates and existing ones are found with
+    chunked ``__in`` queries of ``lookup_size`` values, instead of one
+    ``validate_unique`` query per row. Existing rows are reported and
+    skipped, or updated when ``update_fields`` is given (an upsert through
+    ``bulk_create(update_conflicts=True)``, which needs Django 4.1).
+    """
+
+    def __init__(self, model, field_name, batch_size=1000, lookup_size=1000, update_fields=None,
+                 using=DEFAULT_DB_ALIAS):
+        self.model = model
+        self.field = model._meta.get_field(field_name)
+        self.batch_size = batch_size
+        self.lookup_size = lookup_size
+        self.update_fields = update_fields
+        self.using = using
+        self.counts = Counter()
+        self.issues = []
+
+    def report(self, issue):
+        self.issues.append(issue)
+        self.counts[issue.problem] += 1
+
+    @property
+    def manager(self):
+        return self.model._default_manager.db_manager(self.using)
+
+    def existing(self, values):
+        """
+        Return the stored forms among ``values`` already in the table.
+        """
+        values = list(values)
+        found = set()
+        for start in range(0, len(values), self.lookup_size):
+            chunk = values[start:start + self.lookup_size]
+            found.update(self.manager.filter(**{'%s__in' % self.field.name: chunk}).values_list(
+                self.field.name, flat=True,
+            ))
+        return {self.field.get_canonical_value(value) for value in found}
+
+    def prepare(self, rows):
+        """
+        Return the instances to create and those to update from ``rows``
+        (dicts of field values or unsaved instances), recording issues.
+        """
+        name = self.field.name
+        accepted = []
+        first_index = {}
+
+        for index, row in enumerate(rows):
+            instance = row if isinstance(row, self.model) else self.model(**row)
+            document = getattr(instance, name)
+            self.counts['rows'] += 1
+
+            if document in self.field.empty_values:
+                accepted.append((instance, None))
+                continue
+
+            if not document.is_valid():
+                self.report(ImportIssue(index, document.raw_input, INVALID, ''))
+                continue
+
+            canonical = self.field.get_canonical_value(document)
+            if canonical in first_index:
+                self.report(ImportIssue(index, document.raw_input, DUPLICATE, first_index[canonical]))
+                continue
+
+            first_index[canonical] = index
+            accepted.append((instance, canonical))
+
+        existing = self.existing(first_index)
+        to_create, to_update = [], []
+        for instance, canonical in accepted:
+            if canonical not in existing:
+                to_create.append(instance)
+            elif self.update_fields:
+                to_update.append(instance)
+            else:
+                self.report(ImportIssue(first_index[canonical], canonical, EXISTING, ''))
+
+        return to_create, to_update
+
+    def check(self, rows):
+        """
+        Report the issues of ``rows`` without writing anything.
+        """
+        self.prepare(rows)
+        return self.issues
+
+    def run(self, rows):
+        to_create, to_update = self.prepare(rows)
+
+        if to_update:
+            if not getattr(connections[self.using].features, 'supports_update_conflicts_with_target', False):
+                raise NotSupportedError('This database backend does not support updating conflicts.')
+            self.manager.bulk_create(
+                to_create + to_update, batch_size=self.batch_size, update_conflicts=True,
+                unique_fields=[self.field.name], update_fields=self.update_fields,
+            )
+        elif to_create:
+            self.manager.bulk_create(to_create, batch_size=self.batch_size)
+
+        self.counts['created'] += len(to_create)
+        self.counts['updated'] += len(to_update)
+        return self.counts
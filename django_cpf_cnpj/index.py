@@ -0,0 +1,150 @@
+from array import array
+from heapq import merge
+import mmap
+import sys
+
+from django.db.models.query import QuerySet
+
+from django_cpf_cnpj.cpf import CPF
+from django_cpf_cnpj.fields import DocumentField
+from django_cpf_cnpj.sets import DocumentSet, HEADER, MAGIC, VERSION, document_to_int, read_header
+
+__all__ = ['DocumentIndex', 'build_index']
+
+
+def _queryset_source(queryset, field_name, chunk_size):
+    document_fields = [
+        field for field in queryset.model._meta.concrete_fields
+        if isinstance(field, DocumentField)
+    ]
+    if field_name is not None:
+        document_fields = [f for f in document_fields if f.name == field_name]
+
+    if len(document_fields) != 1:
+        raise ValueError(
+            'Expected exactly one document field on %s, pass field_name.'
+            % queryset.model.__name__
+        )
+
+    field = document_fields[0]
+    values = queryset.values_list(field.name, flat=True).iterator(chunk_size=chunk_size)
+    return values, field.document_class
+
+
+def _sorted_runs(values, document_class, chunk_size, strict):
+    run = []
+    for value in values:
+        if value in (None, ''):
+            continue
+        try:
+            run.append(document_to_int(value, document_class))
+        except (TypeError, ValueError):
+            if strict:
+                raise
+            continue
+
+        if len(run) >= chunk_size:
+            run.sort()
+            yield array('Q', run)
+            run = []
+
+    if run:
+        run.sort()
+        yield array('Q', run)
+
+
+def build_index(path, source, document_class=CPF, field_name=None, chunk_size=1000000, strict=False):
+    """
+    Write a sorted, de-duplicated index of ``source`` to ``path``.
+
+    ``source`` is any iterable of CPF/CNPJ objects, strings or integers, or
+    a queryset of a model with a document field (the document type is then
+    taken from the field). Values are sorted in runs of ``chunk_size``
+    and merged while writing, so only the packed integers are held in
+    memory. Invalid values are skipped unless ``strict`` is set.
+
+    Return the number of entries written.
+    """
+    if isinstance(source, QuerySet):
+        source, document_class = _queryset_source(source, field_name, chunk_size)
+
+    runs = list(_sorted_runs(source, document_class, chunk_size, strict))
+
+    count = 0
+    previous = None
+    buffer = array('Q')
+    with open(path, 'wb') as output:
+        output.write(HEADER.pack(MAGIC, VERSION, document_class.__name__.encode(), 0))
+
+        for value in merge(*runs):
+            if value == previous:
+                continue
+            previous = value
+            buffer.append(value)
+
+            if len(buffer) >= chunk_size:
+                count += _flush(output, buffer)
+                buffer = array('Q')
+
+        count += _flush(output, buffer)
+
+        output.seek(0)
+        output.write(HEADER.pack(MAGIC, VERSION, document_class.__name__.encode(), count))
+
+    return count
+
+
+def _flush(output, buffer):
+    if sys.byteorder != 'little':
+        buffer.byteswap()
+    output.write(buffer.tobytes())
+    return len(buffer)
+
+
+class DocumentIndex(DocumentSet):
+    """
+    Read-only DocumentSet backed by a memory-mapped index file.
+
+    Opening an index does no parsing: lookups binary-search the mapped
+    pages directly, and forked workers share them through the page cache.
+    """
+
+    _mmap = None
+
+    @classmethod
+    def open(cls, path):
+        if sys.byteorder != 'little':
+            # The on-disk integers are little-endian; fall back to a copy.
+            loaded = DocumentSet.load(path)
+            return cls._from_sorted(loaded._values, loaded.document_class)
+
+        with open(path, 'rb') as source:
+            document_class, count = read_header(source.read(HEADER.size))
+            if count == 0:
+                return cls._from_sorted(array('Q'), document_class)
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        values = memoryview(mapped)[HEADER.size:HEADER.size + count * 8].cast('Q')
+        index = cls._from_sorted(values, document_class)
+        index._mmap = mapped
+        return index
+
+    def close(self):
+        if self._mmap is not None:
+            self._values.release()
+            self._values = array('Q')
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __sizeof__(self):
+        # Mapped pages belong to the page cache, not to the process.
+        size = object.__sizeof__(self)
+        if self._mmap is None:
+            size += self._values.itemsize * len(self._values)
+        return size
@@ -0,0 +1,116 @@
+"""
+Logging filter masking valid CPF and CNPJ numbers in log records.
+
+    LOGGING = {
+        ...
+        'filters': {
+            'redact_documents': {
+                '()': 'django_cpf_cnpj.log.RedactDocumentsFilter',
+                'keep_fiscal_region': True,
+            },
+        },
+    }
+"""
+import logging
+import re
+
+from django_cpf_cnpj.core import CPF
+from django_cpf_cnpj.extract import find_documents
+
+__all__ = ['RedactDocumentsFilter', 'mask_document']
+
+# Every CPF/CNPJ form contains three digits in a row; text without them is
+# passed through untouched.
+PRESCREEN = re.compile(r'[0-9]{3}')
+
+
+def mask_document(document, text, mask='*', keep_fiscal_region=False):
+    """
+    Replace the digits of ``text`` (the matched form of ``document``) with
+    ``mask``, keeping the punctuation and, for CPFs with
+    ``keep_fiscal_region``, the ninth digit.
+    """
+    keep = 9 if keep_fiscal_region and isinstance(document, CPF) else None
+    masked = []
+    position = 0
+    for character in text:
+        if character.isdigit():
+            position += 1
+            if position != keep:
+                character = mask
+        masked.append(character)
+    return ''.join(masked)
+
+
+def _may_contain_document(value):
+    if type(value) is str:
+        return PRESCREEN.search(value) is not None
+    if type(value) is int or type(value) is float:
+        # 52998224725.0 formats as a CPF followed by ".0".
+        return abs(value) >= 100
+    if value is None or isinstance(value, bool):
+        return False
+    # Other objects are only known once formatted.
+    return True
+
+
+class RedactDocumentsFilter(logging.Filter):
+    """
+    Mask valid CPFs and CNPJs in the formatted message of each record.
+
+    Records whose message and arguments can't hold a document are left
+    alone without being formatted. Otherwise the message is formatted once
+    and, if anything was masked, stored in ``record.msg`` with the
+    arguments cleared. ``redact`` can be a ``callable(document, text)``
+    returning the replacement; it overrides ``mask`` and
+    ``keep_fiscal_region``.
+    """
+
+    def __init__(self, name='', mask='*', keep_fiscal_region=False, redact=None):
+        super().__init__(name)
+        self.mask = mask
+        self.keep_fiscal_region = keep_fiscal_region
+        self.redact_document = redact
+
+    def replacement(self, document, text):
+        if self.redact_document is not None:
+            return self.redact_document(document, text)
+        return mask_document(document, text, self.mask, self.keep_fiscal_region)
+
+    def redact(self, message):
+        """
+        Return ``message`` with its valid documents replaced.
+        """
+        pieces = []
+        end = 0
+        for document, start, match_end in find_documents(message):
+            pieces.append(message[end:start])
+            pieces.append(self.replacement(document, message[start:match_end]))
+            end = match_end
+
+        if not pieces:
+            return message
+        pieces.append(message[end:])
+        return ''.join(pieces)
+
+    def filter(self, record):
+        if self.nlen and not super().filter(record):
+            return False
+
+        args = record.args
+        if args and not isinstance(args, tuple):
+            args = args.values()
+        if not _may_contain_document(record.msg) and not any(map(_may_contain_document, args or ())):
+            return True
+
+        try:
+            message = record.getMessage()
+        except Exception:
+            # Leave malformed calls to the handler's handleError, as without
+            # the filter.
+            return True
+        redacted = self.redact(message)
+        if redacted is not message:
+            record.msg = redacted
+            record.args = None
+        return True
@@ -0,0 +1,29 @@
+from django.db.models.lookups import Exact, In
+
+__all__ = ['DocumentExact', 'DocumentIn']
+
+
+class DocumentExact(Exact):
+    """
+    ``exact`` lookup comparing against the form the field stores, so
+    masked and unmasked inputs hit the same index entry.
+    """
+
+    def get_prep_lookup(self):
+        if self.rhs_is_direct_value() and self.rhs != '':
+            return self.lhs.output_field.get_canonical_value(self.rhs)
+        return super().get_prep_lookup()
+
+
+class DocumentIn(In):
+    """
+    ``in`` lookup normalizing the whole list at once: every distinct input
+    is parsed once and inputs sharing a stored form collapse to one value.
+    """
+
+    def get_prep_lookup(self):
+        if self.rhs_is_direct_value() and not any(
+            hasattr(value, 'resolve_expression') for value in self.rhs
+        ):
+            return self.lhs.output_field.get_canonical_values(self.rhs)
+        return super().get_prep_lookup()
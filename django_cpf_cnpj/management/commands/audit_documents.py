@@ -0,0 +1,78 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_cpf_cnpj.audit import DocumentAuditor, INVALID, NON_CANONICAL, DUPLICATE
+from django_cpf_cnpj.utils import resolve_field, read_checkpoint, write_checkpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'Report invalid, non-canonical and duplicated values stored in a '
+        'document field.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help='Field label, as app_label.Model.field.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--output', help='CSV file for the findings (default: stdout).'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File storing the last scanned primary key. An existing '
+                 'checkpoint resumes the scan and appends to --output.',
+        )
+        parser.add_argument('--start-after', help='Primary key to resume after.')
+        parser.add_argument(
+            '--no-duplicates', action='store_false', dest='duplicates',
+            help='Skip the duplicate values query.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model, field = resolve_field(options['field'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+        checkpoint = options['checkpoint']
+        start_after = options['start_after']
+        resuming = False
+        if start_after is None:
+            start_after = read_checkpoint(checkpoint)
+            resuming = start_after is not None
+        if start_after is not None:
+            start_after = model._meta.pk.to_python(start_after)
+
+        auditor = DocumentAuditor(model, field.name, options['batch_size'], start_after)
+
+        if options['output']:
+            output = open(options['output'], 'a' if resuming else 'w', newline='')
+        else:
+            output = sys.stdout
+
+        try:
+            self._run(auditor, output, checkpoint, options['duplicates'])
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        counts = auditor.counts
+        self.stderr.write(
+            'Scanned %d rows: %d invalid, %d non-canonical, %d duplicated values.' % (
+                counts['scanned'], counts[INVALID], counts[NON_CANONICAL], counts[DUPLICATE]
+            )
+        )
+
+    def _run(self, auditor, output, checkpoint, duplicates):
+        writer = csv.writer(output)
+        for findings in auditor.batches():
+            writer.writerows(findings)
+            output.flush()
+
+            if checkpoint:
+                write_checkpoint(checkpoint, auditor.last_pk)
+
+        if duplicates:
+            writer.writerows(auditor.duplicates())
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cpf_cnpj.normalize import DocumentNormalizer
+from django_cpf_cnpj.utils import resolve_field, read_checkpoint, write_checkpoint
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite the values of a document field to the masked or '
+        'unmasked form the field currently stores.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help='Field label, as app_label.Model.field.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep', type=float, default=0,
+            help='Seconds to wait between batches.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File storing the last processed primary key. An existing '
+                 'checkpoint resumes the run.',
+        )
+        parser.add_argument('--start-after', help='Primary key to resume after.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Count the rows that would change without writing them.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model, field = resolve_field(options['field'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+        checkpoint = options['checkpoint']
+        start_after = options['start_after']
+        if start_after is None:
+            start_after = read_checkpoint(checkpoint)
+        if start_after is not None:
+            start_after = model._meta.pk.to_python(start_after)
+
+        normalizer = DocumentNormalizer(
+            model, field.name,
+            batch_size=options['batch_size'],
+            start_after=start_after,
+            sleep=options['sleep'],
+            using=options['database'],
+            dry_run=options['dry_run'],
+        )
+
+        for updated in normalizer.batches():
+            if checkpoint and not options['dry_run']:
+                write_checkpoint(checkpoint, normalizer.last_pk)
+
+            if options['verbosity'] >= 2:
+                self.stderr.write(
+                    'Up to pk %s: %d rows updated (%.0f rows/s).' % (
+                        normalizer.last_pk, updated, normalizer.rows_per_second
+                    )
+                )
+
+        self.stderr.write(
+            '%s %d of %d rows in %.2fs (%.0f rows/s).' % (
+                'Would update' if options['dry_run'] else 'Updated',
+                normalizer.counts['updated'], normalizer.counts['scanned'],
+                normalizer.elapsed, normalizer.rows_per_second,
+            )
+        )
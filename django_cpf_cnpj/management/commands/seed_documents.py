@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cpf_cnpj.seeding import seed_documents
+from django_cpf_cnpj.utils import resolve_field
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert generated CPF or CNPJ values into a model, for fixtures and '
+        'benchmark setup.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help='Field label, as app_label.Model.field.')
+        parser.add_argument('--count', type=int, required=True)
+        parser.add_argument(
+            '--invalid-fraction', type=float, default=0.0,
+            help='Share of rows stored with a wrong check digit (0-1).',
+        )
+        parser.add_argument('--seed', type=int, help='Seed for reproducible values.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--raw', action='store_true',
+            help='Insert with executemany on the document column only.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        try:
+            model, field = resolve_field(options['field'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+        if not 0 <= options['invalid_fraction'] <= 1:
+            raise CommandError('--invalid-fraction must be between 0 and 1.')
+
+        def progress(written):
+            if options['verbosity'] >= 2:
+                self.stderr.write('%d rows written.' % written)
+
+        count = options['count']
+        elapsed = seed_documents(
+            model, field.name, count,
+            invalid_fraction=options['invalid_fraction'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            raw=options['raw'],
+            using=options['database'],
+            progress=progress,
+        )
+
+        self.stderr.write(
+            'Inserted %d rows in %.2fs (%.0f rows/s).' % (
+                count, elapsed, count / elapsed if elapsed else 0,
+            )
+        )
@@ -0,0 +1,46 @@
+from asyncio import iscoroutinefunction
+import logging
+
+try:
+    from django.utils.decorators import sync_and_async_middleware
+except ImportError:
+    # Django < 3.1 only calls middleware synchronously.
+    def sync_and_async_middleware(func):
+        return func
+
+from django_cpf_cnpj.core import parse_cache
+
+logger = logging.getLogger('django_cpf_cnpj')
+
+
+def _log(request, cache):
+    if cache.hits:
+        logger.debug(
+            'Parse cache for %s saved %d of %d CPF/CNPJ parses.',
+            request.path, cache.hits, cache.hits + cache.misses,
+        )
+
+
+@sync_and_async_middleware
+def ParseCacheMiddleware(get_response):
+    """
+    Scope a CPF/CNPJ parse cache to each request. The cache is exposed as
+    ``request.document_parse_cache`` and dropped when the response is
+    returned.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            with parse_cache() as cache:
+                request.document_parse_cache = cache
+                response = await get_response(request)
+            _log(request, cache)
+            return response
+    else:
+        def middleware(request):
+            with parse_cache() as cache:
+                request.document_parse_cache = cache
+                response = get_response(request)
+            _log(request, cache)
+            return response
+
+    return middleware
@@ -0,0 +1,85 @@
+from collections import Counter
+import time
+
+from django_cpf_cnpj.utils import iter_batches
+
+__all__ = ['DocumentNormalizer']
+
+
+class DocumentNormalizer:
+    """
+    Rewrite the valid values of a CPFField/CNPJField to the form the field
+    currently stores (masked or unmasked), one ``bulk_update`` per batch.
+
+    Rows already in canonical form and invalid rows are left untouched.
+    Each batch commits on its own, ``sleep`` seconds are waited between
+    batches and ``last_pk`` holds the resume point.
+    """
+
+    def __init__(self, model, field_name, batch_size=1000, start_after=None, sleep=0,
+                 using=None, dry_run=False):
+        self.model = model
+        self.field = model._meta.get_field(field_name)
+        self.batch_size = batch_size
+        self.last_pk = start_after
+        self.sleep = sleep
+        self.using = using
+        self.dry_run = dry_run
+        self.counts = Counter()
+        self.elapsed = 0.0
+        self.document_class = self.field.document_class
+
+    @property
+    def rows_per_second(self):
+        return self.counts['scanned'] / self.elapsed if self.elapsed else 0.0
+
+    def changes(self, batch):
+        """
+        Return model instances carrying the canonical value of every row of
+        ``batch`` that needs rewriting.
+        """
+        name = self.field.name
+        changed = []
+        for pk, value in batch:
+            if value in self.field.empty_values:
+                continue
+
+            document = self.document_class(value)
+            if not document.is_valid():
+                continue
+
+            canonical = self.field.get_canonical_value(document)
+            if value != canonical:
+                changed.append(self.model(**{'pk': pk, name: canonical}))
+
+        return changed
+
+    def batches(self):
+        """
+        Normalize the column batch by batch, yielding the number of rows
+        updated by each batch.
+        """
+        manager = self.model._default_manager.db_manager(self.using)
+        queryset = manager.all()
+
+        for batch in iter_batches(queryset, self.field.name, self.batch_size, self.last_pk):
+            started = time.monotonic()
+
+            changed = self.changes(batch)
+            if changed and not self.dry_run:
+                manager.bulk_update(changed, [self.field.name])
+
+            self.counts['scanned'] += len(batch)
+            self.counts['updated'] += len(changed)
+            self.last_pk = batch[-1][0]
+            self.elapsed += time.monotonic() - started
+            yield len(changed)
+
+            if self.sleep:
+                time.sleep(self.sleep)
+
+    def run(self):
+        for _ in self.batches():
+            pass
+
+        return self.counts
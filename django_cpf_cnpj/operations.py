@@ -0,0 +1,52 @@
+from django.db import router
+from django.db.migrations.operations.base import Operation
+
+from django_cpf_cnpj.normalize import DocumentNormalizer
+
+__all__ = ['NormalizeDocuments']
+
+
+class NormalizeDocuments(Operation):
+    """
+    Migration operation rewriting a CPFField/CNPJField column to its
+    canonical form in batches. Put it in a migration with ``atomic = False``
+    so each batch commits on its own and the table stays online.
+    """
+
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, model_name, name, batch_size=1000, sleep=0):
+        self.model_name = model_name
+        self.name = name
+        self.batch_size = batch_size
+        self.sleep = sleep
+
+    def deconstruct(self):
+        kwargs = {
+            'model_name': self.model_name,
+            'name': self.name,
+        }
+        if self.batch_size != 1000:
+            kwargs['batch_size'] = self.batch_size
+        if self.sleep:
+            kwargs['sleep'] = self.sleep
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        alias = schema_editor.connection.alias
+        if router.allow_migrate_model(alias, model):
+            DocumentNormalizer(
+                model, self.name, batch_size=self.batch_size, sleep=self.sleep, using=alias,
+            ).run()
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        # The previous form is not recorded; reversing leaves values as they are.
+        pass
+
+    def describe(self):
+        return 'Normalize stored values of %s.%s' % (self.model_name, self.name)
@@ -0,0 +1,94 @@
+from django.db import models
+from django.db.models import BooleanField, Case, CharField, Value, When
+from django.db.models.functions import Replace, Substr
+
+from django_cpf_cnpj.core import FISCAL_REGIONS
+
+__all__ = ['DocumentQuerySet', 'annotate_fiscal_region', 'annotate_cnpj_branch']
+
+
+def _masked_or_plain(field_name, separator, masked, plain):
+    # Masked values contain the separator; pick the matching expression.
+    return Case(
+        When(**{'%s__contains' % field_name: separator}, then=masked),
+        default=plain,
+        output_field=CharField(),
+    )
+
+
+def _region_case(digit_alias, key):
+    return Case(
+        *[
+            When(**{digit_alias: digit, 'then': Value(region[key])})
+            for digit, region in FISCAL_REGIONS.items()
+        ],
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+
+def annotate_fiscal_region(queryset, field_name='cpf', prefix='fiscal_region'):
+    """
+    Annotate each row with the fiscal region of its CPF, computed by the
+    database from the ninth digit: ``<prefix>_digit``, ``<prefix>_name``,
+    ``<prefix>_shorted`` and ``<prefix>_jurisdiction`` (comma separated).
+
+    Stored values are trusted as validated on save; check digits are not
+    recomputed.
+    """
+    digit_alias = '%s_digit' % prefix
+    queryset = queryset.annotate(**{
+        digit_alias: _masked_or_plain(field_name, '.', Substr(field_name, 11, 1), Substr(field_name, 9, 1)),
+    })
+
+    jurisdiction = Case(
+        *[
+            When(**{digit_alias: digit, 'then': Value(','.join(region['jurisdiction']))})
+            for digit, region in FISCAL_REGIONS.items()
+        ],
+        default=Value(None),
+        output_field=CharField(),
+    )
+    return queryset.annotate(**{
+        '%s_name' % prefix: _region_case(digit_alias, 'name'),
+        '%s_shorted' % prefix: _region_case(digit_alias, 'shorted'),
+        '%s_jurisdiction' % prefix: jurisdiction,
+    })
+
+
+def annotate_cnpj_branch(queryset, field_name='cnpj', prefix='cnpj'):
+    """
+    Annotate each row with ``<prefix>_root`` (the first eight digits,
+    shared by all branches), ``<prefix>_branch`` (the next four) and
+    ``<prefix>_is_headquarters``, computed by the database.
+    """
+    branch_alias = '%s_branch' % prefix
+    return queryset.annotate(**{
+        '%s_root' % prefix: _masked_or_plain(
+            field_name, '/',
+            Replace(Substr(field_name, 1, 10), Value('.'), Value('')),
+            Substr(field_name, 1, 8),
+        ),
+        branch_alias: _masked_or_plain(
+            field_name, '/', Substr(field_name, 12, 4), Substr(field_name, 9, 4),
+        ),
+    }).annotate(**{
+        '%s_is_headquarters' % prefix: Case(
+            When(**{branch_alias: '0001', 'then': Value(True)}),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    })
+
+
+class DocumentQuerySet(models.QuerySet):
+    """
+    QuerySet for models with CPF/CNPJ fields. Use it as
+    ``objects = DocumentQuerySet.as_manager()``.
+    """
+
+    def with_fiscal_region(self, field_name='cpf', prefix='fiscal_region'):
+        return annotate_fiscal_region(self, field_name, prefix)
+
+    def with_cnpj_branch(self, field_name='cnpj', prefix='cnpj'):
+        return annotate_cnpj_branch(self, field_name, prefix)
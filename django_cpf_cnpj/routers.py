@@ -0,0 +1,190 @@
+"""
+Shard models across databases by a CPFField/CNPJField value.
+
+    DATABASE_ROUTERS = ['django_cpf_cnpj.routers.DocumentShardRouter']
+    CPF_CNPJ_SHARDS = ['shard_0', 'shard_1', 'shard_2']
+    CPF_CNPJ_SHARD_KEYS = {
+        'people.Person': 'cpf',
+        'companies.Branch': ('cnpj', 'cnpj_root'),
+    }
+
+Each entry maps a model label to its shard key field, optionally with a
+strategy from ``STRATEGIES`` (``hash`` by default). Changing the shard list
+or a strategy moves rows; it is not rebalanced automatically.
+"""
+from collections import defaultdict
+from itertools import chain
+import zlib
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from django_cpf_cnpj.core import CPF
+
+__all__ = [
+    'DocumentShardRouter', 'shard_for', 'shard_for_instance', 'using_shard', 'filter_in_shards',
+    'bulk_create_in_shards', 'STRATEGIES',
+]
+
+
+# CRC32 is stable across processes and Python versions, unlike hash().
+def shard_by_hash(document, count):
+    return zlib.crc32(document.number.encode()) % count
+
+
+def shard_by_fiscal_region(document, count):
+    if not isinstance(document, CPF):
+        raise ImproperlyConfigured('The fiscal_region strategy only applies to CPF fields.')
+    return int(document.number[8]) % count
+
+
+def shard_by_cnpj_root(document, count):
+    if isinstance(document, CPF):
+        raise ImproperlyConfigured('The cnpj_root strategy only applies to CNPJ fields.')
+    if not document.is_valid():
+        # Invalid raw values have no root; they are stored, so route them.
+        return shard_by_hash(document, count)
+    # Every branch of a company shares the root, so they land together.
+    return zlib.crc32(document.get_root().encode()) % count
+
+
+STRATEGIES = {
+    'hash': shard_by_hash,
+    'fiscal_region': shard_by_fiscal_region,
+    'cnpj_root': shard_by_cnpj_root,
+}
+
+
+def get_shards():
+    shards = getattr(settings, 'CPF_CNPJ_SHARDS', None)
+    if not shards:
+        raise ImproperlyConfigured('CPF_CNPJ_SHARDS must list the database aliases to shard across.')
+    return list(shards)
+
+
+def get_shard_key(model):
+    """
+    Return the (field, strategy function) pair of ``model``, or None when
+    it isn't sharded.
+    """
+    shard_keys = getattr(settings, 'CPF_CNPJ_SHARD_KEYS', {})
+    key = shard_keys.get(model._meta.label)
+    if key is None:
+        return None
+
+    field_name, strategy = (key, 'hash') if isinstance(key, str) else key
+    try:
+        strategy = STRATEGIES[strategy]
+    except KeyError:
+        raise ImproperlyConfigured('Unknown shard strategy %r for %s.' % (strategy, model._meta.label))
+    return model._meta.get_field(field_name), strategy
+
+
+def _get_shard_key(model):
+    shard_key = get_shard_key(model)
+    if shard_key is None:
+        raise ValueError('%s is not listed in CPF_CNPJ_SHARD_KEYS.' % model._meta.label)
+    return shard_key
+
+
+def _shard(field, strategy, value, shards):
+    document = field.to_document(value)
+    if document in field.empty_values:
+        raise ValueError("Can't route an empty %s." % field.name)
+    return shards[strategy(document, len(shards))]
+
+
+def shard_for(model, value):
+    """
+    Return the database alias holding the ``model`` rows whose shard key is
+    ``value`` (a string or document object).
+    """
+    field, strategy = _get_shard_key(model)
+    return _shard(field, strategy, value, get_shards())
+
+
+def shard_for_instance(instance):
+    field, strategy = _get_shard_key(type(instance))
+    return _shard(field, strategy, getattr(instance, field.attname), get_shards())
+
+
+def using_shard(model, value):
+    """
+    Return a queryset of ``model`` on the shard of ``value``.
+    """
+    return model._default_manager.using(shard_for(model, value))
+
+
+def filter_in_shards(model, values, **filters):
+    """
+    Scatter-gather ``__in`` lookup: group ``values`` by shard, run one query
+    per shard involved and yield the matching instances.
+    """
+    field, strategy = _get_shard_key(model)
+    shards = get_shards()
+
+    grouped = defaultdict(list)
+    for value in values:
+        grouped[_shard(field, strategy, value, shards)].append(value)
+
+    return chain.from_iterable(
+        model._default_manager.using(alias).filter(**{'%s__in' % field.name: chunk}, **filters)
+        for alias, chunk in grouped.items()
+    )
+
+
+def bulk_create_in_shards(model, objs, **kwargs):
+    """
+    ``bulk_create`` each instance on its shard, one query per shard.
+    """
+    grouped = defaultdict(list)
+    for obj in objs:
+        grouped[shard_for_instance(obj)].append(obj)
+
+    created = []
+    for alias, chunk in grouped.items():
+        created.extend(model._default_manager.using(alias).bulk_create(chunk, **kwargs))
+    return created
+
+
+class DocumentShardRouter:
+    """
+    Route instances of the models in ``CPF_CNPJ_SHARD_KEYS`` by their shard
+    key. Queries without an instance, including ``objects.create()``, return
+    None; save instances or use ``using_shard`` and ``filter_in_shards``.
+    """
+
+    def _db_for_instance(self, model, instance):
+        if instance is None or get_shard_key(model) is None:
+            return None
+        if instance._state.db is not None or not isinstance(instance, model):
+            # Saved rows stay where they are; related lookups follow the
+            # instance they start from.
+            return instance._state.db
+        return shard_for_instance(instance)
+
+    def db_for_read(self, model, **hints):
+        return self._db_for_instance(model, hints.get('instance'))
+
+    def db_for_write(self, model, **hints):
+        return self._db_for_instance(model, hints.get('instance'))
+
+    def allow_relation(self, obj1, obj2, **hints):
+        sharded = get_shard_key(type(obj1)) is not None or get_shard_key(type(obj2)) is not None
+        if sharded:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if model_name is None:
+            return None
+        model = hints.get('model')
+        if model is None:
+            try:
+                model = apps.get_model(app_label, model_name)
+            except LookupError:
+                return None
+        if get_shard_key(model) is None:
+            return None
+        return db in get_shards()
@@ -0,0 +1,75 @@
+import random
+import time
+
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+
+from django_cpf_cnpj.core import trusted_document
+
+__all__ = ['iter_seed_documents', 'seed_documents']
+
+
+def iter_seed_documents(document_class, count, invalid_fraction=0.0, seed=None):
+    """
+    Yield ``count`` documents: valid ones as already-validated objects and,
+    with probability ``invalid_fraction``, raw strings whose last check
+    digit is wrong.
+    """
+    rng = random.Random(seed)
+    spec = document_class.spec
+    upper = 10 ** spec.base_length
+    repdigit = (upper - 1) // 9
+
+    for _ in range(count):
+        base = rng.randrange(1, upper)
+        while base % repdigit == 0:
+            base = rng.randrange(1, upper)
+        digits = spec.check_digits(base)
+
+        if invalid_fraction and rng.random() < invalid_fraction:
+            digits = digits[:-1] + ((digits[-1] + 1) % 10,)
+            yield '%0*d' % (spec.base_length, base) + ''.join(map(str, digits))
+        else:
+            number = base
+            for digit in digits:
+                number = number * 10 + digit
+            yield trusted_document(document_class, number)
+
+
+def seed_documents(model, field_name, count, invalid_fraction=0.0, seed=None, batch_size=1000,
+                   raw=False, using=DEFAULT_DB_ALIAS, progress=None):
+    """
+    Insert ``count`` rows of generated documents into ``model`` and return
+    the elapsed seconds.
+
+    Rows are written with ``bulk_create`` in batches of ``batch_size``. With
+    ``raw`` they are written with ``executemany`` on the document column
+    only, skipping model instantiation; other columns then need a database
+    default or must be nullable. ``progress`` is called with the number of
+    rows written after every batch.
+    """
+    field = model._meta.get_field(field_name)
+    documents = iter_seed_documents(field.document_class, count, invalid_fraction, seed)
+
+    connection = connections[using]
+    manager = model._default_manager.db_manager(using)
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO %s (%s) VALUES (%%s)' % (quote(model._meta.db_table), quote(field.column))
+
+    started = time.monotonic()
+    written = 0
+    while written < count:
+        size = min(batch_size, count - written)
+        batch = [next(documents) for _ in range(size)]
+
+        if raw:
+            rows = [(field.get_canonical_value(document),) for document in batch]
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+        else:
+            manager.bulk_create([model(**{field_name: document}) for document in batch])
+
+        written += size
+        if progress is not None:
+            progress(written)
+
+    return time.monotonic() - started
@@ -0,0 +1,248 @@
+from array import array
+from bisect import bisect_left
+import operator
+import re
+import struct
+import sys
+
+from django_cpf_cnpj.core import trusted_document
+from django_cpf_cnpj.cpf import CPF
+from django_cpf_cnpj.cnpj import CNPJ
+from django_cpf_cnpj.documents import PIS, TituloEleitor, CNH, RENAVAM
+
+__all__ = ['DocumentSet']
+
+# magic, format version, document class name, number of entries.
+HEADER = struct.Struct('<6sH8sQ')
+MAGIC = b'DCPFCN'
+VERSION = 1
+
+# Keyed by the class name as the header stores it, cut to eight bytes.
+DOCUMENT_CLASSES = {
+    document_class.__name__[:8]: document_class
+    for document_class in (CPF, CNPJ, PIS, TituloEleitor, CNH, RENAVAM)
+}
+
+
+def document_to_int(value, document_class):
+    """
+    Convert a document object, string or integer to its canonical integer.
+    """
+    if isinstance(value, document_class):
+        document = value
+    elif isinstance(value, str) or (isinstance(value, int) and not isinstance(value, bool)):
+        document = document_class(value)
+    else:
+        raise TypeError(
+            "Can't convert %s to %s." % (type(value).__name__, document_class.__name__)
+        )
+
+    if not document.is_valid():
+        raise ValueError(
+            'Invalid %s: %r' % (document_class.__name__.lower(), document)
+        )
+
+    return int(document.number)
+
+
+def _merge(left, right, keep_left, keep_both, keep_right):
+    """
+    Walk two sorted sequences of unique integers, yielding the values
+    selected by the keep_* flags.
+    """
+    i, j = 0, 0
+    len_left, len_right = len(left), len(right)
+
+    while i < len_left and j < len_right:
+        a, b = left[i], right[j]
+        if a < b:
+            if keep_left:
+                yield a
+            i += 1
+        elif b < a:
+            if keep_right:
+                yield b
+            j += 1
+        else:
+            if keep_both:
+                yield a
+            i += 1
+            j += 1
+
+    if keep_left:
+        for k in range(i, len_left):
+            yield left[k]
+    if keep_right:
+        for k in range(j, len_right):
+            yield right[k]
+
+
+class DocumentSet(object):
+    """
+    Immutable set of valid CPF or CNPJ numbers stored as a sorted array of
+    unsigned 64-bit integers (8 bytes per entry).
+    """
+
+    def __init__(self, values=(), document_class=CPF):
+        self.document_class = document_class
+        self._values = array('Q', sorted({
+            document_to_int(value, document_class) for value in values
+        }))
+
+    @classmethod
+    def _from_sorted(cls, values, document_class):
+        obj = cls.__new__(cls)
+        obj.document_class = document_class
+        obj._values = values
+        return obj
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        document_class = self.document_class
+        for value in self._values:
+            yield trusted_document(document_class, value)
+
+    def __contains__(self, value):
+        # Only valid numbers are stored, so the integer is looked up as is:
+        # an invalid one is simply not found. No document is built.
+        if isinstance(value, str):
+            digits = re.sub(r'\D', '', value)
+            if not digits or len(digits) > self.document_class.digits:
+                return False
+            number = int(digits)
+        elif isinstance(value, self.document_class):
+            number = int(value.number)
+        elif isinstance(value, bool):
+            return False
+        else:
+            try:
+                number = operator.index(value)
+            except TypeError:
+                return False
+
+        index = bisect_left(self._values, number)
+        return index < len(self._values) and self._values[index] == number
+
+    def __eq__(self, other):
+        if not isinstance(other, DocumentSet):
+            return NotImplemented
+
+        return (
+            self.document_class is other.document_class
+            and len(self) == len(other)
+            and all(a == b for a, b in zip(self._values, other._values))
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({}, size={})'.format(
+            type(self).__name__, self.document_class.__name__, len(self)
+        )
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self._values.itemsize * len(self._values)
+
+    def _combine(self, other, keep_left, keep_both, keep_right):
+        if not isinstance(other, DocumentSet):
+            other = type(self)(other, document_class=self.document_class)
+        elif other.document_class is not self.document_class:
+            raise TypeError(
+                "Can't combine %s and %s sets." % (
+                    self.document_class.__name__, other.document_class.__name__
+                )
+            )
+
+        values = array('Q', _merge(self._values, other._values, keep_left, keep_both, keep_right))
+        return self._from_sorted(values, self.document_class)
+
+    def union(self, other):
+        return self._combine(other, True, True, True)
+
+    def intersection(self, other):
+        return self._combine(other, False, True, False)
+
+    def difference(self, other):
+        return self._combine(other, True, False, False)
+
+    def symmetric_difference(self, other):
+        return self._combine(other, True, False, True)
+
+    def issubset(self, other):
+        return len(self.difference(other)) == 0
+
+    def issuperset(self, other):
+        if not isinstance(other, DocumentSet):
+            other = type(self)(other, document_class=self.document_class)
+        return other.issubset(self)
+
+    def isdisjoint(self, other):
+        return len(self.intersection(other)) == 0
+
+    def _operand(self, other):
+        return isinstance(other, DocumentSet)
+
+    def __or__(self, other):
+        return self.union(other) if self._operand(other) else NotImplemented
+
+    def __and__(self, other):
+        return self.intersection(other) if self._operand(other) else NotImplemented
+
+    def __sub__(self, other):
+        return self.difference(other) if self._operand(other) else NotImplemented
+
+    def __xor__(self, other):
+        return self.symmetric_difference(other) if self._operand(other) else NotImplemented
+
+    def __le__(self, other):
+        return self.issubset(other) if self._operand(other) else NotImplemented
+
+    def __ge__(self, other):
+        return self.issuperset(other) if self._operand(other) else NotImplemented
+
+    def save(self, path):
+        """
+        Write the set to ``path``: a fixed header followed by the sorted
+        little-endian integers, 8-byte aligned so it can be memory-mapped.
+        """
+        values = self._values
+        if sys.byteorder != 'little':
+            values = array('Q', values)
+            values.byteswap()
+
+        with open(path, 'wb') as output:
+            output.write(HEADER.pack(
+                MAGIC, VERSION, self.document_class.__name__.encode(), len(values)
+            ))
+            output.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as source:
+            document_class, count = read_header(source.read(HEADER.size))
+            values = array('Q')
+            values.fromfile(source, count)
+
+        if sys.byteorder != 'little':
+            values.byteswap()
+
+        return cls._from_sorted(values, document_class)
+
+
+def read_header(data):
+    if len(data) < HEADER.size:
+        raise ValueError('Truncated document set header.')
+
+    magic, version, name, count = HEADER.unpack(data[:HEADER.size])
+    if magic != MAGIC:
+        raise ValueError('Not a document set file.')
+    if version != VERSION:
+        raise ValueError('Unsupported document set version: %d' % version)
+
+    name = name.rstrip(b'\x00').decode()
+    if name not in DOCUMENT_CLASSES:
+        raise ValueError('Unknown document type: %s' % name)
+
+    return DOCUMENT_CLASSES[name], count
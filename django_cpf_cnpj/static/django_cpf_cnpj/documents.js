@@ -0,0 +1,156 @@
+/*
+ * Masking and check-digit validation for CPFWidget and CNPJWidget.
+ *
+ * Inputs with a data-document attribute ("cpf" or "cnpj") are validated
+ * when complete or changed; those with data-masked are also masked as the
+ * user types. Invalid numbers get a custom validity message (from
+ * data-invalid-message), so the browser blocks the submission. Events are
+ * delegated from the document, so inputs added later (formset rows) work.
+ *
+ * The algorithm mirrors CheckDigitSpec in django_cpf_cnpj/core.py; both
+ * run the vectors of tests/check_digit_vectors.json.
+ */
+(function (root) {
+  'use strict';
+
+  var VALID = 'valid';
+  var INVALID_LENGTH = 'invalid_length';
+  var REPEATED_DIGITS = 'repeated_digits';
+  var INVALID_CHECK_DIGITS = 'invalid_check_digits';
+
+  // Same weights and rules as CPF_SPEC and CNPJ_SPEC: the weights of the
+  // base digits followed by those of the check digits before.
+  var SPECS = {
+    cpf: {
+      base: 9,
+      length: 11,
+      weights: [[1, 2, 3, 4, 5, 6, 7, 8, 9], [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]],
+      rule: function (remainder) { return remainder % 10; },
+      mask: '###.###.###-##'
+    },
+    cnpj: {
+      base: 12,
+      length: 14,
+      weights: [[5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]],
+      rule: function (remainder) { return remainder < 2 ? 0 : 11 - remainder; },
+      mask: '##.###.###/####-##'
+    }
+  };
+
+  function digitsOf(value) {
+    return String(value).replace(/\D/g, '');
+  }
+
+  function checkDigits(kind, base) {
+    var spec = SPECS[kind];
+    var digits = String(base).split('').map(Number);
+    for (var i = 0; i < spec.weights.length; i++) {
+      var weights = spec.weights[i];
+      var total = 0;
+      for (var j = 0; j < weights.length; j++) {
+        total += weights[j] * digits[j];
+      }
+      digits.push(spec.rule(total % 11));
+    }
+    return digits.slice(spec.base).join('');
+  }
+
+  function check(kind, value) {
+    var spec = SPECS[kind];
+    var number = digitsOf(value);
+    while (number.length < spec.length) {
+      number = '0' + number;
+    }
+    if (number.length !== spec.length) {
+      return INVALID_LENGTH;
+    }
+    if (number.split(number.charAt(0)).length - 1 === spec.length) {
+      return REPEATED_DIGITS;
+    }
+    if (checkDigits(kind, number.slice(0, spec.base)) !== number.slice(spec.base)) {
+      return INVALID_CHECK_DIGITS;
+    }
+    return VALID;
+  }
+
+  // Mask the digits typed so far: "1234" gives "123.4" for a CPF.
+  function format(kind, value) {
+    var spec = SPECS[kind];
+    var digits = digitsOf(value).slice(0, spec.length);
+    var masked = '';
+    var position = 0;
+    for (var i = 0; i < spec.mask.length && position < digits.length; i++) {
+      masked += spec.mask.charAt(i) === '#' ? digits.charAt(position++) : spec.mask.charAt(i);
+    }
+    return masked;
+  }
+
+  function kindOf(input) {
+    var kind = input && input.getAttribute && input.getAttribute('data-document');
+    return SPECS.hasOwnProperty(kind) ? kind : null;
+  }
+
+  function validate(input) {
+    var kind = kindOf(input);
+    var invalid = input.value !== '' && check(kind, input.value) !== VALID;
+    var message = input.getAttribute('data-invalid-message') || 'Invalid ' + kind + '.';
+    input.setCustomValidity(invalid ? message : '');
+    return !invalid;
+  }
+
+  function onInput(event) {
+    var input = event.target;
+    var kind = kindOf(input);
+    if (!kind) {
+      return;
+    }
+
+    input.setCustomValidity('');
+    if (input.hasAttribute('data-masked')) {
+      var typed = digitsOf(input.value.slice(0, input.selectionEnd)).length;
+      var value = format(kind, input.value);
+      if (value !== input.value) {
+        input.value = value;
+        // Keep the caret after the same number of digits.
+        var caret = 0;
+        while (typed > 0 && caret < value.length) {
+          if (/\d/.test(value.charAt(caret))) {
+            typed--;
+          }
+          caret++;
+        }
+        input.setSelectionRange(caret, caret);
+      }
+    }
+
+    if (digitsOf(input.value).length >= SPECS[kind].length) {
+      validate(input);
+    }
+  }
+
+  function onChange(event) {
+    if (kindOf(event.target)) {
+      validate(event.target);
+    }
+  }
+
+  var api = {
+    SPECS: SPECS,
+    checkDigits: checkDigits,
+    check: check,
+    format: format,
+    isValid: function (kind, value) { return check(kind, value) === VALID; },
+    validate: validate
+  };
+
+  if (typeof document !== 'undefined') {
+    document.addEventListener('input', onInput);
+    document.addEventListener('change', onChange);
+  }
+
+  if (typeof module === 'object' && module.exports) {
+    module.exports = api;
+  } else {
+    root.djangoCpfCnpj = api;
+  }
+}(this));
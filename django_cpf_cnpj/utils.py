@@ -0,0 +1,70 @@
+import json
+import os
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+
+from django_cpf_cnpj.fields import DocumentField
+
+
+def resolve_field(label):
+    """
+    Resolve an ``app_label.Model.field`` label to a (model, field) pair.
+    """
+    try:
+        app_label, model_name, field_name = label.split('.')
+    except ValueError:
+        raise ValueError(
+            "Expected a label of the form 'app_label.Model.field', got %r." % label
+        )
+
+    model = apps.get_model(app_label, model_name)
+    try:
+        field = model._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        raise ValueError('%s has no field %r.' % (model.__name__, field_name))
+
+    if not isinstance(field, DocumentField):
+        raise ValueError('%s is not a document field.' % label)
+
+    return model, field
+
+
+def iter_batches(queryset, field_name, batch_size=1000, start_after=None):
+    """
+    Yield lists of ``(pk, raw value)`` pairs ordered by primary key.
+
+    Uses keyset pagination, so every batch is one indexed query regardless
+    of table size and iteration can resume after any primary key.
+    """
+    queryset = queryset.order_by('pk').values_list('pk', field_name)
+    last_pk = start_after
+
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+
+        yield batch
+        last_pk = batch[-1][0]
+
+
+def read_checkpoint(path):
+    """
+    Return the last primary key stored in the checkpoint file ``path``, or
+    None if there is no checkpoint yet.
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    with open(path) as checkpoint_file:
+        return json.load(checkpoint_file)['last_pk']
+
+
+def write_checkpoint(path, last_pk):
+    # Write then rename, so an interrupted run never leaves a truncated file.
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as checkpoint_file:
+        json.dump({'last_pk': last_pk}, checkpoint_file)
+    os.replace(tmp_path, path)
@@ -1,130 +1,61 @@
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-import re
-
-
-def last_digits_cpf(value):
-    v1, v2 = 0, 0
-    for i, d in enumerate(map(int, value[:-2][::-1])):
-        v1 += d * (9 - (i % 10))
-        v2 += d * (9 - (i + 1) % 10)
-
-    v1 = (v1 % 11) % 10
-    v2 = ((v2 + v1 * 9) % 11) % 10
-
-    return v1, v2
-
-
-def last_digits_cnpj(value):
-    cnpj = tuple(map(int, value))
-
-    v1 = 5 * cnpj[0] + 4 * cnpj[1] + 3 * cnpj[2] + 2 * cnpj[3]
-    v1 += 9 * cnpj[4] + 8 * cnpj[5] + 7 * cnpj[6] + 6 * cnpj[7]
-    v1 += 5 * cnpj[8] + 4 * cnpj[9] + 3 * cnpj[10] + 2 * cnpj[11]
-    v1 = v1 % 11
-    v1 = 0 if v1 < 2 else 11 - v1
-
-    v2 = 6 * cnpj[0] + 5 * cnpj[1] + 4 * cnpj[2] + 3 * cnpj[3]
-    v2 += 2 * cnpj[4] + 9 * cnpj[5] + 8 * cnpj[6] + 7 * cnpj[7]
-    v2 += 6 * cnpj[8] + 5 * cnpj[9] + 4 * cnpj[10] + 3 * cnpj[11]
-    v2 += 2 * v1
-
-    v2 = v2 % 11
-    v2 = 0 if v2 < 2 else 11 - v2
-
-    return v1, v2
-
-
-def is_valid_cpf(value):
-    if not isinstance(value, str) and not isinstance(value, int):
-        return False
-
-    value = re.sub(r'\D', '', str(value)).zfill(11)
-    if len(re.sub(r'([0-9])\1+', r'\1', value)) == 1 or len(value) != 11:
-        return False
-
-    v1, v2 = last_digits_cpf(value)
-
-    if v1 != int(value[-2]) or v2 != int(value[-1]):
-        return False
-
-    return True
-
-
-def is_valid_cnpj(value):
-    if not isinstance(value, str) and not isinstance(value, int):
-        return False
-
-    value = re.sub(r'\D', '', str(value)).zfill(14)
-    if len(re.sub(r'([0-9])\1+', r'\1', value)) == 1 or len(value) != 14:
-        return False
-
-    v1, v2 = last_digits_cnpj(value)
-
-    if v1 != int(value[-2]) or v2 != int(value[-1]):
-        return False
-
-    return True
-
-
-def cpf_generator(value):
-    value = re.sub(r'\D', '', str(value)).zfill(9)[:9]
-
-    v1, v2 = last_digits_cpf(value + 'xx')
-
-    new = value + str(v1) + str(v2)
-
-    if not is_valid_cpf(new):
-        new = None
-
-    return new
-
-
-def cnpj_generator(value):
-    value = re.sub(r'\D', '', str(value)).zfill(12)[:12]
-    v1, v2 = last_digits_cnpj(value)
-
-    new = value + str(v1) + str(v2)
-
-    if not is_valid_cnpj(new):
-        new = None
-
-    return new
+from django_cpf_cnpj.core import (  # NOQA
+    VALID, INVALID_TYPE, INVALID_LENGTH, REPEATED_DIGITS, INVALID_CHECK_DIGITS,
+    last_digits_cpf, last_digits_cnpj, check_cpf, check_cnpj, is_valid_cpf, is_valid_cnpj,
+    cpf_generator, cnpj_generator, cpf_random_generator, cnpj_random_generator,
+    CheckDigitSpec, CPF_SPEC, CNPJ_SPEC, mod11_mod10, mod11_complement,
+)
+from django_cpf_cnpj.documents import (  # NOQA
+    PIS_SPEC, TITULO_ELEITOR_SPEC, CNH_SPEC, RENAVAM_SPEC,
+    check_pis, check_titulo_eleitor, check_cnh, check_renavam,
+    is_valid_pis, is_valid_titulo_eleitor, is_valid_cnh, is_valid_renavam,
+)
+
+CPF_INVALID_MESSAGE = _('(%(value)s) is not valid cpf.')
+CNPJ_INVALID_MESSAGE = _('(%(value)s) is not valid cnpj.')
+PIS_INVALID_MESSAGE = _('(%(value)s) is not valid pis.')
+TITULO_ELEITOR_INVALID_MESSAGE = _('(%(value)s) is not valid título de eleitor.')
+CNH_INVALID_MESSAGE = _('(%(value)s) is not valid cnh.')
+RENAVAM_INVALID_MESSAGE = _('(%(value)s) is not valid renavam.')
+
+
+def _validate(value, check, message):
+    # Document objects cache their validity; reuse it instead of re-parsing.
+    if hasattr(value, 'is_valid'):
+        status = VALID if value.is_valid() else check(value.number)
+    else:
+        status = check(value)
+
+    if status != VALID:
+        raise ValidationError(
+            message, code='invalid', params={'value': value, 'reason': status}
+        )
 
 
-def cpf_random_generator():
-    import random
+def validate_cpf(value):
+    _validate(value, check_cpf, CPF_INVALID_MESSAGE)
 
-    candidate = str(random.randint(1, 999999998))
-    while not cpf_generator(candidate):
-        candidate = str(random.randint(1, 999999998))
 
-    return cpf_generator(candidate)
+def validate_cnpj(value):
+    _validate(value, check_cnpj, CNPJ_INVALID_MESSAGE)
 
 
-def cnpj_random_generator():
-    import random
+def validate_pis(value):
+    _validate(value, check_pis, PIS_INVALID_MESSAGE)
 
-    candidate = str(random.randint(1, 999999999998))
-    while not cnpj_generator(candidate):
-        candidate = str(random.randint(1, 999999999998))
 
-    return cnpj_generator(candidate)
+def validate_titulo_eleitor(value):
+    _validate(value, check_titulo_eleitor, TITULO_ELEITOR_INVALID_MESSAGE)
 
 
-def validate_cpf(value):
-    if not is_valid_cpf(value):
-        raise ValidationError(
-            _(f'({value}) is not valid cpf.')
-        )
+def validate_cnh(value):
+    _validate(value, check_cnh, CNH_INVALID_MESSAGE)
 
 
-def validate_cnpj(value):
-    if not is_valid_cnpj(value):
-        raise ValidationError(
-            _(f'({value}) is not valid cnpj.')
-        )
+def validate_renavam(value):
+    _validate(value, check_renavam, RENAVAM_INVALID_MESSAGE)
 
 
 if __name__ == '__main__':
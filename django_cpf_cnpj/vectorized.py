@@ -0,0 +1,199 @@
+"""
+NumPy-based bulk generation of valid CPF/CNPJ numbers.
+
+Base digits are drawn as an integer vector, split into a digit matrix and
+the check digits are computed with weight dot products, so no Python code
+runs per document. Requires numpy; Arrow output also requires pyarrow.
+"""
+import io
+
+from django_cpf_cnpj.core import CPF, trusted_document
+
+__all__ = [
+    'generate_numbers', 'iter_number_chunks', 'format_numbers', 'valid_numbers',
+    'iter_csv_chunks', 'iter_arrow_batches', 'iter_model_instances',
+]
+
+DEFAULT_CHUNK_SIZE = 1000000
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('django_cpf_cnpj.vectorized requires numpy.')
+    return numpy
+
+
+def _spec(document_class):
+    spec = getattr(document_class, 'spec', None)
+    # Exceptions to the digit table (``adjust``) don't vectorize.
+    if spec is None or spec.adjust is not None:
+        raise TypeError("Can't generate %s numbers." % document_class.__name__)
+    return spec
+
+
+def complete_numbers(bases, document_class=CPF):
+    """
+    Append the check digits to an int64 array of bases, returning the
+    full numbers as int64.
+    """
+    np = _numpy()
+    spec = _spec(document_class)
+    base_length = spec.base_length
+    digit_table = np.array(spec.digit_table, dtype=np.int64)
+
+    powers = 10 ** np.arange(base_length - 1, -1, -1, dtype=np.int64)
+    digits = (bases[:, None] // powers) % 10
+
+    numbers = bases
+    check_digits = []
+    for weights in spec.weights:
+        total = digits @ np.array(weights[:base_length], dtype=np.int64)
+        for weight, check_digit in zip(weights[base_length:], check_digits):
+            total += weight * check_digit
+        check_digits.append(digit_table[total % 11])
+        numbers = numbers * 10 + check_digits[-1]
+
+    return numbers
+
+
+def valid_numbers(numbers, document_class=CPF):
+    """
+    Return a boolean array telling which numbers of an integer array are
+    valid.
+    """
+    np = _numpy()
+    spec = _spec(document_class)
+    numbers = np.asarray(numbers, dtype=np.int64)
+
+    in_range = (numbers > 0) & (numbers < 10 ** spec.length)
+    bases = np.where(in_range, numbers // 10 ** len(spec.weights), 0)
+    return in_range & (numbers % spec.repdigit != 0) & (complete_numbers(bases, document_class) == numbers)
+
+
+def _draw_bases(np, rng, count, document_class, unique):
+    upper = 10 ** _spec(document_class).base_length
+    # Bases made of one repeated digit (0, 111..., 999...) are skipped since
+    # they can give all-equal, invalid numbers; they are multiples of 11...1.
+    repdigit = (upper - 1) // 9
+
+    if unique:
+        available = upper - 10
+        if count > available:
+            raise ValueError('Only %d distinct %s numbers exist.' % (available, document_class.__name__))
+        if count * 2 > available:
+            # Most bases are wanted: shuffling them all costs about as much.
+            bases = rng.permutation(np.arange(1, upper, dtype=np.int64))
+            return bases[bases % repdigit != 0][:count]
+
+        # Draw with replacement and redraw the shortfall left by repeats, so
+        # memory stays proportional to ``count``.
+        bases = np.empty(0, dtype=np.int64)
+        while len(bases) < count:
+            missing = count - len(bases)
+            drawn = rng.integers(1, upper, size=missing + missing // 10 + 16, dtype=np.int64)
+            bases = np.concatenate((bases, drawn[drawn % repdigit != 0]))
+            # Sort and drop neighbours; much faster than np.unique here.
+            bases.sort()
+            bases = bases[np.concatenate(([True], bases[1:] != bases[:-1]))]
+        # The bases are sorted; shuffle before trimming to keep the sample
+        # uniform.
+        rng.shuffle(bases)
+        return bases[:count]
+
+    bases = rng.integers(1, upper, size=count, dtype=np.int64)
+    bad = bases % repdigit == 0
+    while bad.any():
+        bases[bad] = rng.integers(1, upper, size=int(bad.sum()), dtype=np.int64)
+        bad = bases % repdigit == 0
+    return bases
+
+
+def generate_numbers(count, document_class=CPF, seed=None, unique=False):
+    """
+    Return an int64 array of ``count`` random valid numbers. The same
+    ``seed`` always gives the same numbers; ``unique`` draws without
+    replacement.
+    """
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    return complete_numbers(_draw_bases(np, rng, count, document_class, unique), document_class)
+
+
+def iter_number_chunks(count, document_class=CPF, seed=None, unique=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield int64 arrays of at most ``chunk_size`` numbers, ``count`` in total.
+
+    With ``unique`` every base is drawn up front so uniqueness holds across
+    chunks: 8 bytes per document, plus temporary arrays of about the same
+    size while repeats are removed.
+    """
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+
+    if unique:
+        bases = _draw_bases(np, rng, count, document_class, unique=True)
+        for start in range(0, count, chunk_size):
+            yield complete_numbers(bases[start:start + chunk_size], document_class)
+        return
+
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        yield complete_numbers(_draw_bases(np, rng, size, document_class, False), document_class)
+
+
+def format_numbers(numbers, document_class=CPF, masked=False):
+    """
+    Return a list of the numbers as zero-padded strings, optionally masked.
+    """
+    if masked:
+        return [trusted_document(document_class, number).format() for number in numbers.tolist()]
+
+    digits = document_class.digits
+    return ['%0*d' % (digits, number) for number in numbers.tolist()]
+
+
+def iter_csv_chunks(count, document_class=CPF, seed=None, unique=False, chunk_size=DEFAULT_CHUNK_SIZE,
+                    header=True):
+    """
+    Yield CSV text chunks with one number per line.
+    """
+    np = _numpy()
+    fmt = '%0{}d'.format(document_class.digits)
+
+    for index, numbers in enumerate(iter_number_chunks(count, document_class, seed, unique, chunk_size)):
+        output = io.StringIO()
+        if header and index == 0:
+            output.write(document_class.__name__.lower() + '\n')
+        np.savetxt(output, numbers, fmt=fmt)
+        yield output.getvalue()
+
+
+def iter_arrow_batches(count, document_class=CPF, seed=None, unique=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield pyarrow RecordBatches with an int64 column named after the
+    document type.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('iter_arrow_batches requires pyarrow.')
+
+    name = document_class.__name__.lower()
+    for numbers in iter_number_chunks(count, document_class, seed, unique, chunk_size):
+        yield pyarrow.RecordBatch.from_arrays([pyarrow.array(numbers)], names=[name])
+
+
+def iter_model_instances(model, field_name, count, document_class=CPF, seed=None, unique=False,
+                         chunk_size=10000):
+    """
+    Yield lists of unsaved ``model`` instances, ready for ``bulk_create``.
+    The field gets already-validated document objects, so saving them does
+    not parse the numbers again.
+    """
+    for numbers in iter_number_chunks(count, document_class, seed, unique, chunk_size):
+        yield [
+            model(**{field_name: trusted_document(document_class, number)})
+            for number in numbers.tolist()
+        ]
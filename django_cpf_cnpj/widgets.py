@@ -1,27 +1,58 @@
-from django.forms import TextInput
+from django.forms import Media, TextInput
 
 
-class CPFWidget(TextInput):
-    def __init__(self, attrs=None):
-        if not isinstance(attrs, dict):
-            attrs = dict()
+class DocumentWidget(TextInput):
+    """
+    Text input sized for the masked number, ``length`` characters long.
 
-        if attrs is not None and hasattr(attrs, 'setdefault'):
-            attrs.setdefault('max_length', 14)
-            attrs.setdefault('size', 14)
-            attrs.setdefault('type', 'text')
+    Widgets with a ``document`` ("cpf" or "cnpj") ship
+    ``django_cpf_cnpj/documents.js``, which validates the check digits in
+    the browser and, with ``masked=True``, masks the number as it is typed.
+    """
+    length = None
+    document = None
 
-        super(CPFWidget, self).__init__(attrs)
+    def __init__(self, attrs=None, masked=False):
+        attrs = dict(attrs or {})
+        attrs.setdefault('maxlength', self.length)
+        attrs.setdefault('size', self.length)
+        attrs.setdefault('type', 'text')
 
+        if self.document is not None:
+            attrs.setdefault('data-document', self.document)
+            if masked:
+                attrs.setdefault('data-masked', True)
 
-class CNPJWidget(TextInput):
-    def __init__(self, attrs=None):
-        if not isinstance(attrs, dict):
-            attrs = {}
+        super().__init__(attrs)
 
-        if attrs is not None and hasattr(attrs, 'setdefault'):
-            attrs.setdefault('max_length', 18)
-            attrs.setdefault('size', 18)
-            attrs.setdefault('type', 'text')
+    @property
+    def media(self):
+        if self.document is None:
+            return Media()
+        return Media(js=['django_cpf_cnpj/documents.js'])
 
-        super(CNPJWidget, self).__init__(attrs)
+
+class CPFWidget(DocumentWidget):
+    length = 14
+    document = 'cpf'
+
+
+class CNPJWidget(DocumentWidget):
+    length = 18
+    document = 'cnpj'
+
+
+class PISWidget(DocumentWidget):
+    length = 14
+
+
+class TituloEleitorWidget(DocumentWidget):
+    length = 14
+
+
+class CNHWidget(DocumentWidget):
+    length = 11
+
+
+class RENAVAMWidget(DocumentWidget):
+    length = 11
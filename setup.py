@@ -32,5 +32,15 @@ setuptools.setup(
     ],
     python_requires='>=3.6',
     install_requires=['Django >= 2.2',],
-    packages=['django_cpf_cnpj',]
+    extras_require={
+        'numpy': ['numpy'],
+        'arrow': ['numpy', 'pyarrow'],
+        'encrypted': ['cryptography'],
+    },
+    packages=[
+        'django_cpf_cnpj',
+        'django_cpf_cnpj.management',
+        'django_cpf_cnpj.management.commands',
+    ],
+    package_data={'django_cpf_cnpj': ['static/django_cpf_cnpj/*.js']},
 )
@@ -0,0 +1,30 @@
+// Run the shared check-digit vectors against the widget script:
+//     node tests/documents.test.js
+var path = require('path');
+
+var documents = require(path.join(__dirname, '..', 'django_cpf_cnpj', 'static', 'django_cpf_cnpj', 'documents.js'));
+var vectors = require(path.join(__dirname, 'check_digit_vectors.json'));
+
+var failures = [];
+
+function expect(name, vector, actual, expected) {
+  if (actual !== expected) {
+    failures.push(name + ' ' + JSON.stringify(vector) + ': got ' + JSON.stringify(actual));
+  }
+}
+
+vectors.check.forEach(function (vector) {
+  expect('check', vector, documents.check(vector.document, vector.value), vector.status);
+});
+vectors.check_digits.forEach(function (vector) {
+  expect('checkDigits', vector, documents.checkDigits(vector.document, vector.base), vector.digits);
+});
+vectors.format.forEach(function (vector) {
+  expect('format', vector, documents.format(vector.document, vector.value), vector.formatted);
+});
+
+if (failures.length) {
+  console.error(failures.join('\n'));
+  process.exit(1);
+}
+console.log('ok');
@@ -1,6 +1,7 @@
 from django.db import models
 
-from django_cpf_cnpj.fields import CPFField, CNPJField
+from django_cpf_cnpj.encrypted import BlindIndexField, EncryptedCPFField, EncryptedCNPJField
+from django_cpf_cnpj.fields import CPFField, CNPJField, PISField, TituloEleitorField, CNHField, RENAVAMField
 
 
 class DefaultCPF(models.Model):
@@ -83,3 +84,51 @@ class CustomCNPJField(CNPJField):
 
 class CustomCNPJModel(models.Model):
     cnpj = CustomCNPJField()
+
+
+class ShardedCPF(models.Model):
+    cpf = CPFField()
+    name = models.CharField(max_length=50, blank=True)
+    objects = models.Manager()
+
+
+class ShardedCNPJ(models.Model):
+    cnpj = CNPJField()
+    objects = models.Manager()
+
+
+class EncryptedCPF(models.Model):
+    cpf = EncryptedCPFField(blank=True, null=True)
+    cpf_index = BlindIndexField('cpf', null=True)
+    objects = models.Manager()
+
+
+class EncryptedCNPJ(models.Model):
+    cnpj_index = BlindIndexField('cnpj')
+    cnpj = EncryptedCNPJField()
+    objects = models.Manager()
+
+
+class LazyCPF(models.Model):
+    cpf = CPFField(blank=True, null=True, lazy=True)
+    name = models.CharField(max_length=50, blank=True)
+    objects = models.Manager()
+
+
+class LazyCNPJ(models.Model):
+    cnpj = CNPJField(masked=True, lazy=True)
+    objects = models.Manager()
+
+
+class ImportedCPF(models.Model):
+    cpf = CPFField(unique=True, masked=True)
+    name = models.CharField(max_length=50)
+    objects = models.Manager()
+
+
+class OtherDocuments(models.Model):
+    pis = PISField(null=True)
+    titulo_eleitor = TituloEleitorField(masked=True, null=True)
+    cnh = CNHField(null=True, unique=True)
+    renavam = RENAVAMField(null=True, lazy=True)
+    objects = models.Manager()
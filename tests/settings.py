@@ -1,7 +1,25 @@
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3'
-    }
+    },
+    'shard_0': {
+        'ENGINE': 'django.db.backends.sqlite3'
+    },
+    'shard_1': {
+        'ENGINE': 'django.db.backends.sqlite3'
+    },
+    'shard_2': {
+        'ENGINE': 'django.db.backends.sqlite3'
+    },
+}
+
+DATABASE_ROUTERS = ['django_cpf_cnpj.routers.DocumentShardRouter']
+
+CPF_CNPJ_SHARDS = ['shard_0', 'shard_1', 'shard_2']
+
+CPF_CNPJ_SHARD_KEYS = {
+    'tests.ShardedCPF': 'cpf',
+    'tests.ShardedCNPJ': ('cnpj', 'cnpj_root'),
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
@@ -12,3 +30,7 @@ INSTALLED_APPS = [
     'django_cpf_cnpj',
     'tests'
 ]
+
+CPF_CNPJ_ENCRYPTION_KEYS = ['0xYNcOQf0RDrgRi4nSVjW_L5G1x3bqUBFrlS06W1QHo=']
+
+CPF_CNPJ_BLIND_INDEX_KEYS = ['blind-index-key']
@@ -1,11 +1,68 @@
-from django.test import TestCase, override_settings
-from django.core.exceptions import ValidationError
+import asyncio
+import io
+import json
+import logging
+import os
+import pickle
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import cryptography
+except ImportError:
+    cryptography = None
+
+from django.core.management import call_command, CommandError
+from django import forms
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings, skipUnlessDBFeature
+from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.utils.version import get_version as django_version
 
 from django_cpf_cnpj.cpf import CPF, cpf_to_python as cpf_to_python
 from django_cpf_cnpj.cnpj import CNPJ, cnpj_to_python as cnpj_to_python
-from django_cpf_cnpj.validators import is_valid_cpf, is_valid_cnpj
-from .models import DefaultCPF, OptionalCPF, NullableCPF, UniqueCPF, TestCPFModel, CustomCPFModel, DefaultCNPJ, OptionalCNPJ, NullableCNPJ, UniqueCNPJ, TestCNPJModel, CustomCNPJModel
+from django_cpf_cnpj.validators import is_valid_cpf, is_valid_cnpj, check_cpf, check_cnpj, validate_cpf, validate_cnpj
+from django_cpf_cnpj import validators
+from django_cpf_cnpj.codec import encode_documents, decode_documents
+from django_cpf_cnpj.core import is_valid_cpf_int, is_valid_cnpj_int, cpf_from_int, cnpj_from_int
+from django_cpf_cnpj.core import _LocalVar, parse_cache, cpf_check_digits, cnpj_check_digits, iter_cpfs, iter_cnpjs
+from django_cpf_cnpj.validators import cpf_generator, cnpj_generator, last_digits_cpf, last_digits_cnpj
+from django_cpf_cnpj.enrichment import DocumentEnricher, StubRegistryBackend
+from django_cpf_cnpj.seeding import iter_seed_documents, seed_documents
+from django_cpf_cnpj.querysets import DocumentQuerySet, annotate_fiscal_region
+from django_cpf_cnpj.sets import DocumentSet
+from django_cpf_cnpj.index import DocumentIndex, build_index
+from django_cpf_cnpj.audit import DocumentAuditor, Finding
+from django_cpf_cnpj.fields import CPFField
+from django_cpf_cnpj.normalize import DocumentNormalizer
+from django_cpf_cnpj.operations import NormalizeDocuments
+from django_cpf_cnpj.functions import IsValidCPF, IsValidCNPJ, NormalizeCPF, NormalizeCNPJ, DigitsOnly
+from django_cpf_cnpj.routers import shard_for, using_shard, filter_in_shards, bulk_create_in_shards
+from django_cpf_cnpj.encrypted import blind_index, rotate_keys
+from django_cpf_cnpj.extract import find_documents, scan_file
+from django_cpf_cnpj.log import RedactDocumentsFilter
+from django_cpf_cnpj.importer import DocumentImporter, ImportIssue
+from django_cpf_cnpj.middleware import ParseCacheMiddleware
+from django_cpf_cnpj.forms import CPFForm, CNPJForm, DocumentFormSetMixin, PISForm, TituloEleitorForm
+from django_cpf_cnpj.documents import PIS, TituloEleitor, CNH, RENAVAM
+from django_cpf_cnpj.validators import (
+    CPF_SPEC, CNPJ_SPEC, PIS_SPEC, TITULO_ELEITOR_SPEC, CNH_SPEC, RENAVAM_SPEC, validate_pis, check_cnh,
+)
+from .models import DefaultCPF, OptionalCPF, NullableCPF, UniqueCPF, TestCPFModel, CustomCPFModel, DefaultCNPJ, OptionalCNPJ, NullableCNPJ, UniqueCNPJ, TestCNPJModel, CustomCNPJModel, ShardedCPF, ShardedCNPJ, EncryptedCPF, EncryptedCNPJ, LazyCPF, LazyCNPJ, ImportedCPF, OtherDocuments
 from .forms import TestCPFForm, CustomCPFForm, TestCNPJForm, CustomCNPJForm
 
 
@@ -569,3 +626,1441 @@ class CNPJFormFieldTest(TestCase):
         cnpj = CustomCNPJModel()
         model_field = cnpj._meta.get_field('cnpj')
         self.assertIsInstance(model_field.formfield(), CustomCNPJForm)
+
+
+class DocumentSetTest(TestCase):
+    valid_cpfs = ['00000000191', '012.345.678-90', '99999999808']
+    valid_cnpjs = ['00000000000191', '89.765.309/1158-38']
+
+    def test_membership_accepts_any_representation(self):
+        cpfs = DocumentSet(self.valid_cpfs)
+
+        self.assertEqual(len(cpfs), 3)
+        self.assertIn('000.000.001-91', cpfs)
+        self.assertIn(CPF('01234567890'), cpfs)
+        self.assertIn(191, cpfs)
+        self.assertNotIn('55555555474', cpfs)
+        self.assertNotIn('invalid', cpfs)
+        self.assertNotIn(CNPJ('00000000000191'), cpfs)
+
+    def test_membership_edge_cases(self):
+        cpfs = DocumentSet(self.valid_cpfs)
+
+        self.assertNotIn('000000000000191', cpfs)
+        self.assertNotIn(-191, cpfs)
+        self.assertNotIn(True, cpfs)
+        self.assertNotIn(191.0, cpfs)
+        self.assertNotIn('', cpfs)
+        self.assertIn('CPF 000.000.001-91', cpfs)
+        self.assertTrue(all(cpf.is_valid() for cpf in cpfs))
+
+    def test_duplicates_are_collapsed_and_iteration_is_sorted(self):
+        cpfs = DocumentSet(self.valid_cpfs + ['01234567890'])
+        self.assertEqual(
+            [cpf.number for cpf in cpfs],
+            ['00000000191', '01234567890', '99999999808'],
+        )
+
+    def test_invalid_value_raises(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid cpf'):
+            DocumentSet(['12312312312'])
+
+        with self.assertRaisesMessage(TypeError, "Can't convert float to CPF."):
+            DocumentSet([1.0])
+
+    def test_set_algebra(self):
+        left = DocumentSet(['00000000191', '01234567890'])
+        right = DocumentSet(['01234567890', '99999999808'])
+
+        self.assertEqual(left | right, DocumentSet(self.valid_cpfs))
+        self.assertEqual(left & right, DocumentSet(['01234567890']))
+        self.assertEqual(left - right, DocumentSet(['00000000191']))
+        self.assertEqual(left ^ right, DocumentSet(['00000000191', '99999999808']))
+        self.assertTrue(left & right <= left)
+        self.assertTrue(left.isdisjoint(['99999999808']))
+
+    def test_cannot_combine_cpf_and_cnpj_sets(self):
+        with self.assertRaises(TypeError):
+            DocumentSet(self.valid_cpfs) | DocumentSet(self.valid_cnpjs, document_class=CNPJ)
+
+    def test_save_and_load(self):
+        cnpjs = DocumentSet(self.valid_cnpjs, document_class=CNPJ)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cnpjs.bin')
+            cnpjs.save(path)
+            self.assertEqual(os.path.getsize(path), 24 + 8 * len(cnpjs))
+
+            loaded = DocumentSet.load(path)
+
+        self.assertIs(loaded.document_class, CNPJ)
+        self.assertEqual(loaded, cnpjs)
+        self.assertIn('89765309115838', loaded)
+
+
+class DocumentIndexTest(TestCase):
+    def test_build_from_iterable_and_open(self):
+        values = ['99999999808', '000.000.001-91', 'invalid', '01234567890', '00000000191']
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cpfs.idx')
+            self.assertEqual(build_index(path, values, chunk_size=2), 3)
+
+            with DocumentIndex.open(path) as index:
+                self.assertIs(index.document_class, CPF)
+                self.assertEqual(len(index), 3)
+                self.assertIn('012.345.678-90', index)
+                self.assertNotIn('55555555474', index)
+                self.assertEqual(index, DocumentSet(values[:2] + values[3:]))
+
+    def test_strict_build_raises_on_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cpfs.idx')
+            with self.assertRaisesMessage(ValueError, 'Invalid cpf'):
+                build_index(path, ['invalid'], strict=True)
+
+    def test_build_from_queryset(self):
+        DefaultCNPJ.objects.create(cnpj='89.765.309/1158-38')
+        DefaultCNPJ.objects.create(cnpj='00000000000191')
+        DefaultCNPJ.objects.create(cnpj='invalid')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cnpjs.idx')
+            self.assertEqual(build_index(path, DefaultCNPJ.objects.all()), 2)
+
+            with DocumentIndex.open(path) as index:
+                self.assertIs(index.document_class, CNPJ)
+                self.assertIn('89765309115838', index)
+
+    def test_build_from_other_document_field(self):
+        OtherDocuments.objects.create(titulo_eleitor='1234 5678 0191')
+        OtherDocuments.objects.create(titulo_eleitor='invalid')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'titulos.idx')
+            self.assertEqual(build_index(path, OtherDocuments.objects.all(), field_name='titulo_eleitor'), 1)
+
+            with DocumentIndex.open(path) as index:
+                self.assertIs(index.document_class, TituloEleitor)
+                self.assertIn('123456780191', index)
+
+    def test_open_empty_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'empty.idx')
+            build_index(path, [])
+
+            with DocumentIndex.open(path) as index:
+                self.assertEqual(len(index), 0)
+                self.assertNotIn('00000000191', index)
+
+
+def insert_raw(model, field_name, values):
+    """Store values as-is, bypassing get_prep_value."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO %s (%s) VALUES (%%s)' % (table, field_name),
+            [(value,) for value in values],
+        )
+    return list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+class MaskedStorageTest(TestCase):
+    def test_masked_setting_stores_formatted_value(self):
+        with override_settings(CPF_MASKED=True):
+            obj = DefaultCPF.objects.create(cpf='01234567890')
+            self.assertEqual(str(obj.cpf), '012.345.678-90')
+
+        self.assertEqual(
+            DefaultCPF.objects.values_list('cpf', flat=True).get(pk=obj.pk),
+            '012.345.678-90',
+        )
+
+    def test_format(self):
+        self.assertEqual(CPF('01234567890').format(), '012.345.678-90')
+        self.assertEqual(CNPJ('191').format(), '00.000.000/0001-91')
+
+
+class DocumentAuditTest(TestCase):
+    def test_findings(self):
+        pks = insert_raw(NullableCPF, 'cpf', [
+            '01234567890', '012.345.678-90', 'invalid', None, '', '00000000191', '00000000191',
+        ])
+
+        auditor = DocumentAuditor(NullableCPF, 'cpf', batch_size=3)
+        output = io.StringIO()
+        counts = auditor.run(output)
+
+        self.assertEqual(counts['scanned'], 7)
+        self.assertEqual(auditor.last_pk, pks[-1])
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            [
+                '%d,012.345.678-90,non_canonical,01234567890' % pks[1],
+                '%d,invalid,invalid,' % pks[2],
+                ',00000000191,duplicate,2',
+            ],
+        )
+
+    def test_resume_after_pk(self):
+        pks = insert_raw(DefaultCNPJ, 'cnpj', ['invalid', 'also invalid'])
+        auditor = DocumentAuditor(DefaultCNPJ, 'cnpj', start_after=pks[0])
+        findings = [f for batch in auditor.batches() for f in batch]
+        self.assertEqual(findings, [Finding(pks[1], 'also invalid', 'invalid', '')])
+
+    def test_masked_field_expects_masked_values(self):
+        insert_raw(DefaultCPF, 'cpf', ['01234567890'])
+        with override_settings(CPF_MASKED=True):
+            counts = DocumentAuditor(DefaultCPF, 'cpf').run()
+        self.assertEqual(counts['non_canonical'], 1)
+
+    def test_command_with_checkpoint(self):
+        pks = insert_raw(DefaultCPF, 'cpf', ['invalid', '00000000191'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            report = os.path.join(directory, 'report.csv')
+            checkpoint = os.path.join(directory, 'checkpoint.json')
+            call_command(
+                'audit_documents', 'tests.DefaultCPF.cpf', output=report,
+                checkpoint=checkpoint, batch_size=1, stderr=io.StringIO(),
+            )
+            with open(report) as report_file:
+                self.assertEqual(report_file.read().splitlines(), ['%d,invalid,invalid,' % pks[0]])
+
+            # Resuming from the checkpoint finds nothing new.
+            stderr = io.StringIO()
+            call_command(
+                'audit_documents', 'tests.DefaultCPF.cpf', output=report,
+                checkpoint=checkpoint, stderr=stderr,
+            )
+            self.assertIn('Scanned 0 rows', stderr.getvalue())
+
+    def test_command_rejects_other_fields(self):
+        with self.assertRaisesMessage(CommandError, 'is not a document field'):
+            call_command('audit_documents', 'tests.DefaultCPF.id')
+
+
+class DocumentNormalizerTest(TestCase):
+    def stored(self, model, field_name):
+        return list(model.objects.order_by('pk').values_list(field_name, flat=True))
+
+    def test_rewrites_to_unmasked(self):
+        insert_raw(DefaultCPF, 'cpf', ['012.345.678-90', '00000000191', 'invalid', '000.000.001-91'])
+
+        normalizer = DocumentNormalizer(DefaultCPF, 'cpf', batch_size=3)
+        counts = normalizer.run()
+
+        self.assertEqual(counts['scanned'], 4)
+        self.assertEqual(counts['updated'], 2)
+        self.assertEqual(
+            self.stored(DefaultCPF, 'cpf'),
+            ['01234567890', '00000000191', 'invalid', '00000000191'],
+        )
+
+    def test_rewrites_to_masked(self):
+        insert_raw(DefaultCNPJ, 'cnpj', ['89765309115838'])
+
+        with override_settings(CNPJ_MASKED=True):
+            DocumentNormalizer(DefaultCNPJ, 'cnpj').run()
+
+        self.assertEqual(self.stored(DefaultCNPJ, 'cnpj'), ['89.765.309/1158-38'])
+
+    def test_dry_run_does_not_write(self):
+        insert_raw(DefaultCPF, 'cpf', ['012.345.678-90'])
+        counts = DocumentNormalizer(DefaultCPF, 'cpf', dry_run=True).run()
+        self.assertEqual(counts['updated'], 1)
+        self.assertEqual(self.stored(DefaultCPF, 'cpf'), ['012.345.678-90'])
+
+    def test_command(self):
+        insert_raw(DefaultCPF, 'cpf', ['012.345.678-90', '01234567890'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'checkpoint.json')
+            stderr = io.StringIO()
+            call_command(
+                'normalize_documents', 'tests.DefaultCPF.cpf',
+                checkpoint=checkpoint, batch_size=1, stderr=stderr,
+            )
+            self.assertIn('Updated 1 of 2 rows', stderr.getvalue())
+            self.assertTrue(os.path.exists(checkpoint))
+
+        self.assertEqual(self.stored(DefaultCPF, 'cpf'), ['01234567890', '01234567890'])
+
+    def test_migration_operation(self):
+        from django.db.migrations.state import ProjectState
+
+        insert_raw(DefaultCPF, 'cpf', ['012.345.678-90'])
+        operation = NormalizeDocuments('DefaultCPF', 'cpf', batch_size=10)
+        state = ProjectState.from_apps(django_apps)
+
+        # Only the connection of the schema editor is used.
+        editor = SimpleNamespace(connection=connection)
+        operation.database_forwards('tests', editor, state, state)
+
+        self.assertEqual(self.stored(DefaultCPF, 'cpf'), ['01234567890'])
+        self.assertEqual(
+            operation.deconstruct(),
+            ('NormalizeDocuments', [], {'model_name': 'DefaultCPF', 'name': 'cpf', 'batch_size': 10}),
+        )
+
+    def test_masked_argument_is_deconstructed(self):
+        self.assertEqual(CPFField(masked=True).deconstruct()[3]['masked'], True)
+        self.assertNotIn('masked', CPFField().deconstruct()[3])
+
+
+class DocumentLookupTest(TestCase):
+    def assertQuery(self, queryset, sql, params):
+        query_sql, query_params = queryset.query.sql_with_params()
+        self.assertIn(sql, query_sql)
+        self.assertEqual(query_params, params)
+
+    def test_exact_normalizes_masked_input(self):
+        obj = DefaultCPF.objects.create(cpf='01234567890')
+
+        for value in ('012.345.678-90', '01234567890', CPF('01234567890')):
+            queryset = DefaultCPF.objects.filter(cpf=value)
+            self.assertQuery(queryset, '"cpf" = %s', ('01234567890',))
+            self.assertEqual(list(queryset), [obj])
+
+    def test_exact_normalizes_to_masked_storage(self):
+        with override_settings(CNPJ_MASKED=True):
+            queryset = DefaultCNPJ.objects.filter(cnpj='89765309115838')
+            self.assertQuery(queryset, '"cnpj" = %s', ('89.765.309/1158-38',))
+
+    def test_exact_keeps_invalid_raw_string(self):
+        self.assertQuery(DefaultCPF.objects.filter(cpf='invalid'), '"cpf" = %s', ('invalid',))
+
+    def test_in_normalizes_and_deduplicates(self):
+        queryset = DefaultCPF.objects.filter(cpf__in=[
+            '012.345.678-90', '01234567890', '000.000.001-91', None, 'invalid', '00000000191',
+        ])
+        self.assertQuery(
+            queryset, '"cpf" IN (%s, %s, %s)', ('01234567890', '00000000191', 'invalid'),
+        )
+
+    def test_in_accepts_subquery(self):
+        DefaultCPF.objects.create(cpf='01234567890')
+        queryset = DefaultCPF.objects.filter(
+            cpf__in=DefaultCPF.objects.values('cpf')
+        )
+        self.assertEqual(queryset.count(), 1)
+
+    def test_in_with_int_raises(self):
+        msg = "Can't convert int to CPF."
+        with self.assertRaisesMessage(TypeError, msg):
+            DefaultCPF.objects.filter(cpf__in=[123]).exists()
+
+
+class DocumentForm(forms.Form):
+    cpf = CPFForm()
+    cnpj = CNPJForm(required=False)
+    pis = PISForm(required=False)
+
+
+class DocumentFormSet(DocumentFormSetMixin, forms.BaseFormSet):
+    pass
+
+
+class DocumentFormFieldTest(TestCase):
+    def test_clean_valid_value(self):
+        self.assertEqual(CPFForm().clean('012.345.678-90'), CPF('01234567890'))
+        self.assertEqual(CNPJForm().clean('89765309115838'), CNPJ('89765309115838'))
+
+    def test_clean_invalid_value(self):
+        with self.assertRaisesMessage(ValidationError, 'Enter a valid cpf number'):
+            CPFForm().clean('12312312312')
+
+    def test_value_is_validated_once(self):
+        with mock.patch.object(CPF_SPEC, 'check', wraps=CPF_SPEC.check) as check:
+            CPFForm().clean('012.345.678-90')
+        self.assertEqual(check.call_count, 1)
+
+    def test_formset_parses_repeated_values_once(self):
+        formset_class = forms.formset_factory(DocumentForm, formset=DocumentFormSet, extra=0)
+        data = {'form-TOTAL_FORMS': '3', 'form-INITIAL_FORMS': '0'}
+        for i, cpf in enumerate(['012.345.678-90', '01234567890', '012.345.678-90']):
+            data['form-%d-cpf' % i] = cpf
+
+        with mock.patch.object(CPF_SPEC, 'check', wraps=CPF_SPEC.check) as check:
+            formset = formset_class(data)
+            self.assertTrue(formset.is_valid())
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(
+            [form.cleaned_data['cpf'] for form in formset],
+            [CPF('01234567890')] * 3,
+        )
+
+    def test_formset_parses_other_documents_once(self):
+        formset_class = forms.formset_factory(DocumentForm, formset=DocumentFormSet, extra=0)
+        data = {'form-TOTAL_FORMS': '3', 'form-INITIAL_FORMS': '0'}
+        for i in range(3):
+            data['form-%d-cpf' % i] = '01234567890'
+            data['form-%d-pis' % i] = '120.56412.54-5'
+
+        with mock.patch.object(PIS_SPEC, 'check', wraps=PIS_SPEC.check) as check:
+            formset = formset_class(data)
+            self.assertTrue(formset.is_valid())
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual([form.cleaned_data['pis'] for form in formset], [PIS('12056412545')] * 3)
+
+    def test_formset_reports_invalid_rows(self):
+        formset_class = forms.formset_factory(DocumentForm, formset=DocumentFormSet, extra=0)
+        formset = formset_class({
+            'form-TOTAL_FORMS': '2', 'form-INITIAL_FORMS': '0',
+            'form-0-cpf': '01234567890', 'form-1-cpf': '01234567890', 'form-1-cnpj': 'invalid',
+        })
+
+        self.assertFalse(formset.is_valid())
+        self.assertEqual(formset.errors[0], {})
+        self.assertIn('cnpj', formset.errors[1])
+
+
+class ValidatorTest(TestCase):
+    def test_check_cpf_status_codes(self):
+        self.assertEqual(check_cpf('012.345.678-90'), validators.VALID)
+        self.assertEqual(check_cpf(1.0), validators.INVALID_TYPE)
+        self.assertEqual(check_cpf('123456789012'), validators.INVALID_LENGTH)
+        self.assertEqual(check_cpf('111.111.111-11'), validators.REPEATED_DIGITS)
+        self.assertEqual(check_cpf('12312312312'), validators.INVALID_CHECK_DIGITS)
+
+    def test_check_cnpj_status_codes(self):
+        self.assertEqual(check_cnpj('89.765.309/1158-38'), validators.VALID)
+        self.assertEqual(check_cnpj(None), validators.INVALID_TYPE)
+        self.assertEqual(check_cnpj('0' * 14), validators.REPEATED_DIGITS)
+        self.assertEqual(check_cnpj('12345678901234'), validators.INVALID_CHECK_DIGITS)
+
+    def test_validation_error_is_structured(self):
+        with self.assertRaises(ValidationError) as context:
+            validate_cpf('12312312312')
+
+        error = context.exception
+        self.assertEqual(error.code, 'invalid')
+        self.assertEqual(error.params, {'value': '12312312312', 'reason': validators.INVALID_CHECK_DIGITS})
+        self.assertIs(error.message, validators.CPF_INVALID_MESSAGE)
+        self.assertEqual(error.messages, ['(12312312312) is not valid cpf.'])
+
+    def test_validation_error_for_invalid_document_object(self):
+        with self.assertRaises(ValidationError) as context:
+            validate_cnpj(CNPJ('invalid'))
+        self.assertEqual(context.exception.params['reason'], validators.REPEATED_DIGITS)
+        self.assertEqual(context.exception.messages, ['(invalid) is not valid cnpj.'])
+
+
+class CoreModuleTest(TestCase):
+    def test_core_does_not_import_django(self):
+        code = (
+            'import sys, django_cpf_cnpj.core as core; '
+            'assert core.CPF("012.345.678-90").is_valid(); '
+            'assert str(core.CNPJ("89.765.309/1158-38")) == "89765309115838"; '
+            'assert not [m for m in sys.modules if m == "django" or m.startswith("django.")]'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        env.pop('DJANGO_SETTINGS_MODULE', None)
+        subprocess.run([sys.executable, '-c', code], check=True, env=env)
+
+    def test_django_modules_reexport_core(self):
+        from django_cpf_cnpj import core, cpf, cnpj
+        self.assertIs(cpf.CPF, core.CPF)
+        self.assertIs(cnpj.cnpj_to_python, core.cnpj_to_python)
+        self.assertIs(validators.is_valid_cpf, core.is_valid_cpf)
+
+    @override_settings(CPF_MASKED=True)
+    def test_core_reads_masked_setting_when_django_is_configured(self):
+        self.assertEqual(str(CPF('01234567890')), '012.345.678-90')
+
+
+class PlainCPF(CPF):
+    """CPF pickled through the default __dict__ protocol."""
+    __reduce__ = object.__reduce__
+
+
+class SerializationTest(TestCase):
+    def test_pickle_valid_document(self):
+        cpf = CPF('012.345.678-90')
+        restored = pickle.loads(pickle.dumps(cpf))
+
+        self.assertEqual(restored, cpf)
+        self.assertEqual(restored.number, '01234567890')
+        self.assertTrue(restored.is_valid())
+
+    def test_pickle_invalid_document_keeps_raw_input(self):
+        for raw_input in ('invalid', 123):
+            restored = pickle.loads(pickle.dumps(CNPJ(raw_input)))
+            self.assertEqual(restored.raw_input, raw_input)
+            self.assertFalse(restored.is_valid())
+
+    def test_pickle_is_compact(self):
+        numbers = [CPF.random_generator() for _ in range(100)]
+        compact = len(pickle.dumps([CPF(n) for n in numbers]))
+        plain = len(pickle.dumps([PlainCPF(n) for n in numbers]))
+        self.assertLess(compact * 2, plain)
+
+    def test_encode_and_decode(self):
+        documents = [CNPJ('89.765.309/1158-38'), CNPJ('invalid'), CNPJ('00000000000191')]
+        data = encode_documents(documents, document_class=CNPJ)
+
+        self.assertEqual(len(data), 24 + 8 * 3 + 4 + len('invalid'))
+        decoded = decode_documents(data)
+        self.assertEqual(decoded, documents)
+        self.assertEqual(decoded[1].raw_input, 'invalid')
+
+    def test_encode_rejects_other_types(self):
+        with self.assertRaisesMessage(TypeError, "Can't encode str as CPF."):
+            encode_documents(['01234567890'])
+
+
+class BlockingBackend(StubRegistryBackend):
+    def __init__(self, records):
+        super().__init__(records)
+        self.release = threading.Event()
+
+    def fetch(self, document):
+        self.release.wait(5)
+        return super().fetch(document)
+
+
+class FailingBackend(StubRegistryBackend):
+    def fetch(self, document):
+        super().fetch(document)
+        raise ConnectionError('registry is down')
+
+
+class DocumentEnricherTest(TestCase):
+    records = {'01234567890': {'status': 'active'}}
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tiers(self):
+        backend = StubRegistryBackend(self.records)
+        enricher = DocumentEnricher(backend)
+
+        self.assertEqual(enricher.lookup('012.345.678-90'), {'status': 'active'})
+        self.assertEqual(enricher.lookup(CPF('01234567890')), {'status': 'active'})
+        # A second process shares the Django cache but not the LRU.
+        other = DocumentEnricher(backend)
+        self.assertEqual(other.lookup('01234567890'), {'status': 'active'})
+
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(enricher.stats.upstream_calls, 1)
+        self.assertEqual(enricher.stats.local_hits, 1)
+        self.assertEqual(other.stats.cache_hits, 1)
+        self.assertEqual(enricher.stats.hit_rate, 0.5)
+
+    def test_negative_caching(self):
+        backend = StubRegistryBackend(self.records)
+        enricher = DocumentEnricher(backend)
+
+        self.assertIsNone(enricher.lookup('00000000191'))
+        self.assertIsNone(DocumentEnricher(backend).lookup('00000000191'))
+        self.assertEqual(backend.calls, 1)
+
+    def test_expired_entries_are_fetched_again(self):
+        backend = StubRegistryBackend(self.records)
+        enricher = DocumentEnricher(backend, ttl=0.01, local_ttl=0.01)
+        enricher.lookup('01234567890')
+        cache.clear()
+        enricher.local.set(enricher.make_key(CPF('01234567890')), {}, -1)
+
+        enricher.lookup('01234567890')
+        self.assertEqual(backend.calls, 2)
+
+    def test_errors_are_not_cached(self):
+        backend = FailingBackend()
+        enricher = DocumentEnricher(backend)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                enricher.lookup('01234567890')
+        self.assertEqual(backend.calls, 2)
+        self.assertEqual(enricher.stats.errors, 2)
+
+    def test_invalid_document_raises(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid cnpj'):
+            DocumentEnricher(StubRegistryBackend()).lookup('invalid', document_class=CNPJ)
+
+    def test_concurrent_lookups_are_coalesced(self):
+        backend = BlockingBackend(self.records)
+        enricher = DocumentEnricher(backend)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(enricher.lookup('01234567890')))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while enricher.stats.coalesced < 4 and any(t.is_alive() for t in threads):
+            threading.Event().wait(0.001)
+        backend.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [{'status': 'active'}] * 5)
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(enricher.stats.coalesced, 4)
+
+    def test_late_leader_reads_the_cache(self):
+        backend = StubRegistryBackend(self.records)
+        enricher = DocumentEnricher(backend)
+        document = CPF('01234567890')
+        enricher.lookup(document)
+
+        # A thread that missed the caches just before the first leader
+        # finished becomes leader of a new call.
+        self.assertEqual(enricher._fetch(enricher.make_key(document), document), {'status': 'active'})
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(enricher._in_flight, {})
+
+    @override_settings(CPF_CNPJ_REGISTRY_BACKEND='django_cpf_cnpj.enrichment.StubRegistryBackend')
+    def test_backend_from_settings(self):
+        self.assertIsInstance(DocumentEnricher().backend, StubRegistryBackend)
+
+    def test_backend_setting_missing(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'CPF_CNPJ_REGISTRY_BACKEND'):
+            DocumentEnricher()
+
+
+class BulkEnrichmentTest(TestCase):
+    def test_fiscal_region_annotation(self):
+        insert_raw(NullableCPF, 'cpf', ['01234567890', '000.000.008-68', None, 'invalid'])
+
+        rows = list(
+            annotate_fiscal_region(NullableCPF.objects.order_by('pk'))
+            .values_list('fiscal_region_shorted', 'fiscal_region_name', 'fiscal_region_jurisdiction')
+        )
+        self.assertEqual(rows, [
+            ('RF8', '8.ª Região Fiscal', 'SP'),
+            ('RF8', '8.ª Região Fiscal', 'SP'),
+            (None, None, None),
+            (None, None, None),
+        ])
+
+    def test_annotation_matches_get_fiscal_region(self):
+        cpfs = [CPF.random_generator() for _ in range(20)]
+        for cpf in cpfs:
+            DefaultCPF.objects.create(cpf=cpf)
+
+        queryset = DocumentQuerySet(model=DefaultCPF).with_fiscal_region().order_by('pk')
+        for obj, cpf in zip(queryset, cpfs):
+            region = CPF(cpf).get_fiscal_region()
+            self.assertEqual(obj.fiscal_region_name, region['name'])
+            self.assertEqual(obj.fiscal_region_jurisdiction, ','.join(region['jurisdiction']))
+
+    def test_cnpj_branch_annotation(self):
+        insert_raw(DefaultCNPJ, 'cnpj', ['89765309115838', '00.000.000/0001-91'])
+
+        rows = list(
+            DocumentQuerySet(model=DefaultCNPJ).with_cnpj_branch().order_by('pk')
+            .values_list('cnpj_root', 'cnpj_branch', 'cnpj_is_headquarters')
+        )
+        self.assertEqual(rows, [('89765309', '1158', False), ('00000000', '0001', True)])
+
+    def test_cnpj_branch_methods(self):
+        cnpj = CNPJ('00.000.000/0001-91')
+        self.assertEqual(cnpj.get_root(), '00000000')
+        self.assertEqual(cnpj.get_branch(), '0001')
+        self.assertTrue(cnpj.is_headquarters())
+        self.assertIsNone(CNPJ('invalid').get_root())
+
+    def test_fiscal_region_map_is_read_only(self):
+        region = CPF('01234567890').get_fiscal_region()
+        with self.assertRaises(TypeError):
+            region['name'] = 'changed'
+        self.assertEqual(region['jurisdiction'], ('SP',))
+
+
+class GeneratorTest(TestCase):
+    def test_check_digit_tables_match_reference(self):
+        for base in (0, 1, 123456789, 999999999, 100000000, 5555):
+            self.assertEqual(cpf_check_digits(base), last_digits_cpf('%09dxx' % base))
+        for base in (0, 1, 897653091158, 999999999999, 100000000000):
+            self.assertEqual(cnpj_check_digits(base), last_digits_cnpj('%012d' % base))
+
+    def test_generators(self):
+        self.assertEqual(cpf_generator('000.001'), '00000000191')
+        self.assertEqual(cpf_generator('999.999.998'), '99999999808')
+        self.assertIsNone(cpf_generator('111.111.111'))
+        self.assertEqual(cnpj_generator('000.001'), '00000000000191')
+        self.assertEqual(cnpj_generator('89.765.309/1158'), '89765309115838')
+
+    def test_iter_cpfs_covers_a_range(self):
+        cpfs = list(iter_cpfs(998, 2003))
+        self.assertEqual(cpfs, [cpf_generator(base) for base in range(998, 2003)])
+        self.assertTrue(all(is_valid_cpf(cpf) for cpf in cpfs))
+
+    def test_iter_skips_repeated_digits(self):
+        self.assertEqual(list(iter_cpfs(111111111, 111111112)), [])
+        self.assertEqual(list(iter_cpfs(0, 2)), ['00000000191'])
+
+    def test_iter_cnpjs(self):
+        cnpjs = list(iter_cnpjs(897653091150, 897653091160))
+        self.assertEqual(len(cnpjs), 10)
+        self.assertIn('89765309115838', cnpjs)
+        self.assertTrue(all(is_valid_cnpj(cnpj) for cnpj in cnpjs))
+
+
+@skipUnless(numpy, 'numpy is not installed')
+class VectorizedGeneratorTest(TestCase):
+    def test_numbers_are_valid(self):
+        from django_cpf_cnpj.vectorized import generate_numbers, format_numbers
+
+        cpfs = format_numbers(generate_numbers(2000, seed=1))
+        self.assertTrue(all(is_valid_cpf(cpf) for cpf in cpfs))
+
+        cnpjs = format_numbers(generate_numbers(2000, CNPJ, seed=1), CNPJ, masked=True)
+        self.assertTrue(all(is_valid_cnpj(cnpj) for cnpj in cnpjs))
+        self.assertEqual(len(cnpjs[0]), 18)
+
+    def test_matches_table_generator(self):
+        from django_cpf_cnpj.vectorized import complete_numbers
+
+        bases = numpy.arange(1, 5000, 7, dtype=numpy.int64)
+        self.assertEqual(
+            ['%011d' % n for n in complete_numbers(bases).tolist()],
+            [cpf_generator(base) for base in bases.tolist()],
+        )
+        bases = bases * 99991
+        self.assertEqual(
+            ['%014d' % n for n in complete_numbers(bases, CNPJ).tolist()],
+            [cnpj_generator(base) for base in bases.tolist()],
+        )
+
+    def test_seed_is_reproducible(self):
+        from django_cpf_cnpj.vectorized import generate_numbers
+
+        self.assertEqual(
+            generate_numbers(100, seed=42).tolist(), generate_numbers(100, seed=42).tolist()
+        )
+
+    def test_unique_across_chunks(self):
+        from django_cpf_cnpj.vectorized import iter_number_chunks
+
+        chunks = list(iter_number_chunks(5000, CNPJ, seed=7, unique=True, chunk_size=1000))
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(len(numpy.unique(numpy.concatenate(chunks))), 5000)
+
+    def test_csv_chunks(self):
+        from django_cpf_cnpj.vectorized import iter_csv_chunks
+
+        chunks = list(iter_csv_chunks(5, seed=1, chunk_size=3))
+        lines = ''.join(chunks).splitlines()
+        self.assertEqual(lines[0], 'cpf')
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(all(is_valid_cpf(line) for line in lines[1:]))
+
+    def test_model_instances(self):
+        from django_cpf_cnpj.vectorized import iter_model_instances
+
+        for batch in iter_model_instances(DefaultCPF, 'cpf', 250, seed=3, chunk_size=100):
+            DefaultCPF.objects.bulk_create(batch)
+
+        self.assertEqual(DefaultCPF.objects.count(), 250)
+        self.assertTrue(all(
+            is_valid_cpf(cpf) for cpf in DefaultCPF.objects.values_list('cpf', flat=True)
+        ))
+
+
+class SeedDocumentsTest(TestCase):
+    def test_invalid_fraction(self):
+        documents = list(iter_seed_documents(CPF, 1000, invalid_fraction=0.2, seed=1))
+        invalid = [d for d in documents if isinstance(d, str)]
+
+        self.assertTrue(100 < len(invalid) < 300)
+        self.assertFalse(any(is_valid_cpf(value) for value in invalid))
+        self.assertTrue(all(is_valid_cpf(d.number) for d in documents if not isinstance(d, str)))
+
+    def test_seed_is_reproducible(self):
+        first = [str(d) for d in iter_seed_documents(CNPJ, 20, 0.5, seed=9)]
+        second = [str(d) for d in iter_seed_documents(CNPJ, 20, 0.5, seed=9)]
+        self.assertEqual(first, second)
+
+    def test_bulk_create_and_raw(self):
+        for raw in (False, True):
+            DefaultCNPJ.objects.all().delete()
+            seed_documents(DefaultCNPJ, 'cnpj', 250, invalid_fraction=0.1, seed=2, batch_size=100, raw=raw)
+            counts = DocumentAuditor(DefaultCNPJ, 'cnpj').run(duplicates=False)
+            self.assertEqual(counts['scanned'], 250)
+            self.assertEqual(counts['non_canonical'], 0)
+            self.assertGreater(counts['invalid'], 0)
+
+    @override_settings(CPF_MASKED=True)
+    def test_raw_insert_stores_canonical_form(self):
+        seed_documents(DefaultCPF, 'cpf', 10, seed=3, raw=True)
+        self.assertTrue(all(
+            len(value) == 14 for value in DefaultCPF.objects.values_list('cpf', flat=True)
+        ))
+
+    def test_command(self):
+        stderr = io.StringIO()
+        call_command('seed_documents', 'tests.UniqueCPF.cpf', count=30, seed=4, stderr=stderr)
+        self.assertIn('Inserted 30 rows', stderr.getvalue())
+        self.assertEqual(UniqueCPF.objects.count(), 30)
+
+
+class ParseCacheTest(TestCase):
+    def test_repeated_parses_are_shared(self):
+        with parse_cache() as cache:
+            first = cpf_to_python('29061193000')
+            self.assertIs(cpf_to_python('29061193000'), first)
+            self.assertIsNot(cnpj_to_python('29061193000'), first)
+            self.assertIs(TestCPFModel(cpf='29061193000').cpf, first)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 2)
+
+    def test_cache_is_scoped(self):
+        with parse_cache():
+            first = cpf_to_python('29061193000')
+        self.assertIsNot(cpf_to_python('29061193000'), first)
+
+    def test_max_size(self):
+        with parse_cache(max_size=1) as cache:
+            cpf_to_python('29061193000')
+            cpf_to_python('99178291004')
+            cpf_to_python('99178291004')
+        self.assertEqual(len(cache.documents), 1)
+        self.assertEqual(cache.hits, 0)
+
+    def test_middleware(self):
+        def view(request):
+            cpf_to_python('29061193000')
+            cpf_to_python('29061193000')
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        with self.assertLogs('django_cpf_cnpj', 'DEBUG') as logs:
+            ParseCacheMiddleware(view)(request)
+        self.assertEqual(request.document_parse_cache.hits, 1)
+        self.assertIn('saved 1 of 2', logs.output[0])
+
+    def test_async_middleware(self):
+        async def view(request):
+            cnpj_to_python('04.170.575/0001-03')
+            cnpj_to_python('04.170.575/0001-03')
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        asyncio.run(ParseCacheMiddleware(view)(request))
+        self.assertEqual(request.document_parse_cache.hits, 1)
+
+    def test_thread_local_fallback(self):
+        # Used instead of ContextVar on Python 3.6.
+        local = _LocalVar()
+        token = local.set('cache')
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(local.get()))
+        thread.start()
+        thread.join()
+        self.assertEqual((local.get(), seen), ('cache', [None]))
+        local.reset(token)
+        self.assertIsNone(local.get())
+
+
+class DocumentFunctionsTest(TestCase):
+    cpfs = ['29061193000', '290.611.930-00', '29061193001', '11111111111', 'abc', '', '9917829100',
+            '123456789012345', '2906119300a', CPF(cpf_generator('12345678')).format(),
+            'CPF: 290.611.930-01', '290,611,930-01', '290_611_930_01']
+    cnpjs = ['04170575000103', '04.170.575/0001-03', '04170575000104', '00000000000000', '4170575000103',
+             '04.170.575/0001-0x', CNPJ(cnpj_generator('1234567')).format()]
+
+    def test_is_valid(self):
+        insert_raw(NullableCPF, 'cpf', self.cpfs + [None])
+        insert_raw(NullableCNPJ, 'cnpj', self.cnpjs + [None])
+
+        for model, name, function, check in ((NullableCPF, 'cpf', IsValidCPF, is_valid_cpf),
+                                             (NullableCNPJ, 'cnpj', IsValidCNPJ, is_valid_cnpj)):
+            rows = model.objects.annotate(
+                registered=function(name), fallback=function(name).fallback(),
+            ).values_list(name, 'registered', 'fallback')
+            for value, registered, fallback in rows:
+                expected = None if value is None else check(value)
+                self.assertEqual((registered, fallback), (expected, expected), value)
+
+            self.assertEqual(
+                model.objects.annotate(valid=function(name)).filter(valid=True).count(),
+                len([value for value in getattr(self, name + 's') if check(value)]),
+            )
+
+    def test_normalize(self):
+        insert_raw(NullableCNPJ, 'cnpj', self.cnpjs + [None])
+        field = NullableCNPJ._meta.get_field('cnpj')
+
+        for masked in (False, True):
+            rows = NullableCNPJ.objects.annotate(
+                registered=NormalizeCNPJ('cnpj', masked=masked),
+                fallback=NormalizeCNPJ('cnpj', masked=masked).fallback(),
+            ).values_list('cnpj', 'registered', 'fallback')
+            for value, registered, fallback in rows:
+                expected = value
+                if value is not None and is_valid_cnpj(value):
+                    expected = CNPJ(value).format() if masked else CNPJ(value).number
+                self.assertEqual((registered, fallback), (expected, expected), value)
+
+        NullableCNPJ.objects.update(cnpj=NormalizeCNPJ('cnpj', masked=field.is_masked))
+        counts = DocumentAuditor(NullableCNPJ, 'cnpj').run(duplicates=False)
+        self.assertEqual(counts['non_canonical'], 0)
+
+    def test_update_with_fallback(self):
+        insert_raw(NullableCPF, 'cpf', self.cpfs)
+        NullableCPF.objects.update(cpf=NormalizeCPF('cpf', masked=True).fallback())
+        self.assertEqual(
+            sorted(
+                NullableCPF.objects.annotate(valid=IsValidCPF('cpf')).filter(valid=True).values_list('cpf', flat=True)
+            ),
+            sorted(CPF(value).format() for value in self.cpfs if is_valid_cpf(value)),
+        )
+
+    def test_digits_only_sql(self):
+        query = NullableCPF.objects.all().query
+        compiler = query.get_compiler('default')
+        expression = DigitsOnly('cpf').resolve_expression(query)
+
+        sql, params = expression.as_postgresql(compiler, connection)
+        self.assertIn("REGEXP_REPLACE(", sql)
+        self.assertIn("'[^0-9]', '', 'g')", sql)
+        sql, params = expression.as_mysql(compiler, connection)
+        self.assertIn("'[^0-9]', '')", sql)
+        # Backends without REGEXP_REPLACE only drop the mask characters.
+        sql, params = expression.as_sql(compiler, connection)
+        self.assertEqual(sql.count('REPLACE('), 4)
+
+
+class DocumentShardRouterTest(TestCase):
+    databases = {'default', 'shard_0', 'shard_1', 'shard_2'}
+
+    def test_save_routes_by_document(self):
+        cpfs = [cpf for cpf in iter_cpfs(100, 130)]
+        for cpf in cpfs:
+            ShardedCPF(cpf=cpf).save()
+
+        counts = [ShardedCPF.objects.using(alias).count() for alias in ('shard_0', 'shard_1', 'shard_2')]
+        self.assertEqual(sum(counts), len(cpfs))
+        self.assertTrue(all(counts))
+        self.assertNotIn('tests_shardedcpf', connection.introspection.table_names())
+
+        for cpf in cpfs:
+            document = using_shard(ShardedCPF, CPF(cpf).format()).get(cpf=cpf)
+            self.assertEqual(document._state.db, shard_for(ShardedCPF, cpf))
+
+    def test_saved_instance_stays_on_its_shard(self):
+        obj = ShardedCPF(cpf='29061193001')
+        obj.save()
+        obj.name = 'renamed'
+        obj.save()
+        self.assertEqual(using_shard(ShardedCPF, '29061193001').get().name, 'renamed')
+
+    def test_cnpj_branches_share_a_shard(self):
+        branches = [cnpj_generator('04170575%04d' % branch) for branch in range(1, 20)]
+        self.assertEqual(len({shard_for(ShardedCNPJ, cnpj) for cnpj in branches}), 1)
+
+    def test_cnpj_root_routes_invalid_values(self):
+        alias = shard_for(ShardedCNPJ, 'invalid')
+        self.assertEqual(alias, shard_for(ShardedCNPJ, 'invalid'))
+        ShardedCNPJ(cnpj='invalid').save()
+        self.assertEqual(ShardedCNPJ.objects.using(alias).get().cnpj.raw_input, 'invalid')
+
+    @override_settings(CPF_CNPJ_SHARD_KEYS={'tests.ShardedCPF': ('cpf', 'fiscal_region')})
+    def test_fiscal_region_strategy(self):
+        self.assertEqual(shard_for(ShardedCPF, '29061193001'), 'shard_0')
+        self.assertEqual(shard_for(ShardedCPF, cpf_generator('123456784')), 'shard_1')
+
+    def test_scatter_gather(self):
+        cpfs = list(iter_cpfs(500, 540))
+        created = bulk_create_in_shards(ShardedCPF, [ShardedCPF(cpf=cpf) for cpf in cpfs])
+        self.assertEqual(len(created), len(cpfs))
+
+        wanted = cpfs[::3] + ['99178291004']
+        with self.assertNumQueries(1, using='shard_0'), self.assertNumQueries(1, using='shard_1'):
+            found = list(filter_in_shards(ShardedCPF, wanted))
+        self.assertEqual(sorted(obj.cpf.number for obj in found), sorted(cpfs[::3]))
+
+    def test_unsharded_model(self):
+        with self.assertRaises(ValueError):
+            shard_for(DefaultCPF, '29061193001')
+        DefaultCPF.objects.create(cpf='29061193001')
+        self.assertEqual(DefaultCPF.objects.get()._state.db, 'default')
+
+
+@skipUnless(cryptography, 'cryptography is not installed')
+class EncryptedFieldTest(TestCase):
+    def test_round_trip(self):
+        EncryptedCPF.objects.create(cpf='290.611.930-01')
+        EncryptedCPF.objects.create(cpf='12345')
+        EncryptedCPF.objects.create(cpf=None)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT cpf FROM tests_encryptedcpf WHERE cpf IS NOT NULL')
+            stored = [row[0] for row in cursor.fetchall()]
+        self.assertFalse(any('29061193001' in value or '12345' in value for value in stored))
+
+        values = [obj.cpf for obj in EncryptedCPF.objects.order_by('pk')]
+        self.assertIsInstance(values[0], CPF)
+        self.assertEqual(values[0].number, '29061193001')
+        self.assertFalse(values[1].is_valid())
+        self.assertIsNone(values[2])
+
+    def test_lookups_use_blind_index(self):
+        obj = EncryptedCNPJ.objects.create(cnpj='04170575000103')
+        EncryptedCNPJ.objects.create(cnpj=cnpj_generator('1234567'))
+        self.assertEqual(obj.cnpj_index, blind_index(CNPJ('04170575000103')))
+
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(EncryptedCNPJ.objects.get(cnpj='04.170.575/0001-03'), obj)
+        self.assertIn('cnpj_index', queries.captured_queries[0]['sql'])
+
+        self.assertEqual(EncryptedCNPJ.objects.filter(cnpj__in=['04170575000103', '99178291004']).count(), 1)
+        self.assertFalse(EncryptedCNPJ.objects.filter(cnpj='04170575000104').exists())
+
+    def test_update_needs_blind_index(self):
+        obj = EncryptedCPF.objects.create(cpf='29061193001')
+
+        with self.assertRaisesMessage(ValueError, 'cpf_index'), transaction.atomic():
+            EncryptedCPF.objects.update(cpf='99178291004')
+        with self.assertRaisesMessage(ValueError, 'cpf_index'), transaction.atomic():
+            EncryptedCPF.objects.update(cpf=None)
+        obj.cpf = CPF('99178291004')
+        with self.assertRaisesMessage(ValueError, 'cpf_index'), transaction.atomic():
+            EncryptedCPF.objects.bulk_update([obj], ['cpf'])
+        with self.assertRaisesMessage(ValueError, 'cpf_index'), transaction.atomic():
+            obj.save(update_fields=['cpf'])
+        self.assertEqual(EncryptedCPF.objects.get(cpf='29061193001'), obj)
+
+        EncryptedCPF.objects.update(cpf='99178291004', cpf_index=blind_index(CPF('99178291004')))
+        self.assertEqual(EncryptedCPF.objects.get(cpf='99178291004'), obj)
+        obj.cpf = CPF('29061193001')
+        obj.save(update_fields=['cpf', 'cpf_index'])
+        self.assertEqual(EncryptedCPF.objects.get(cpf='29061193001'), obj)
+
+    def test_rotate_keys(self):
+        old = EncryptedCPF.objects.create(cpf='29061193001')
+        new_keys = {
+            'CPF_CNPJ_ENCRYPTION_KEYS': ['kkWYTNuPTCNhf3W7G8-e3sFxZgQmA4T7Nbm04sOmTLs=',
+                                         '0xYNcOQf0RDrgRi4nSVjW_L5G1x3bqUBFrlS06W1QHo='],
+            'CPF_CNPJ_BLIND_INDEX_KEYS': ['new-blind-index-key', 'blind-index-key'],
+        }
+        with self.settings(**new_keys):
+            # Rows indexed with the old key still match before rotation.
+            self.assertEqual(EncryptedCPF.objects.get(cpf='29061193001'), old)
+            self.assertEqual(rotate_keys(EncryptedCPF, 'cpf', batch_size=1), 1)
+            self.assertEqual(
+                EncryptedCPF.objects.get().cpf_index, blind_index(CPF('29061193001'), b'new-blind-index-key'),
+            )
+
+        with self.settings(CPF_CNPJ_ENCRYPTION_KEYS=new_keys['CPF_CNPJ_ENCRYPTION_KEYS'][:1],
+                           CPF_CNPJ_BLIND_INDEX_KEYS=new_keys['CPF_CNPJ_BLIND_INDEX_KEYS'][:1]):
+            self.assertEqual(EncryptedCPF.objects.get(cpf='29061193001').cpf.number, '29061193001')
+
+
+class LazyDescriptorTest(TestCase):
+    def test_parsed_on_first_access(self):
+        LazyCPF.objects.create(cpf='290.611.930-01', name='a')
+        obj = LazyCPF.objects.get()
+        self.assertEqual(obj.__dict__['cpf'], '29061193001')
+
+        cpf = obj.cpf
+        self.assertIsInstance(cpf, CPF)
+        self.assertIs(obj.cpf, cpf)
+        self.assertEqual(obj.__dict__['cpf'], cpf)
+
+    def test_unread_rows_are_not_parsed(self):
+        LazyCPF.objects.bulk_create([LazyCPF(cpf='29061193001') for _ in range(5)])
+        with mock.patch('django_cpf_cnpj.core.CPF.from_string') as from_string:
+            self.assertEqual([obj.name for obj in LazyCPF.objects.all()], [''] * 5)
+        from_string.assert_not_called()
+
+    def test_assignment(self):
+        obj = LazyCPF(cpf='29061193001')
+        self.assertEqual(obj.cpf.format(), '290.611.930-01')
+        obj.cpf = CPF('99178291004')
+        self.assertIsInstance(obj.__dict__['cpf'], CPF)
+        obj.cpf = None
+        self.assertIsNone(obj.cpf)
+        with self.assertRaises(TypeError):
+            obj.cpf = 29061193001
+
+    def test_save_and_refresh(self):
+        obj = LazyCNPJ.objects.create(cnpj='04170575000103')
+        obj.refresh_from_db()
+        self.assertEqual(obj.__dict__['cnpj'], '04.170.575/0001-03')
+        self.assertEqual(obj.cnpj, CNPJ('04170575000103'))
+
+        obj.cnpj = '12345'
+        obj.save()
+        obj = LazyCNPJ.objects.get(cnpj='12345')
+        self.assertFalse(obj.cnpj.is_valid())
+
+        deferred = LazyCNPJ.objects.defer('cnpj').get()
+        self.assertEqual(deferred.cnpj.raw_input, '12345')
+
+    def test_deconstruct(self):
+        name, path, args, kwargs = LazyCNPJ._meta.get_field('cnpj').deconstruct()
+        self.assertEqual(kwargs, {'masked': True, 'lazy': True, 'max_length': 18})
+
+
+class IntegerAPITest(TestCase):
+    def test_matches_string_validation(self):
+        cpfs = list(range(29061193000, 29061193100)) + [0, 11111111111, 9917829100, 10 ** 11 + 1]
+        self.assertEqual(is_valid_cpf_int(cpfs), [is_valid_cpf(number) for number in cpfs])
+        cnpjs = list(range(4170575000000, 4170575000200)) + [0, 22222222222222, 10 ** 14]
+        self.assertEqual(is_valid_cnpj_int(cnpjs), [is_valid_cnpj(number) for number in cnpjs])
+        self.assertTrue(is_valid_cpf_int(29061193001))
+        self.assertFalse(is_valid_cnpj_int(-4170575000103))
+
+    @skipUnless(numpy, 'numpy is not installed')
+    def test_numpy_arrays(self):
+        numbers = numpy.arange(29061193000, 29061193010, dtype=numpy.int64)
+        valid = is_valid_cpf_int(numbers)
+        self.assertEqual(valid.dtype, numpy.bool_)
+        self.assertEqual(valid.tolist(), [is_valid_cpf(int(number)) for number in numbers])
+        self.assertTrue(is_valid_cpf_int(numbers[1]))
+        self.assertEqual([cpf.number for cpf in cpf_from_int(numbers[1:2])], ['29061193001'])
+
+    def test_from_int(self):
+        cpf = cpf_from_int(9917829100)
+        self.assertFalse(cpf.is_valid())
+        self.assertEqual(cpf.number, '09917829100')
+        self.assertEqual((str(cpf), len(cpf)), ('9917829100', 10))
+        self.assertEqual(len({cpf, cpf_from_int(9917829100)}), 1)
+        self.assertEqual(cpf, CPF('9917829100'))
+
+        cnpj = cnpj_from_int(4170575000103)
+        self.assertEqual(cnpj, CNPJ('04.170.575/0001-03'))
+        self.assertEqual(int(cnpj), 4170575000103)
+        self.assertEqual([c.to_int() for c in cnpj_from_int([4170575000103])], [4170575000103])
+
+        with self.assertRaises(ValueError):
+            cpf.to_int()
+        with self.assertRaises(TypeError):
+            cpf_from_int('29061193001')
+
+
+class ExtractTest(TestCase):
+    text = (
+        'Cliente 290.611.930-01, CNPJ 04170575000103; conta 1234567890123456 '
+        'e CPF 29061193000 (inválido), filial 04.170.575/0002-94\n99178291004x'
+    )
+
+    def test_find_documents(self):
+        found = [(type(d).__name__, d.number, self.text[start:end]) for d, start, end in find_documents(self.text)]
+        self.assertEqual(found, [
+            ('CPF', '29061193001', '290.611.930-01'),
+            ('CNPJ', '04170575000103', '04170575000103'),
+            ('CNPJ', '04170575000294', '04.170.575/0002-94'),
+        ])
+        self.assertEqual(
+            [d.number for d, _, _ in find_documents(self.text.encode(), document_classes=(CPF,))],
+            ['29061193001'],
+        )
+
+    def test_scan_file_chunk_boundaries(self):
+        data = (self.text * 50).encode()
+        expected = [(d.number, start, end) for d, start, end in find_documents(data)]
+        with tempfile.NamedTemporaryFile() as scanned_file:
+            scanned_file.write(data)
+            scanned_file.flush()
+            for chunk_size in (5, 17, 40, 1024):
+                for use_mmap in (True, False):
+                    scan = scan_file(scanned_file.name, chunk_size=chunk_size, use_mmap=use_mmap)
+                    found = [(d.number, start, end) for d, start, end in scan]
+                    self.assertEqual(found, expected, (chunk_size, use_mmap))
+                    self.assertEqual(scan.bytes_scanned, len(data))
+                    self.assertEqual(scan.matches, 150)
+                    self.assertGreater(scan.megabytes_per_second, 0)
+
+    def test_scan_empty_file(self):
+        with tempfile.NamedTemporaryFile() as scanned_file:
+            self.assertEqual(list(scan_file(scanned_file.name)), [])
+
+
+class RedactDocumentsFilterTest(TestCase):
+    def make_record(self, msg, args=()):
+        return logging.LogRecord('test', logging.INFO, __file__, 1, msg, args, None)
+
+    def test_redacts_message_and_args(self):
+        redact = RedactDocumentsFilter()
+        record = self.make_record('cpf %s, cnpj %s, order %d', ('290.611.930-01', CNPJ('04170575000103'), 12345))
+        self.assertTrue(redact.filter(record))
+        self.assertEqual(record.getMessage(), 'cpf ***.***.***-**, cnpj **************, order 12345')
+
+        record = self.make_record('user %(cpf)s', ({'cpf': '29061193001'},))
+        redact.filter(record)
+        self.assertEqual(record.getMessage(), 'user ***********')
+
+    def test_redacts_numbers(self):
+        redact = RedactDocumentsFilter()
+        record = self.make_record('cpf %s, %d, %s', (52998224725.0, 52998224725, -52998224725))
+        redact.filter(record)
+        self.assertEqual(record.getMessage(), 'cpf ***********.0, ***********, -***********')
+
+    def test_leaves_other_records_alone(self):
+        redact = RedactDocumentsFilter()
+        args = ('29061193000', 2.5)
+        record = self.make_record('invalid cpf %s costs %s', args)
+        redact.filter(record)
+        self.assertIs(record.args, args)
+
+        record = self.make_record('no digits here %s', ('at all',))
+        with mock.patch.object(record, 'getMessage') as get_message:
+            redact.filter(record)
+        get_message.assert_not_called()
+
+    def test_mask_options(self):
+        record = self.make_record('290.611.930-01 04.170.575/0001-03')
+        RedactDocumentsFilter(mask='#', keep_fiscal_region=True).filter(record)
+        self.assertEqual(record.getMessage(), '###.###.##0-## ##.###.###/####-##')
+
+        record = self.make_record('cpf 29061193001')
+        RedactDocumentsFilter(redact=lambda document, text: '<%s>' % type(document).__name__).filter(record)
+        self.assertEqual(record.getMessage(), 'cpf <CPF>')
+
+    def test_with_logger(self):
+        logger = logging.getLogger('django_cpf_cnpj.tests.redact')
+        redact = RedactDocumentsFilter()
+        logger.addFilter(redact)
+        try:
+            with self.assertLogs(logger) as logs:
+                logger.info('Signed up %s', '29061193001')
+        finally:
+            logger.removeFilter(redact)
+        self.assertEqual(logs.records[0].getMessage(), 'Signed up ***********')
+
+    def test_malformed_record(self):
+        record = self.make_record('value %d 123', ('abc',))
+        self.assertTrue(RedactDocumentsFilter().filter(record))
+        self.assertEqual((record.msg, record.args), ('value %d 123', ('abc',)))
+
+        # The formatting error reaches the handler, not the caller.
+        logger = logging.getLogger('django_cpf_cnpj.tests.malformed')
+        handler = logging.StreamHandler(io.StringIO())
+        logger.addFilter(RedactDocumentsFilter())
+        logger.addHandler(handler)
+        try:
+            with mock.patch.object(handler, 'handleError') as handle_error:
+                logger.error('value %d 123', 'abc')
+        finally:
+            logger.removeHandler(handler)
+            logger.filters.clear()
+        handle_error.assert_called_once()
+
+
+class DocumentImporterTest(TestCase):
+    rows = [
+        {'cpf': '290.611.930-01', 'name': 'a'},
+        {'cpf': '29061193000', 'name': 'invalid'},
+        {'cpf': '29061193001', 'name': 'repeated'},
+        {'cpf': cpf_generator('1'), 'name': 'existing'},
+        {'cpf': cpf_generator('2'), 'name': 'b'},
+        {'cpf': cpf_generator('3'), 'name': 'c'},
+    ]
+
+    def setUp(self):
+        ImportedCPF.objects.create(cpf=cpf_generator('1'), name='old')
+
+    def test_check(self):
+        importer = DocumentImporter(ImportedCPF, 'cpf', lookup_size=2)
+        with self.assertNumQueries(2):
+            issues = importer.check(self.rows)
+        self.assertEqual(issues, [
+            ImportIssue(1, '29061193000', 'invalid', ''),
+            ImportIssue(2, '29061193001', 'duplicate', 0),
+            ImportIssue(3, CPF(cpf_generator('1')).format(), 'existing', ''),
+        ])
+        self.assertEqual(ImportedCPF.objects.count(), 1)
+
+    def test_run(self):
+        counts = DocumentImporter(ImportedCPF, 'cpf').run(self.rows)
+        self.assertEqual(counts['created'], 3)
+        self.assertEqual(counts['existing'], 1)
+        self.assertEqual(ImportedCPF.objects.get(cpf=cpf_generator('1')).name, 'old')
+        self.assertEqual(ImportedCPF.objects.get(cpf='29061193001').name, 'a')
+
+    @skipUnlessDBFeature('supports_update_conflicts_with_target')
+    def test_upsert(self):
+        counts = DocumentImporter(ImportedCPF, 'cpf', update_fields=['name']).run(
+            [ImportedCPF(cpf=row['cpf'], name=row['name']) for row in self.rows]
+        )
+        self.assertEqual((counts['created'], counts['updated'], counts['existing']), (3, 1, 0))
+        self.assertEqual(ImportedCPF.objects.get(cpf=cpf_generator('1')).name, 'existing')
+        self.assertEqual(ImportedCPF.objects.count(), 4)
+
+
+def reference_check_digits(base, weights, complement=False):
+    # Straightforward digit-by-digit version of the weighted mod-11 sums.
+    digits = list(base)
+    for weight in weights:
+        remainder = sum(int(digit) * w for digit, w in zip(digits, weight)) % 11
+        if complement:
+            digits.append(str(0 if remainder < 2 else 11 - remainder))
+        else:
+            digits.append(str(remainder % 10))
+    return ''.join(digits[len(base):])
+
+
+def reference_titulo_eleitor(base):
+    digits = []
+    for total in (sum(int(base[i]) * (i + 2) for i in range(8)), None):
+        if total is None:
+            total = int(base[8]) * 7 + int(base[9]) * 8 + digits[0] * 9
+        remainder = total % 11
+        digits.append(1 if remainder == 0 and base[8:] in ('01', '02') else remainder % 10)
+    return '%d%d' % tuple(digits)
+
+
+def reference_cnh(base):
+    first = sum(int(base[i]) * (9 - i) for i in range(9)) % 11
+    second = sum(int(base[i]) * (i + 1) for i in range(9)) % 11
+    if first >= 10:
+        first, second = 0, second - 2
+    return '%d%d' % (first, second % 11 % 10)
+
+
+class CheckDigitEngineTest(TestCase):
+    bases = range(1, 10 ** 9, 9999991)
+
+    def test_cpf_cnpj_specs(self):
+        for base in self.bases:
+            self.assertEqual(
+                ''.join(map(str, CPF_SPEC.check_digits(base))),
+                reference_check_digits('%09d' % base, [range(10, 1, -1), range(11, 1, -1)], complement=True),
+            )
+            base = base * 997
+            self.assertEqual(
+                ''.join(map(str, CNPJ_SPEC.check_digits(base))),
+                reference_check_digits(
+                    '%012d' % base, [(5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2), (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2)],
+                    complement=True,
+                ),
+            )
+
+    def test_other_specs(self):
+        for base in self.bases:
+            pis = '%010d' % (base * 7)
+            reference = reference_check_digits(pis, [(3, 2, 9, 8, 7, 6, 5, 4, 3, 2)], complement=True)
+            self.assertEqual(PIS_SPEC.generate(pis), pis + reference)
+            self.assertEqual(RENAVAM_SPEC.generate(pis), pis + reference)
+
+            for state in ('01', '02', '%02d' % (base % 28 + 1)):
+                titulo = '%08d%s' % (base // 10, state)
+                self.assertEqual(TITULO_ELEITOR_SPEC.generate(titulo), titulo + reference_titulo_eleitor(titulo))
+
+            cnh = '%09d' % base
+            self.assertEqual(CNH_SPEC.generate(cnh), cnh + reference_cnh(cnh))
+
+    def test_iter_numbers(self):
+        for spec in (PIS_SPEC, TITULO_ELEITOR_SPEC, CNH_SPEC):
+            expected = [spec.generate(base) for base in range(998, 2003)]
+            self.assertEqual(list(spec.iter_numbers(998, 2003)), [number for number in expected if number])
+
+    def test_exceptions(self):
+        # São Paulo gives 1 for a remainder of 0.
+        self.assertEqual(TITULO_ELEITOR_SPEC.check_digits(1300000001), (1, 6))
+        self.assertEqual(TITULO_ELEITOR_SPEC.check_digits(1300000003), (0, 2))
+        # CNH takes 2 off the second sum after a first remainder of 10.
+        self.assertEqual(CNH_SPEC.check_digits(18), (0, 1))
+        self.assertEqual(reference_cnh('000000018'), '01')
+
+    def test_validation(self):
+        self.assertEqual(check_cnh('12345678900'), validators.VALID)
+        self.assertEqual(check_cnh('11111111111'), validators.REPEATED_DIGITS)
+        self.assertEqual(check_cnh('12345678901'), validators.INVALID_CHECK_DIGITS)
+        self.assertEqual(check_cnh('123'), validators.INVALID_CHECK_DIGITS)
+        self.assertEqual(check_cnh('123456789001'), validators.INVALID_LENGTH)
+        self.assertTrue(RENAVAM_SPEC.is_valid_int(1234567897))
+        self.assertFalse(RENAVAM_SPEC.is_valid_int(1234567890))
+        validate_pis('120.56412.54-5')
+        with self.assertRaises(ValidationError):
+            validate_pis('120.56412.54-6')
+
+
+class OtherDocumentsTest(TestCase):
+
+    def test_value_objects(self):
+        pis = PIS('120.56412.54-5')
+        self.assertTrue(pis.is_valid())
+        self.assertEqual(pis.format(), '120.56412.54-5')
+        self.assertEqual(pis, '12056412545')
+        self.assertEqual(int(pis), 12056412545)
+        self.assertEqual(pickle.loads(pickle.dumps(pis)), pis)
+
+        titulo = TituloEleitor('1234 5678 0191')
+        self.assertEqual(titulo.format(), '1234 5678 0191')
+        self.assertEqual(titulo.get_state(), 'SP')
+
+        self.assertEqual(RENAVAM('1234567897').number, '01234567897')
+        self.assertEqual(repr(CNH('12345678901')), 'InvalidCNH(raw_input=12345678901)')
+        with self.assertRaisesMessage(ValueError, 'Invalid cnh'):
+            int(CNH('12345678901'))
+
+        for document_class in (PIS, TituloEleitor, CNH, RENAVAM):
+            self.assertTrue(document_class(document_class.random_generator()).is_valid())
+
+    def test_fields(self):
+        OtherDocuments.objects.create(
+            pis='12056412545', titulo_eleitor='123456780191', cnh='12345678900', renavam='01234567897',
+        )
+        row = OtherDocuments.objects.get(pis='120.56412.54-5', titulo_eleitor='123456780191')
+        self.assertIsInstance(row.cnh, CNH)
+        self.assertEqual(row.renavam, RENAVAM('1234567897'))
+        self.assertEqual(
+            OtherDocuments.objects.values_list('titulo_eleitor', flat=True).get(), '1234 5678 0191'
+        )
+        self.assertEqual(OtherDocuments.objects.filter(cnh__in=['12345678900', '12345678901']).count(), 1)
+
+        with self.assertRaises(ValidationError):
+            OtherDocuments(cnh='12345678901').full_clean()
+
+    def test_form_fields(self):
+        field = PISForm()
+        self.assertEqual(field.clean('120.56412.54-5'), PIS('12056412545'))
+        self.assertEqual(field.widget.attrs['maxlength'], 14)
+        with self.assertRaisesMessage(ValidationError, 'Enter a valid pis number (e.g. 12056412545).'):
+            field.clean('12056412546')
+        with self.assertRaisesMessage(ValidationError, '1234 5678 0191'):
+            TituloEleitorForm(masked=True).clean('123')
+
+
+class WidgetScriptTest(TestCase):
+    vectors_path = os.path.join(os.path.dirname(__file__), 'check_digit_vectors.json')
+
+    def setUp(self):
+        with open(self.vectors_path) as vectors_file:
+            self.vectors = json.load(vectors_file)
+
+    def test_vectors(self):
+        # The same vectors run against documents.js in documents.test.js.
+        checks = {'cpf': check_cpf, 'cnpj': check_cnpj}
+        specs = {'cpf': CPF_SPEC, 'cnpj': CNPJ_SPEC}
+        classes = {'cpf': CPF, 'cnpj': CNPJ}
+
+        for vector in self.vectors['check']:
+            self.assertEqual(checks[vector['document']](vector['value']), vector['status'], vector)
+        for vector in self.vectors['check_digits']:
+            digits = specs[vector['document']].check_digits(int(vector['base']))
+            self.assertEqual(''.join(map(str, digits)), vector['digits'], vector)
+        for vector in self.vectors['format']:
+            # Numbers still being typed are only masked in the browser.
+            document = classes[vector['document']](vector['value'])
+            if len(re.sub(r'\D', '', vector['value'])) == document.digits:
+                self.assertEqual(document.format(), vector['formatted'], vector)
+
+    @skipUnless(shutil.which('node'), 'node is not installed')
+    def test_script_vectors(self):
+        script = os.path.join(os.path.dirname(__file__), 'documents.test.js')
+        result = subprocess.run(['node', script], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_widget_attrs_and_media(self):
+        field = CPFForm(masked=True)
+        html = field.widget.render('cpf', '')
+        self.assertIn('maxlength="14"', html)
+        self.assertIn('data-document="cpf"', html)
+        self.assertIn('data-masked', html)
+        self.assertIn('data-invalid-message="Enter a valid cpf number (e.g. 012.345.678-90)"', html)
+        self.assertNotIn('max_length', html)
+        self.assertIn('django_cpf_cnpj/documents.js', str(field.widget.media))
+
+        html = CNPJForm().widget.render('cnpj', '')
+        self.assertIn('maxlength="18"', html)
+        self.assertNotIn('data-masked', html)
+        self.assertEqual(str(PISForm().widget.media), '')